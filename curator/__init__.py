@@ -3,8 +3,12 @@ from .defaults import *
 from .validators import *
 from .logtools import *
 from .utils import *
+from .indexinfo import IndexInfo
 from .indexlist import IndexList
 from .snapshotlist import SnapshotList
+from .metadatacache import MetadataCache
+from .journal import Journal
+from .catalog import SnapshotCatalog
 from .actions import *
 from .cli import *
 from .repomgrcli import *
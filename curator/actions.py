@@ -1,7 +1,14 @@
 from .exceptions import *
 from .utils import *
+from .journal import Journal
+import elasticsearch
 import logging
 import time
+from multiprocessing.pool import ThreadPool
+try:
+    from queue import Queue, Empty
+except ImportError:
+    from Queue import Queue, Empty
 from datetime import datetime
 
 class Alias(object):
@@ -88,24 +95,22 @@ class Alias(object):
             else:
                 # Re-raise the NoIndices so it will behave as before
                 raise NoIndices
-        aliases = self.client.indices.get_alias()
+        # The aliases of each index were read by the IndexList
+        aliased = ilo.indices_with_aliases([self.name])
         for index in ilo.working_list():
-            if index in aliases:
+            # Only remove if the index is associated with the alias
+            if index in aliased:
                 self.loggit.debug(
-                    'Index {0} in get_aliases output'.format(index))
-                # Only remove if the index is associated with the alias
-                if self.name in aliases[index]['aliases']:
-                    self.loggit.debug(
-                        'Removing index {0} from alias '
-                        '{1}'.format(index, self.name)
-                    )
-                    self.actions.append(
-                        { 'remove' : { 'index' : index, 'alias': self.name } })
-                else:
-                    self.loggit.debug(
-                        'Can not remove: Index {0} is not associated with alias'
-                        ' {1}'.format(index, self.name)
-                    )
+                    'Removing index {0} from alias '
+                    '{1}'.format(index, self.name)
+                )
+                self.actions.append(
+                    { 'remove' : { 'index' : index, 'alias': self.name } })
+            else:
+                self.loggit.debug(
+                    'Can not remove: Index {0} is not associated with alias'
+                    ' {1}'.format(index, self.name)
+                )
 
     def body(self):
         """
@@ -134,7 +139,7 @@ class Alias(object):
                 '"{3}"'.format(
                     job.rstrip('e'),
                     index,
-                    'to' if job is 'add' else 'from',
+                    'to' if job == 'add' else 'from',
                     alias
                 )
             )
@@ -153,6 +158,7 @@ class Alias(object):
 class Allocation(object):
     def __init__(self, ilo, key=None, value=None, allocation_type='require',
         wait_for_completion=False, wait_interval=3, max_wait=-1,
+        max_concurrent_requests=1,
         ):
         """
         :arg ilo: A :class:`curator.indexlist.IndexList` object
@@ -169,6 +175,8 @@ class Allocation(object):
         :arg wait_interval: How long in seconds to wait between checks for 
             completion.
         :arg max_wait: Maximum number of seconds to `wait_for_completion`
+        :arg max_concurrent_requests: The maximum number of chunks of indices
+            to send requests for at the same time.  (default: `1`)
 
         .. note::
             See:
@@ -204,6 +212,10 @@ class Allocation(object):
         #: How long in seconds to `wait_for_completion` before returning with an
         #: exception. A value of -1 means wait forever.
         self.max_wait   = max_wait
+        #: Instance variable.
+        #: The maximum number of chunks of indices to send requests for at the
+        #: same time.
+        self.max_concurrent_requests = max_concurrent_requests
 
     def do_dry_run(self):
         """
@@ -224,31 +236,41 @@ class Allocation(object):
         self.index_list.empty_list_check()
 
         self.loggit.info('Updating index setting {0}'.format(self.body))
+        def allocate(l):
+            self.client.indices.put_settings(
+                index=to_csv(l), body=self.body
+            )
+        def wait(l):
+            logger.debug(
+                'Waiting for shards to complete relocation for indices:'
+                ' {0}'.format(to_csv(l))
+            )
+            wait_for_it(
+                self.client, 'allocation', index_list=l,
+                wait_interval=self.wait_interval, max_wait=self.max_wait
+            )
         try:
             index_lists = chunk_index_list(self.index_list.indices)
-            for l in index_lists:
-                self.client.indices.put_settings(
-                    index=to_csv(l), body=self.body
-                )
+            if self.wfc and self.max_concurrent_requests <= 1:
+                # Change the next chunk while waiting for the previous one
+                pipeline_chunks(allocate, wait, index_lists)
+            else:
+                map_chunks(allocate, index_lists, self.max_concurrent_requests)
                 if self.wfc:
-                    logger.debug(
-                        'Waiting for shards to complete relocation for indices:'
-                        ' {0}'.format(to_csv(l))
-                    )
-                    wait_for_it(
-                        self.client, 'allocation', 
-                        wait_interval=self.wait_interval, max_wait=self.max_wait
-                    )
+                    map_chunks(
+                        wait, index_lists, self.max_concurrent_requests)
         except Exception as e:
             report_failure(e)
 
 class Close(object):
-    def __init__(self, ilo, delete_aliases=False):
+    def __init__(self, ilo, delete_aliases=False, max_concurrent_requests=1):
         """
         :arg ilo: A :class:`curator.indexlist.IndexList` object
         :arg delete_aliases: If `True`, will delete any associated aliases
             before closing indices.
         :type delete_aliases: bool
+        :arg max_concurrent_requests: The maximum number of chunks of indices
+            to send requests for at the same time.  (default: `1`)
         """
         verify_index_list(ilo)
         #: Instance variable.
@@ -260,6 +282,10 @@ class Close(object):
         #: Instance variable.
         #: The Elasticsearch Client object derived from `ilo`
         self.client     = ilo.client
+        #: Instance variable.
+        #: The maximum number of chunks of indices to send requests for at the
+        #: same time.
+        self.max_concurrent_requests = max_concurrent_requests
         self.loggit     = logging.getLogger('curator.actions.close')
 
 
@@ -278,25 +304,26 @@ class Close(object):
         self.index_list.empty_list_check()
         self.loggit.info(
             'Closing selected indices: {0}'.format(self.index_list.indices))
+        def close(l):
+            if self.delete_aliases:
+                self.loggit.info(
+                    'Deleting aliases from indices before closing.')
+                self.loggit.debug('Deleting aliases from: {0}'.format(l))
+                try:
+                    self.client.indices.delete_alias(
+                        index=to_csv(l), name='_all')
+                except Exception as e:
+                    self.loggit.warn(
+                        'Some indices may not have had aliases.  Exception:'
+                        ' {0}'.format(e)
+                    )
+            self.client.indices.flush_synced(
+                index=to_csv(l), ignore_unavailable=True)
+            self.client.indices.close(
+                index=to_csv(l), ignore_unavailable=True)
         try:
             index_lists = chunk_index_list(self.index_list.indices)
-            for l in index_lists:
-                if self.delete_aliases:
-                    self.loggit.info(
-                        'Deleting aliases from indices before closing.')
-                    self.loggit.debug('Deleting aliases from: {0}'.format(l))
-                    try:
-                        self.client.indices.delete_alias(
-                            index=to_csv(l), name='_all')
-                    except Exception as e:
-                        self.loggit.warn(
-                            'Some indices may not have had aliases.  Exception:'
-                            ' {0}'.format(e)
-                        )
-                self.client.indices.flush_synced(
-                    index=to_csv(l), ignore_unavailable=True)
-                self.client.indices.close(
-                    index=to_csv(l), ignore_unavailable=True)
+            map_chunks(close, index_lists, self.max_concurrent_requests)
         except Exception as e:
             report_failure(e)
 
@@ -442,10 +469,12 @@ class CreateIndex(object):
             report_failure(e)
 
 class DeleteIndices(object):
-    def __init__(self, ilo, master_timeout=30):
+    def __init__(self, ilo, master_timeout=30, max_concurrent_requests=1):
         """
         :arg ilo: A :class:`curator.indexlist.IndexList` object
         :arg master_timeout: Number of seconds to wait for master node response
+        :arg max_concurrent_requests: The maximum number of chunks of indices
+            to send requests for at the same time.  (default: `1`)
         """
         verify_index_list(ilo)
         if not type(master_timeout) == type(int()):
@@ -462,6 +491,10 @@ class DeleteIndices(object):
         #: Instance variable.
         #: String value of `master_timeout` + 's', for seconds.
         self.master_timeout = str(master_timeout) + 's'
+        #: Instance variable.
+        #: The maximum number of chunks of indices to send requests for at the
+        #: same time.
+        self.max_concurrent_requests = max_concurrent_requests
         self.loggit         = logging.getLogger('curator.actions.delete_indices')
         self.loggit.debug('master_timeout value: {0}'.format(
             self.master_timeout))
@@ -499,7 +532,7 @@ class DeleteIndices(object):
                 self.loggit.info("---deleting index {0}".format(i))
             self.client.indices.delete(
                 index=to_csv(working_list), master_timeout=self.master_timeout)
-            result = [ i for i in working_list if i in get_indices(self.client)]
+            result = existing_indices(self.client, working_list)
             if self._verify_result(result, count):
                 return
             else:
@@ -524,17 +557,22 @@ class DeleteIndices(object):
             'Deleting selected indices: {0}'.format(self.index_list.indices))
         try:
             index_lists = chunk_index_list(self.index_list.indices)
-            for l in index_lists:
-                self.__chunk_loop(l)
+            map_chunks(
+                self.__chunk_loop, index_lists, self.max_concurrent_requests)
         except Exception as e:
             report_failure(e)
 
 class ForceMerge(object):
-    def __init__(self, ilo, max_num_segments=None, delay=0):
+    def __init__(self, ilo, max_num_segments=None, delay=0,
+        max_merges_per_node=None):
         """
         :arg ilo: A :class:`curator.indexlist.IndexList` object
         :arg max_num_segments: Number of segments per shard to forceMerge
         :arg delay: Number of seconds to delay between forceMerge operations
+        :arg max_merges_per_node: If set, forceMerge indices concurrently, so
+            that no node holding a shard of the indices runs more than this
+            many forceMerges at once.  The default of `None` merges one index
+            at a time.
         """
         verify_index_list(ilo)
         if not max_num_segments:
@@ -551,6 +589,10 @@ class ForceMerge(object):
         #: Instance variable.
         #: Internally accessible copy of `delay`
         self.delay = delay
+        #: Instance variable.
+        #: The largest number of forceMerges to run on a node at once, or
+        #: `None` to merge one index at a time
+        self.max_merges_per_node = max_merges_per_node
         self.loggit = logging.getLogger('curator.actions.forcemerge')
 
     def do_dry_run(self):
@@ -568,30 +610,156 @@ class ForceMerge(object):
         forcemerge indices in `index_list.indices`
         """
         self.index_list.empty_list_check()
+        # Segment counts already fetched by a forcemerged filter are reused
         self.index_list.filter_forceMerged(
             max_num_segments=self.max_num_segments)
         self.loggit.info('forceMerging selected indices')
         try:
-            for index_name in self.index_list.indices:
-                self.loggit.info(
-                    'forceMerging index {0} to {1} segments per shard.  '
-                    'Please wait...'.format(index_name, self.max_num_segments)
-                )
-                self.client.indices.forcemerge(index=index_name,
-                    max_num_segments=self.max_num_segments)
+            if self.max_merges_per_node:
+                self.__merge_by_node()
+            else:
+                for index_name in self.index_list.indices:
+                    self.__merge(index_name)
+                    if self.delay > 0:
+                        self.loggit.info(
+                            'Pausing for {0} seconds before '
+                            'continuing...'.format(self.delay)
+                        )
+                        time.sleep(self.delay)
+        except Exception as e:
+            report_failure(e)
+
+    def __merge(self, index_name):
+        self.loggit.info(
+            'forceMerging index {0} to {1} segments per shard.  '
+            'Please wait...'.format(index_name, self.max_num_segments)
+        )
+        self.client.indices.forcemerge(index=index_name,
+            max_num_segments=self.max_num_segments)
+
+    def __merge_by_node(self):
+        """
+        forceMerge indices in `index_list.indices` in order, starting each as
+        soon as every node holding one of its shards is running fewer than
+        `max_merges_per_node` forceMerges.  Every index is attempted, and a
+        `FailedExecution` exception is raised at the end if any failed.
+
+        After each index, the nodes holding it are not given another one for
+        `delay` seconds.  The pause is kept here rather than in the worker, so
+        no thread is held while a node waits.
+        """
+        indices = self.index_list.indices
+        allocation = shard_allocation(self.client, indices)
+        nodes = set(n for i in indices for n in allocation.get(i, {}))
+        # One thread for each forceMerge which may run at once
+        pool = ThreadPool(max(1, min(
+            len(indices), len(nodes) * self.max_merges_per_node)))
+        finished = Queue()
+        def merge(index_name):
+            start = time.time()
+            try:
+                self.__merge(index_name)
+                return index_name, None, time.time() - start
+            except Exception as e:
+                return index_name, e, time.time() - start
+        running = dict((node, 0) for node in nodes)
+        merged = dict((node, 0) for node in nodes)
+        # The time at which each node may be given another index
+        ready = dict((node, 0) for node in nodes)
+        pending = list(indices)
+        failures = []
+        in_progress = 0
+        start = time.time()
+        try:
+            while pending or in_progress:
+                now = time.time()
+                resume = None
+                for index_name in pending[:]:
+                    index_nodes = allocation.get(index_name, {})
+                    if any(running[n] >= self.max_merges_per_node
+                            for n in index_nodes):
+                        continue
+                    paused = [ready[n] for n in index_nodes if ready[n] > now]
+                    if paused:
+                        resume = min(resume or max(paused), max(paused))
+                        continue
+                    pending.remove(index_name)
+                    for node in index_nodes:
+                        running[node] += 1
+                    in_progress += 1
+                    pool.apply_async(
+                        merge, (index_name,), callback=finished.put)
+                timeout = None if resume is None else max(0, resume - now)
+                if not in_progress:
+                    time.sleep(timeout)
+                    continue
+                try:
+                    index_name, error, elapsed = finished.get(timeout=timeout)
+                except Empty:
+                    continue
+                in_progress -= 1
+                for node in allocation.get(index_name, {}):
+                    running[node] -= 1
+                    ready[node] = time.time() + self.delay
                 if self.delay > 0:
                     self.loggit.info(
-                        'Pausing for {0} seconds before continuing...'.format(
-                            self.delay)
+                        'Pausing for {0} seconds before giving the nodes '
+                        'holding index {1} another one...'.format(
+                            self.delay, index_name)
                     )
-                    time.sleep(self.delay)
-        except Exception as e:
-            report_failure(e)
+                if error:
+                    self.loggit.error(
+                        'forceMerge failed for index {0}: {1}'.format(
+                            index_name, error)
+                    )
+                    failures.append(index_name)
+                    continue
+                rates = []
+                for node, size in sorted(allocation[index_name].items()):
+                    merged[node] += size
+                    rates.append('{0}: {1}/s'.format(
+                        node, byte_size(size / max(elapsed, 0.001))))
+                self.loggit.info(
+                    'forceMerged index {0} in {1:.1f} seconds ({2})'.format(
+                        index_name, elapsed, ', '.join(rates))
+                )
+                log_progress(
+                    self.loggit, 'forceMerged',
+                    len(indices) - len(pending) - in_progress, len(indices),
+                    start
+                )
+        finally:
+            pool.close()
+        elapsed = max(time.time() - start, 0.001)
+        for node in sorted(nodes):
+            self.loggit.info(
+                'Node {0} forceMerged {1} at {2}/s'.format(
+                    node, byte_size(merged[node]),
+                    byte_size(merged[node] / elapsed))
+            )
+        if failures:
+            raise FailedExecution(
+                'forceMerge failed for {0} of {1} indices: {2}'.format(
+                    len(failures), len(indices), failures)
+            )
 
 class Open(object):
-    def __init__(self, ilo):
+    def __init__(self, ilo, max_concurrent_requests=1,
+        wait_for_completion=False, wait_interval=9, max_wait=-1,
+        max_recovering_shards=None):
         """
         :arg ilo: A :class:`curator.indexlist.IndexList` object
+        :arg max_concurrent_requests: The maximum number of chunks of indices
+            to send requests for at the same time.  (default: `1`)
+        :arg wait_for_completion: Wait (or not) for the shards of the opened
+            indices to recover before returning.  (default: `False`)
+        :type wait_for_completion: bool
+        :arg wait_interval: How long in seconds to wait between checks for 
+            completion.
+        :arg max_wait: Maximum number of seconds to `wait_for_completion`
+        :arg max_recovering_shards: If set, open indices in waves, so that no
+            more than this many shards, counting replicas, are recovering at
+            once.  This implies `wait_for_completion`.
         """
         verify_index_list(ilo)
         #: Instance variable.
@@ -600,6 +768,23 @@ class Open(object):
         #: Instance variable.
         #: Internal reference to `ilo`
         self.index_list = ilo
+        #: Instance variable.
+        #: The maximum number of chunks of indices to send requests for at the
+        #: same time.
+        self.max_concurrent_requests = max_concurrent_requests
+        #: Instance variable.
+        #: Internal reference to `wait_for_completion`
+        self.wfc        = wait_for_completion
+        #: Instance variable
+        #: How many seconds to wait between checks for completion.
+        self.wait_interval = wait_interval
+        #: Instance variable.
+        #: How long in seconds to `wait_for_completion` before returning with an
+        #: exception. A value of -1 means wait forever.
+        self.max_wait   = max_wait
+        #: Instance variable.
+        #: The largest number of shards to recover at once, or `None`
+        self.max_recovering_shards = max_recovering_shards
         self.loggit     = logging.getLogger('curator.actions.open')
 
     def do_dry_run(self):
@@ -608,6 +793,27 @@ class Open(object):
         """
         show_dry_run(self.index_list, 'open')
 
+    def __open_in_waves(self, open_indices):
+        # Shard and replica counts are in the metadata of closed indices
+        self.index_list.load_metadata()
+        shards = {}
+        for index in self.index_list.indices:
+            info = self.index_list.index_info[index]
+            shards[index] = (
+                int(info.number_of_shards) *
+                (1 + int(info.number_of_replicas))
+            )
+        waves = RecoveryWaves(
+            self.index_list.indices, open_indices, shards,
+            max_shards=self.max_recovering_shards
+        )
+        waiter = Waiter(
+            self.client, wait_interval=self.wait_interval,
+            max_wait=self.max_wait
+        )
+        waiter.add('open', waves.step)
+        waiter.wait()
+
     def do_action(self):
         """
         Open closed indices in `index_list.indices`
@@ -615,16 +821,28 @@ class Open(object):
         self.index_list.empty_list_check()
         self.loggit.info(
             'Opening selected indices: {0}'.format(self.index_list.indices))
+        def open_indices(indices):
+            map_chunks(
+                lambda l: self.client.indices.open(index=to_csv(l)),
+                chunk_index_list(indices), self.max_concurrent_requests
+            )
         try:
-            index_lists = chunk_index_list(self.index_list.indices)
-            for l in index_lists:
-                self.client.indices.open(index=to_csv(l))
+            if self.max_recovering_shards:
+                self.__open_in_waves(open_indices)
+            else:
+                open_indices(self.index_list.indices)
+            if self.wfc and not self.max_recovering_shards:
+                logger.debug('Waiting for opened indices to recover')
+                wait_for_it(
+                    self.client, 'open', index_list=self.index_list.indices,
+                    wait_interval=self.wait_interval, max_wait=self.max_wait
+                )
         except Exception as e:
             report_failure(e)
 
 class Replicas(object):
     def __init__(self, ilo, count=None, wait_for_completion=False, 
-        wait_interval=9, max_wait=-1):
+        wait_interval=9, max_wait=-1, max_concurrent_requests=1):
         """
         :arg ilo: A :class:`curator.indexlist.IndexList` object
         :arg count: The count of replicas per shard
@@ -634,6 +852,8 @@ class Replicas(object):
         :arg wait_interval: How long in seconds to wait between checks for 
             completion.
         :arg max_wait: Maximum number of seconds to `wait_for_completion`
+        :arg max_concurrent_requests: The maximum number of chunks of indices
+            to send requests for at the same time.  (default: `1`)
         """
         verify_index_list(ilo)
         # It's okay for count to be zero
@@ -660,6 +880,10 @@ class Replicas(object):
         #: How long in seconds to `wait_for_completion` before returning with an
         #: exception. A value of -1 means wait forever.
         self.max_wait   = max_wait
+        #: Instance variable.
+        #: The maximum number of chunks of indices to send requests for at the
+        #: same time.
+        self.max_concurrent_requests = max_concurrent_requests
         self.loggit     = logging.getLogger('curator.actions.replicas')
 
     def do_dry_run(self):
@@ -682,20 +906,29 @@ class Replicas(object):
             'Setting the replica count to {0} for indices: '
             '{1}'.format(self.count, self.index_list.indices)
         )
+        def set_replicas(l):
+            self.client.indices.put_settings(index=to_csv(l),
+                body={'number_of_replicas' : self.count})
+        def wait(l):
+            logger.debug(
+                'Waiting for shards to complete replication for '
+                'indices: {0}'.format(to_csv(l))
+            )
+            wait_for_it(
+                self.client, 'replicas', index_list=l,
+                wait_interval=self.wait_interval, max_wait=self.max_wait
+            )
         try:
             index_lists = chunk_index_list(self.index_list.indices)
-            for l in index_lists:
-                self.client.indices.put_settings(index=to_csv(l),
-                    body={'number_of_replicas' : self.count})
+            if self.wfc and self.count > 0 and self.max_concurrent_requests <= 1:
+                # Change the next chunk while waiting for the previous one
+                pipeline_chunks(set_replicas, wait, index_lists)
+            else:
+                map_chunks(
+                    set_replicas, index_lists, self.max_concurrent_requests)
                 if self.wfc and self.count > 0:
-                    logger.debug(
-                        'Waiting for shards to complete replication for '
-                        'indices: {0}'.format(to_csv(l))
-                    )
-                    wait_for_it(
-                        self.client, 'replicas', 
-                        wait_interval=self.wait_interval, max_wait=self.max_wait
-                    )
+                    map_chunks(
+                        wait, index_lists, self.max_concurrent_requests)
         except Exception as e:
             report_failure(e)
 
@@ -790,12 +1023,18 @@ class Rollover(object):
             report_failure(e)
 
 class DeleteSnapshots(object):
-    def __init__(self, slo, retry_interval=120, retry_count=3):
+    def __init__(self, slo, retry_interval=120, retry_count=3, journal=None):
         """
         :arg slo: A :class:`curator.snapshotlist.SnapshotList` object
         :arg retry_interval: Number of seconds to delay betwen retries. Default:
             120 (seconds)
         :arg retry_count: Number of attempts to make. Default: 3
+        :arg journal: The path of a file in which to record the snapshots to
+            delete, and each one as it is deleted, so that an interrupted run
+            can be resumed.  If it holds an unfinished plan, the snapshots
+            remaining in it are deleted instead of those in `slo`, which
+            should then be built with ``snapshots`` set to their names.
+            Default: `None` (no journal)
         """
         verify_snapshot_list(slo)
         #: Instance variable.
@@ -808,6 +1047,9 @@ class DeleteSnapshots(object):
         #: Internally accessible copy of `retry_count`
         self.retry_count    = retry_count
         #: Instance variable.
+        #: Internally accessible copy of `journal`
+        self.journal        = journal
+        #: Instance variable.
         #: Internal reference to `slo`
         self.snapshot_list  = slo
         #: Instance variable.
@@ -824,18 +1066,110 @@ class DeleteSnapshots(object):
             'repository' : self.repository,
             'retry_interval' : self.retry_interval,
             'retry_count' : self.retry_count,
+            'journal' : self.journal,
         }
         for snap in self.snapshot_list.snapshots:
             logger.info('DRY-RUN: delete_snapshot: {0} with arguments: '
                 '{1}'.format(snap, mykwargs))
 
+    def __retryable(self, e):
+        # Elasticsearch is unreachable, busy with another snapshot operation
+        # (503), or rejecting requests (429).  Anything else will not change.
+        if isinstance(e, elasticsearch.ConnectionError):
+            return True
+        return getattr(e, 'status_code', None) in (429, 503)
+
+    def __delete(self, snapshot):
+        """
+        Delete `snapshot`, retrying up to `retry_count` times if that may
+        succeed later.  The pause before each retry doubles, starting from
+        `retry_interval` seconds.  A snapshot which no longer exists is
+        treated as deleted, as a timed out request may have deleted it.
+        """
+        for attempt in range(self.retry_count + 1):
+            try:
+                self.client.snapshot.delete(
+                    repository=self.repository, snapshot=snapshot)
+                return
+            except elasticsearch.NotFoundError:
+                self.loggit.info(
+                    'Snapshot {0} was already deleted'.format(snapshot))
+                return
+            except Exception as e:
+                if attempt >= self.retry_count or not self.__retryable(e):
+                    raise
+                delay = self.retry_interval * 2 ** attempt
+                self.loggit.warn(
+                    'Unable to delete snapshot {0}: {1}.  Retry {2} of {3} '
+                    'in {4} seconds'.format(
+                        snapshot, e, attempt + 1, self.retry_count, delay)
+                )
+                time.sleep(delay)
+
+    def __resume(self, journal):
+        """
+        Return the snapshots remaining in the plan in `journal` which still
+        exist with the planned uuid.  The rest are recorded as done, as they
+        have been deleted since, or deleted and created again.
+        """
+        self.loggit.info(
+            'Resuming from journal {0}: {1} of {2} planned snapshot(s) '
+            'remaining'.format(
+                self.journal, len(journal.remaining()), len(journal.planned))
+        )
+        info = self.snapshot_list.snapshot_info
+        snapshots = []
+        for planned in journal.remaining():
+            name = planned['snapshot']
+            if not name in info:
+                self.loggit.info(
+                    'Snapshot {0} was already deleted'.format(name))
+                journal.record(planned)
+            elif info[name].get('uuid') != planned['uuid']:
+                self.loggit.warn(
+                    'Snapshot {0} has been created again since it was '
+                    'planned for deletion.  Skipping it.'.format(name)
+                )
+                journal.record(planned)
+            else:
+                snapshots.append(name)
+        return snapshots
+
+    def __plan(self, journal):
+        """
+        Record the snapshots in `slo` in `journal`, with their uuids, before
+        any of them is deleted.
+        """
+        snapshots = self.snapshot_list.snapshots
+        # The lazy loader does not read uuids
+        self.snapshot_list.load_details(snapshots)
+        info = self.snapshot_list.snapshot_info
+        journal.start(
+            [{'snapshot': s, 'uuid': info[s].get('uuid')} for s in snapshots])
+
     def do_action(self):
         """
         Delete snapshots in `slo`
-        Retry up to `retry_count` times, pausing `retry_interval`
-        seconds between retries.
-        """
-        self.snapshot_list.empty_list_check()
+        Retry each up to `retry_count` times, pausing `retry_interval`
+        seconds before the first retry, and twice as long before each one
+        after that.  If a snapshot can not be deleted, continue with the rest,
+        and raise an exception at the end.
+        """
+        journal = None
+        if self.journal:
+            journal = Journal(self.journal, self.repository)
+        if journal and journal.remaining():
+            snapshots = self.__resume(journal)
+            if not snapshots:
+                self.loggit.info(
+                    'Nothing left to delete from journal {0}'.format(
+                        self.journal)
+                )
+                journal.finish()
+                return
+        else:
+            self.snapshot_list.empty_list_check()
+            snapshots = self.snapshot_list.snapshots
         self.loggit.info('Deleting selected snapshots')
         if not safe_to_snap(
             self.client, repository=self.repository,
@@ -843,13 +1177,33 @@ class DeleteSnapshots(object):
                 raise FailedExecution(
                     'Unable to delete snapshot(s) because a snapshot is in '
                     'state "IN_PROGRESS"')
-        try:
-            for s in self.snapshot_list.snapshots:
-                self.loggit.info('Deleting snapshot {0}...'.format(s))
-                self.client.snapshot.delete(
-                    repository=self.repository, snapshot=s)
-        except Exception as e:
-            report_failure(e)
+        if journal and not journal.remaining():
+            self.__plan(journal)
+        info = self.snapshot_list.snapshot_info
+        failed = []
+        start = time.time()
+        for count, s in enumerate(snapshots, 1):
+            self.loggit.info('Deleting snapshot {0}...'.format(s))
+            try:
+                self.__delete(s)
+            except Exception as e:
+                self.loggit.error(
+                    'Unable to delete snapshot {0}: {1}'.format(s, e))
+                failed.append(s)
+                continue
+            if journal:
+                journal.record({'snapshot': s, 'uuid': info[s].get('uuid')})
+            log_progress(
+                self.loggit, 'Deleted', count - len(failed),
+                len(snapshots) - len(failed), start
+            )
+        if failed:
+            raise FailedExecution(
+                'Unable to delete {0} of {1} snapshot(s): {2}'.format(
+                    len(failed), len(snapshots), failed)
+            )
+        if journal:
+            journal.finish()
 
 class Reindex(object):
     def __init__(self, ilo, request_body, refresh=True, 
@@ -1323,7 +1677,8 @@ class Restore(object):
                 ignore_unavailable=False, include_global_state=True,
                 partial=False, rename_pattern=None, rename_replacement=None,
                 extra_settings={}, wait_for_completion=True, wait_interval=9,
-                max_wait=-1, skip_repo_fs_check=False):
+                max_wait=-1, skip_repo_fs_check=False,
+                max_recovering_shards=None, max_recovering_bytes=None):
         """
         :arg slo: A :class:`curator.snapshotlist.SnapshotList` object
         :arg name: Name of the snapshot to restore.  If no name is provided, it
@@ -1367,6 +1722,10 @@ class Restore(object):
             shared filesystems where intermittent timeouts can affect
             validation, but won't likely affect snapshot success.
         :type skip_repo_fs_check: bool
+        :arg max_recovering_shards: If set, restore indices in waves of no
+            more than this many shards.  This implies `wait_for_completion`.
+        :arg max_recovering_bytes: If set, restore indices in waves of no more
+            than this many bytes.  This implies `wait_for_completion`.
         """
         self.loggit = logging.getLogger('curator.actions.snapshot')
         verify_snapshot_list(slo)
@@ -1399,6 +1758,7 @@ class Restore(object):
         if indices:
             self.indices = ensure_list(indices)
         else:
+            slo.load_details([self.name])
             self.indices = slo.snapshot_info[self.name]['indices']
         self.wfc                 = wait_for_completion
         #: Instance variable
@@ -1421,6 +1781,12 @@ class Restore(object):
         #: Instance variable.
         #: Internally accessible copy of `skip_repo_fs_check`
         self.skip_repo_fs_check  = skip_repo_fs_check
+        #: Instance variable.
+        #: The largest number of shards to restore at once, or `None`
+        self.max_recovering_shards = max_recovering_shards
+        #: Instance variable.
+        #: The largest number of bytes to restore at once, or `None`
+        self.max_recovering_bytes = max_recovering_bytes
 
         #: Instance variable.
         #: Populated at instance creation time from the other options
@@ -1520,6 +1886,74 @@ class Restore(object):
             )
 
 
+    def __expand_indices(self, available):
+        """
+        Resolve the names, comma-separated lists, ``*`` wildcards, ``-``
+        exclusions and ``_all`` in `indices` against the `available` indices
+        in the snapshot, the way Elasticsearch does, so that each wave can be
+        sized.  Plain names which are not in the snapshot are kept, and left
+        for Elasticsearch to report.
+        """
+        expanded = []
+        for entry in self.indices:
+            for pattern in entry.split(','):
+                exclude = pattern.startswith('-') and bool(expanded)
+                if exclude:
+                    pattern = pattern[1:]
+                if pattern == '_all':
+                    pattern = '*'
+                regex = re.compile('^{0}$'.format(
+                    '.*'.join(re.escape(p) for p in pattern.split('*'))))
+                matches = sorted(i for i in available if regex.match(i))
+                if exclude:
+                    expanded = [i for i in expanded if not i in matches]
+                    continue
+                if not matches and not '*' in pattern:
+                    matches = [pattern]
+                expanded.extend(i for i in matches if not i in expanded)
+        if expanded != self.indices:
+            self.loggit.debug(
+                'Indices to restore: {0}'.format(expanded))
+            self.indices = expanded
+            self._get_expected_output()
+
+    def __restore_in_waves(self):
+        shards, sizes = snapshot_index_sizes(
+            self.client, repository=self.repository, snapshot=self.name)
+        # Wildcards would otherwise be sized as 0 shards and 0 bytes
+        self.__expand_indices(list(shards))
+        if not self.indices:
+            self.loggit.warn('No indices in the snapshot match {0}'.format(
+                self.body['indices']))
+            return
+        first = self.indices[0]
+        def restore(wave):
+            body = dict(self.body, indices=wave)
+            # Only restore the global state once
+            if wave[0] != first:
+                body['include_global_state'] = False
+            self.client.snapshot.restore(
+                repository=self.repository, snapshot=self.name, body=body,
+                wait_for_completion=False
+            )
+        # Elasticsearch runs one restore at a time, so waves do not overlap
+        waves = RecoveryWaves(
+            self.indices, restore, shards, sizes=sizes,
+            max_shards=self.max_recovering_shards,
+            max_bytes=self.max_recovering_bytes, overlap=False,
+            targets=dict(zip(self.indices, self.expected_output))
+        )
+        waiter = Waiter(
+            self.client, wait_interval=self.wait_interval,
+            max_wait=self.max_wait
+        )
+        waiter.add('restore', waves.step)
+        waiter.wait()
+        self.loggit.info(
+            'Restored {0} indices in {1} waves'.format(
+                len(self.indices), waves.waves)
+        )
+
     def do_action(self):
         """
         Restore indices with options passed.
@@ -1533,6 +1967,9 @@ class Restore(object):
             self.loggit.info('Restoring indices "{0}" from snapshot: '
                 '{1}'.format(self.indices, self.name)
             )
+            if self.max_recovering_shards or self.max_recovering_bytes:
+                self.__restore_in_waves()
+                return
             # Always set wait_for_completion to False. Let 'wait_for_it' do its
             # thing if wait_for_completion is set to True. Report the task_id
             # either way.
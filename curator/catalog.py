@@ -0,0 +1,142 @@
+import json
+import logging
+import os
+import sqlite3
+from .exceptions import *
+from .utils import chunk_index_list, get_snapshot_data, get_snapshot_listing
+
+# Snapshots in these states do not change, so they can be stored
+_FINISHED = ('SUCCESS', 'PARTIAL', 'FAILED', 'INCOMPATIBLE')
+
+class SnapshotCatalog(object):
+    """
+    A local SQLite database of finished snapshots, keyed by repository and
+    snapshot UUID.  As finished snapshots do not change, :py:meth:`sync` only
+    reads the details of snapshots which are new, or still in progress, from
+    Elasticsearch.
+    """
+    def __init__(self, path):
+        """
+        :arg path: The path of the database file.  It, and its directory, are
+            created if they do not exist.  ``~`` is expanded.
+        """
+        self.loggit = logging.getLogger('curator.catalog')
+        #: Instance variable.
+        #: The path of the database file
+        self.path = os.path.expanduser(path)
+        try:
+            directory = os.path.dirname(self.path)
+            if directory and not os.path.isdir(directory):
+                os.makedirs(directory)
+            self.db = sqlite3.connect(self.path)
+            self.db.execute(
+                'CREATE TABLE IF NOT EXISTS snapshots ('
+                'repository TEXT NOT NULL, uuid TEXT NOT NULL, '
+                'name TEXT NOT NULL, data TEXT NOT NULL, '
+                'PRIMARY KEY (repository, uuid))'
+            )
+            self.db.execute(
+                'CREATE INDEX IF NOT EXISTS snapshots_by_name '
+                'ON snapshots (repository, name)'
+            )
+            self.db.commit()
+        except (OSError, sqlite3.Error) as e:
+            raise FailedExecution(
+                'Unable to open snapshot catalog {0}: {1}'.format(self.path, e))
+
+    def get(self, repository):
+        """
+        Return the stored data of every snapshot in `repository`, keyed by
+        snapshot name.
+
+        :arg repository: The Elasticsearch snapshot repository
+        :rtype: dict
+        """
+        rows = self.db.execute(
+            'SELECT data FROM snapshots WHERE repository = ?', (repository,))
+        return dict(
+            (data['snapshot'], data)
+            for data in (json.loads(row[0]) for row in rows)
+        )
+
+    def store(self, repository, snapshots):
+        """
+        Store the data of each finished snapshot in `snapshots`.  Others are
+        skipped.
+
+        :arg repository: The Elasticsearch snapshot repository
+        :arg snapshots: A list of snapshot data, as returned by
+            :py:func:`curator.utils.get_snapshot_data`
+        """
+        rows = [
+            (repository, s.get('uuid') or s['snapshot'], s['snapshot'],
+                json.dumps(s))
+            for s in snapshots if s.get('state') in _FINISHED
+        ]
+        with self.db:
+            self.db.executemany(
+                'INSERT OR REPLACE INTO snapshots (repository, uuid, name, '
+                'data) VALUES (?, ?, ?, ?)', rows
+            )
+
+    def remove(self, repository, names):
+        """
+        Remove the snapshots named in `names` from `repository`.
+
+        :arg repository: The Elasticsearch snapshot repository
+        :arg names: A list of snapshot names
+        """
+        with self.db:
+            self.db.executemany(
+                'DELETE FROM snapshots WHERE repository = ? AND name = ?',
+                [(repository, name) for name in names]
+            )
+
+    def sync(self, client, repository):
+        """
+        Bring the catalog for `repository` up to date, and return the data of
+        every snapshot in it, in the same form as
+        :py:func:`curator.utils.get_snapshot_data`.
+
+        Snapshot names, states and start times are listed with
+        :py:func:`curator.utils.get_snapshot_listing`.  The full details are
+        only read for snapshots which are not stored, are not finished, or
+        have a different start time than the stored snapshot of the same name
+        (so were deleted and taken again).  Stored snapshots which are no
+        longer listed are removed.
+
+        :arg client: An :class:`elasticsearch.Elasticsearch` client object
+        :arg repository: The Elasticsearch snapshot repository
+        :rtype: list
+        """
+        listing = get_snapshot_listing(client, repository)
+        stored = self.get(repository)
+        listed = set(s['snapshot'] for s in listing)
+        gone = [name for name in stored if not name in listed]
+        stale = []
+        for s in listing:
+            known = stored.get(s['snapshot'])
+            if (known is None or not s['state'] in _FINISHED
+                    or int(known.get('start_time_in_millis', 0)) // 1000
+                        != s['start_time_in_millis'] // 1000):
+                stale.append(s['snapshot'])
+        fetched = []
+        if stale:
+            for chunk in chunk_index_list(stale):
+                fetched += get_snapshot_data(
+                    client, repository=repository, snapshots=chunk)
+        self.remove(repository, gone + stale)
+        self.store(repository, fetched)
+        self.loggit.info(
+            'Snapshot catalog for repository {0}: {1} stored, {2} read, '
+            '{3} removed'.format(
+                repository, len(listed) - len(stale), len(fetched), len(gone))
+        )
+        data = dict((name, stored[name]) for name in listed if name in stored)
+        data.update((s['snapshot'], s) for s in fetched)
+        # In the order Elasticsearch lists them, which is by start time
+        return [data[s['snapshot']] for s in listing if s['snapshot'] in data]
+
+    def close(self):
+        """Close the database."""
+        self.db.close()
@@ -10,6 +10,9 @@ from .exceptions import *
 from .utils import *
 from .indexlist import IndexList
 from .snapshotlist import SnapshotList
+from .metadatacache import MetadataCache
+from .catalog import SnapshotCatalog
+from .journal import Journal
 from .actions import *
 from ._version import __version__
 
@@ -30,6 +33,31 @@ CLASS_MAP = {
     'snapshot' : Snapshot,
 }
 
+def invalidate_cache(cache, client, action, action_obj, opts):
+    """
+    Mark the metadata changed by `action` as stale in `cache`, so that later
+    actions in the same run fetch it again.
+
+    :arg cache: A :class:`curator.metadatacache.MetadataCache` object
+    :arg action: The name of the action which was performed
+    :arg action_obj: The action object
+    :arg opts: The `options` dictionary of the action
+    """
+    if action in [
+            'allocation', 'close', 'delete_indices', 'forcemerge', 'open',
+            'replicas'
+        ]:
+        cache.invalidate(client, action_obj.index_list.indices)
+    elif action == 'alias':
+        # Index metadata includes the aliases of each index
+        cache.invalidate(client, [
+            list(item.values())[0]['index'] for item in action_obj.actions])
+    elif action in ['create_index', 'reindex', 'restore', 'rollover']:
+        # New index names may be unknown until the action has completed
+        cache.invalidate(client)
+    elif action in ['delete_snapshots', 'snapshot']:
+        cache.invalidate_snapshots(client, opts['repository'])
+
 def process_action(client, config, **kwargs):
     """
     Do the `action` in the configuration dictionary, using the associated args.
@@ -47,6 +75,7 @@ def process_action(client, config, **kwargs):
     opts = config['options']
     logger.debug('opts: {0}'.format(opts))
     mykwargs = {}
+    cache = kwargs['cache'] if 'cache' in kwargs else None
 
     action_class = CLASS_MAP[action]
 
@@ -57,6 +86,13 @@ def process_action(client, config, **kwargs):
  
     ### Update the defaults with whatever came with opts, minus any Nones
     mykwargs.update(prune_nones(opts))
+    # How IndexList objects read and filter index metadata. These are not
+    # action arguments.
+    loader = mykwargs.pop('loader', 'chunked')
+    reorder = mykwargs.pop('reorder_filters', False)
+    summary = mykwargs.pop('filter_summary', False)
+    fetches = mykwargs.pop('max_concurrent_fetches', None)
+    catalog_path = mykwargs.pop('snapshot_catalog', None)
     logger.debug('Action kwargs: {0}'.format(mykwargs))
 
     ### Set up the action ###
@@ -66,36 +102,72 @@ def process_action(client, config, **kwargs):
         action_obj = action_class(**mykwargs)
         if 'add' in config:
             logger.debug('Adding indices to alias "{0}"'.format(opts['name']))
-            adds = IndexList(client)
-            adds.iterate_filters(config['add'])
+            adds = IndexList(
+                client, loader=loader, cache=cache,
+                max_concurrent_fetches=fetches
+            )
+            adds.iterate_filters(
+                config['add'], reorder_filters=reorder, filter_summary=summary)
             action_obj.add(adds, warn_if_no_indices=opts['warn_if_no_indices'])
         if 'remove' in config:
             logger.debug(
                 'Removing indices from alias "{0}"'.format(opts['name']))
-            removes = IndexList(client)
-            removes.iterate_filters(config['remove'])
+            removes = IndexList(
+                client, loader=loader, cache=cache,
+                max_concurrent_fetches=fetches
+            )
+            removes.iterate_filters(
+                config['remove'], reorder_filters=reorder,
+                filter_summary=summary
+            )
             action_obj.remove(
                 removes, warn_if_no_indices= opts['warn_if_no_indices'])
     elif action in [ 'cluster_routing', 'create_index', 'rollover']:
         action_obj = action_class(client, **mykwargs)
     elif action == 'delete_snapshots' or action == 'restore':
         logger.debug('Running "{0}"'.format(action))
-        slo = SnapshotList(client, repository=opts['repository'])
-        slo.iterate_filters(config)
+        planned = []
+        if action == 'delete_snapshots' and mykwargs.get('journal'):
+            planned = Journal(
+                mykwargs['journal'], opts['repository']).remaining()
+        if planned:
+            # Resume the plan of an interrupted run, rather than listing and
+            # filtering the whole repository again
+            slo = SnapshotList(
+                client, repository=opts['repository'],
+                snapshots=[p['snapshot'] for p in planned]
+            )
+        else:
+            catalog = SnapshotCatalog(catalog_path) if catalog_path else None
+            slo = SnapshotList(
+                client, repository=opts['repository'], cache=cache,
+                loader=opts.get('loader') or 'bulk', catalog=catalog
+            )
+            if catalog is not None:
+                catalog.close()
+            slo.iterate_filters(config, filter_summary=summary)
         # We don't need to send this value to the action
         mykwargs.pop('repository')
         action_obj = action_class(slo, **mykwargs)
     else:
         logger.debug('Running "{0}"'.format(action.upper()))
-        ilo = IndexList(client)
-        ilo.iterate_filters(config)
+        ilo = IndexList(
+            client, loader=loader, cache=cache,
+            max_concurrent_fetches=fetches
+        )
+        ilo.iterate_filters(
+            config, reorder_filters=reorder, filter_summary=summary)
         action_obj = action_class(ilo, **mykwargs)
     ### Do the action
     if 'dry_run' in kwargs and kwargs['dry_run'] == True:
         action_obj.do_dry_run()
     else:
         logger.debug('Doing the action here.')
-        action_obj.do_action()
+        try:
+            action_obj.do_action()
+        finally:
+            if cache is not None:
+                invalidate_cache(cache, client, action, action_obj, opts)
 
 @click.command()
 @click.option('--config',
@@ -118,6 +190,10 @@ def cli(config, dry_run, action_file):
     # Extract this and save it for later, in case there's no timeout_override.
     default_timeout = client_args.pop('timeout')
     logger.debug('default_timeout = {0}'.format(default_timeout))
+    # These configure Curator, not the client
+    use_cache = client_args.pop('metadata_cache', False)
+    cache_ttl = client_args.pop(
+        'metadata_cache_ttl', settings.metadata_cache_ttl())
     #########################################
     ### Start working on the actions here ###
     #########################################
@@ -126,6 +202,8 @@ def cli(config, dry_run, action_file):
     actions = action_dict['actions']
     logger.debug('Full list of actions: {0}'.format(actions))
     action_keys = sorted(list(actions.keys()))
+    # Index and snapshot metadata may be shared between the actions in this run
+    cache = MetadataCache(ttl=cache_ttl) if use_cache else None
     for idx in action_keys:
         action = actions[idx]['action']
         action_disabled = actions[idx]['options'].pop('disable_action')
@@ -159,6 +237,7 @@ def cli(config, dry_run, action_file):
         kwargs['master_timeout'] = (
             client_args['timeout'] if client_args['timeout'] <= 300 else 300)
         kwargs['dry_run'] = dry_run
+        kwargs['cache'] = cache
 #        kwargs['timeout'] = client_args['timeout']
 
         # Create a client object for each action...
@@ -200,4 +279,7 @@ def cli(config, dry_run, action_file):
                 else:
                     sys.exit(1)
         logger.info('Action ID: {0}, "{1}" completed.'.format(idx, action))
+    requests, received = MeteredConnection.totals()
+    logger.info('Received {0} from Elasticsearch in {1} requests.'.format(
+        byte_size(received), requests))
     logger.info('Job completed.')
@@ -0,0 +1,80 @@
+"""
+Whole-column operations used by the :class:`curator.indexlist.IndexList`
+filters.  NumPy is used if it is installed, otherwise the same results are
+computed in pure Python.  Missing values are passed in, and returned, as
+``None``.
+"""
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+def _array(values):
+    # None becomes NaN, which compares False against everything
+    return numpy.array(
+        [float('nan') if v is None else v for v in values], dtype=float)
+
+def _with_missing(values, result):
+    return [None if v is None else r for v, r in zip(values, result)]
+
+def less_than(values, reference):
+    """
+    Return a list with ``values[i] < reference`` for each value, or ``None``
+    where the value is ``None``.
+
+    :arg values: A list of numbers, or ``None``
+    :arg reference: The number to compare to
+    :rtype: list
+    """
+    if numpy is not None and values:
+        return _with_missing(
+            values, (_array(values) < reference).tolist())
+    return [None if v is None else v < reference for v in values]
+
+def greater_than(values, reference):
+    """
+    Return a list with ``values[i] > reference`` for each value, or ``None``
+    where the value is ``None``.
+
+    :arg values: A list of numbers, or ``None``
+    :arg reference: The number to compare to
+    :rtype: list
+    """
+    if numpy is not None and values:
+        return _with_missing(
+            values, (_array(values) > reference).tolist())
+    return [None if v is None else v > reference for v in values]
+
+def running_total(values):
+    """
+    Return the cumulative sum of `values`, as floats.
+
+    :arg values: A list of numbers
+    :rtype: list
+    """
+    if numpy is not None and values:
+        return numpy.cumsum(_array(values)).tolist()
+    totals = []
+    total = 0.0
+    for v in values:
+        total += v
+        totals.append(total)
+    return totals
+
+def argsort(values, reverse=False):
+    """
+    Return the positions of `values` in sorted order.  The sort is stable, so
+    equal values keep their original order, even if `reverse` is ``True``, the
+    same as with :py:func:`sorted`.
+
+    :arg values: A list of numbers
+    :arg reverse: Sort from largest to smallest
+    :rtype: list
+    """
+    if numpy is not None and values:
+        array = _array(values)
+        if reverse:
+            array = -array
+        return numpy.argsort(array, kind='mergesort').tolist()
+    return sorted(
+        range(len(values)), key=values.__getitem__, reverse=reverse)
@@ -1,4 +1,5 @@
 from voluptuous import *
+from . import settings
 
 # Configuration file: client
 def config_client():
@@ -20,6 +21,10 @@ def config_client():
         Optional('timeout', default=30): All(
             Coerce(int), Range(min=1, max=86400)),
         Optional('master_only', default=False): Boolean(),
+        Optional('http_compress', default=False): Boolean(),
+        Optional('metadata_cache', default=False): Boolean(),
+        Optional('metadata_cache_ttl', default=settings.metadata_cache_ttl()):
+            All(Coerce(int), Range(min=1, max=86400)),
     }
 
 # Configuration file: logging
@@ -1,4 +1,5 @@
 from voluptuous import *
+from . import settings
 
 # Action Options
 
@@ -36,6 +37,9 @@ def disable_action():
 def extra_settings():
     return { Optional('extra_settings', default={}): dict }
 
+def filter_summary():
+    return { Optional('filter_summary', default=False): Boolean() }
+
 def ignore_empty_list():
     return { Optional('ignore_empty_list', default=False): Boolean() }
 
@@ -51,14 +55,53 @@ def include_global_state():
 def indices():
     return { Optional('indices', default=None): Any(None, list) }
 
+def journal():
+    return { Optional('journal', default=None): Any(str, unicode, None) }
+
 def key():
     return { Required('key'): Any(str, unicode) }
 
+def loader():
+    return {
+        Optional('loader', default='chunked'): Any('bulk', 'chunked', 'lazy')
+    }
+
+def max_concurrent_requests():
+    return {
+        Optional('max_concurrent_requests', default=1):
+            All(Coerce(int), Range(min=1, max=64))
+    }
+
+def max_concurrent_fetches():
+    return {
+        Optional('max_concurrent_fetches',
+            default=settings.max_concurrent_fetches()):
+                All(Coerce(int), Range(min=1, max=32))
+    }
+
+def max_merges_per_node():
+    return {
+        Optional('max_merges_per_node', default=None):
+            Any(None, All(Coerce(int), Range(min=1, max=32)))
+    }
+
 def max_num_segments():
     return {
         Required('max_num_segments'): All(Coerce(int), Range(min=1, max=32768))
     }
 
+def max_recovering_bytes():
+    return {
+        Optional('max_recovering_bytes', default=None):
+            Any(None, All(Coerce(int), Range(min=1)))
+    }
+
+def max_recovering_shards():
+    return {
+        Optional('max_recovering_shards', default=None):
+            Any(None, All(Coerce(int), Range(min=1)))
+    }
+
 def max_wait(action):
     # The separation is here in case I want to change defaults later...
     value = -1
@@ -84,6 +127,9 @@ def partial():
 def refresh():
     return { Optional('refresh', default=True): Boolean() }
 
+def reorder_filters():
+    return { Optional('reorder_filters', default=False): Boolean() }
+
 def remote_aws_key():
     return { Optional('remote_aws_key', default=None): Any(str, unicode, None) }
 
@@ -203,6 +249,16 @@ def slices():
         All(Coerce(int), Range(min=1, max=500)), None)
     }
 
+def snapshot_catalog():
+    return {
+        Optional('snapshot_catalog', default=None): Any(str, unicode, None)
+    }
+
+def snapshot_loader():
+    return {
+        Optional('loader', default='bulk'): Any(*settings.snapshot_loaders())
+    }
+
 def timeout(action):
     # if action == 'reindex':
     value = 60
@@ -235,7 +291,7 @@ def wait_for_active_shards(action):
 def wait_for_completion(action):
     # if action in ['reindex', 'restore', 'snapshot']:
     value = True
-    if action in ['allocation', 'cluster_routing', 'replicas']:
+    if action in ['allocation', 'cluster_routing', 'open', 'replicas']:
         value = False
     return { Optional('wait_for_completion', default=value): Boolean() }
 
@@ -244,7 +300,7 @@ def wait_interval(action):
     maxval = 30
     # if action in ['allocation', 'cluster_routing', 'replicas']:
     value = 3
-    if action in ['restore', 'snapshot', 'reindex']:
+    if action in ['open', 'restore', 'snapshot', 'reindex']:
         value = 9
     return { Optional('wait_interval', default=value): Any(All(
                 Coerce(int), Range(min=minval, max=maxval)), None) }
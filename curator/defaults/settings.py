@@ -11,6 +11,33 @@ def version_min():
 def config_file():
     return os.path.join(os.path.expanduser('~'), '.curator', 'curator.yml')
 
+# Number of seconds cached cluster metadata may be reused by later actions
+def metadata_cache_ttl():
+    return 300
+
+# Number of seconds after which a snapshot deletion plan in a journal is
+# discarded, rather than resumed
+def journal_max_age():
+    return 86400
+
+# Default maximum number of metadata requests an IndexList sends at once
+def max_concurrent_fetches():
+    return 4
+
+# Seconds before the second check of an operation by a Waiter.  The delay
+# doubles after each check, up to the wait_interval of the action.
+def wait_first_delay():
+    return 1
+
+# Fraction of each Waiter delay which is randomized
+def wait_jitter():
+    return 0.1
+
+# Longest time in seconds Elasticsearch holds each cluster health request
+# open while waiting for the requested status
+def health_poll_timeout():
+    return 30
+
 # Default filter patterns (regular expressions)
 def regex_map():
     return {
@@ -54,6 +81,14 @@ def index_actions():
         'snapshot',
     ]
 
+# Ways to read index metadata when building an IndexList
+def index_loaders():
+    return [ 'bulk', 'chunked', 'lazy' ]
+
+# Ways to read snapshot metadata when building a SnapshotList
+def snapshot_loaders():
+    return [ 'bulk', 'lazy' ]
+
 def snapshot_actions():
     return [ 'delete_snapshots', 'restore' ]
 
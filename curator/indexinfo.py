@@ -0,0 +1,242 @@
+import copy
+
+_FIELDS = (
+    'state', 'number_of_shards', 'number_of_replicas', 'size_in_bytes',
+    'docs', 'segments', 'routing', 'aliases',
+)
+_AGE_FIELDS = ('creation_date', 'name', 'min_value', 'max_value')
+
+class IndexInfo(object):
+    """
+    The metadata of a single index in an :class:`curator.indexlist.IndexList`.
+
+    Fields are stored in slots, rather than in a dictionary per index (and
+    another for its ages), as there may be many thousands of these.  For
+    compatibility, an `IndexInfo` can be read and written like the dictionary
+    it replaces, e.g. ``info['state']`` or ``info['age']['creation_date']``.
+
+    Age sources which have not been calculated, `routing` if the index has no
+    routing settings, and `aliases` if metadata has not been read, are absent
+    rather than ``None``.
+    """
+    __slots__ = _FIELDS + tuple('age_' + f for f in _AGE_FIELDS) + ('_extra',)
+
+    def __init__(self):
+        self.state = ''
+        self.number_of_shards = 0
+        self.number_of_replicas = 0
+        self.size_in_bytes = 0
+        self.docs = 0
+        self.segments = 0
+        self.routing = None
+        self.aliases = None
+        self.age_creation_date = None
+        self.age_name = None
+        self.age_min_value = None
+        self.age_max_value = None
+        # Any other keys set by API users
+        self._extra = None
+
+    @property
+    def age(self):
+        """A dictionary-like view of the age sources of this index."""
+        return IndexAge(self)
+
+    def get_age(self, key):
+        """
+        Return the age from source `key`, or ``None`` if it is absent.  This
+        is faster than ``info['age'].get(key)``.
+
+        :arg key: An age source, e.g. ``creation_date`` or ``name``
+        """
+        if key in _AGE_FIELDS:
+            return getattr(self, 'age_' + key)
+        return self.age.get(key)
+
+    def keys(self):
+        keys = ['age']
+        keys += [f for f in _FIELDS if getattr(self, f) is not None]
+        if self._extra:
+            keys += [k for k in self._extra if k != 'age']
+        return keys
+
+    def items(self):
+        return [(k, self[k]) for k in self.keys()]
+
+    def to_dict(self):
+        """
+        Return the data of this index as the plain dictionary used by earlier
+        versions of Curator.
+
+        :rtype: dict
+        """
+        retval = dict(self.items())
+        retval['age'] = self.age.to_dict()
+        return retval
+
+    def copy(self):
+        """Return an independent copy of this `IndexInfo`."""
+        other = IndexInfo()
+        for f in IndexInfo.__slots__:
+            setattr(other, f, getattr(self, f))
+        if self.routing is not None:
+            other.routing = copy.deepcopy(self.routing)
+        if self.aliases is not None:
+            other.aliases = list(self.aliases)
+        if self._extra is not None:
+            other._extra = copy.deepcopy(self._extra)
+        return other
+
+    def __deepcopy__(self, memo):
+        return self.copy()
+
+    def __getitem__(self, key):
+        if key == 'age':
+            return self.age
+        if key in _FIELDS:
+            value = getattr(self, key)
+            if value is not None:
+                return value
+        elif self._extra and key in self._extra and key != 'age':
+            return self._extra[key]
+        raise KeyError(key)
+
+    def __setitem__(self, key, value):
+        if key in _FIELDS:
+            setattr(self, key, value)
+        elif key == 'age':
+            age = IndexAge(self)
+            age.clear()
+            for k in value:
+                age[k] = value[k]
+        else:
+            if self._extra is None:
+                self._extra = {}
+            self._extra[key] = value
+
+    def __contains__(self, key):
+        return key in self.keys()
+
+    def __iter__(self):
+        return iter(self.keys())
+
+    def __len__(self):
+        return len(self.keys())
+
+    def get(self, key, default=None):
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    def __eq__(self, other):
+        if isinstance(other, IndexInfo):
+            other = other.to_dict()
+        return self.to_dict() == other
+
+    def __ne__(self, other):
+        return not self == other
+
+    def __repr__(self):
+        return 'IndexInfo({0})'.format(self.to_dict())
+
+class IndexAge(object):
+    """
+    A dictionary-like view of the age sources (``creation_date``, ``name``,
+    ``min_value``, and ``max_value``) of an :class:`IndexInfo`.
+    """
+    __slots__ = ('info',)
+
+    def __init__(self, info):
+        self.info = info
+
+    def _extra(self):
+        extra = self.info._extra
+        return extra['age'] if extra and 'age' in extra else None
+
+    def keys(self):
+        keys = [
+            f for f in _AGE_FIELDS if getattr(self.info, 'age_' + f) is not None
+        ]
+        extra = self._extra()
+        if extra:
+            keys += list(extra.keys())
+        return keys
+
+    def items(self):
+        return [(k, self[k]) for k in self.keys()]
+
+    def to_dict(self):
+        return dict(self.items())
+
+    def __getitem__(self, key):
+        if key in _AGE_FIELDS:
+            value = getattr(self.info, 'age_' + key)
+            if value is not None:
+                return value
+        else:
+            extra = self._extra()
+            if extra and key in extra:
+                return extra[key]
+        raise KeyError(key)
+
+    def __setitem__(self, key, value):
+        if key in _AGE_FIELDS:
+            setattr(self.info, 'age_' + key, value)
+        else:
+            if self.info._extra is None:
+                self.info._extra = {}
+            self.info._extra.setdefault('age', {})[key] = value
+
+    def __delitem__(self, key):
+        # Raise KeyError if absent, as a dictionary would
+        self[key]
+        if key in _AGE_FIELDS:
+            setattr(self.info, 'age_' + key, None)
+        else:
+            del self._extra()[key]
+
+    def __contains__(self, key):
+        if key in _AGE_FIELDS:
+            return getattr(self.info, 'age_' + key) is not None
+        extra = self._extra()
+        return bool(extra) and key in extra
+
+    def __iter__(self):
+        return iter(self.keys())
+
+    def __len__(self):
+        return len(self.keys())
+
+    def get(self, key, default=None):
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    def pop(self, key, *default):
+        try:
+            value = self[key]
+        except KeyError:
+            if default:
+                return default[0]
+            raise
+        del self[key]
+        return value
+
+    def clear(self):
+        for f in _AGE_FIELDS:
+            setattr(self.info, 'age_' + f, None)
+        if self._extra() is not None:
+            del self.info._extra['age']
+
+    def __eq__(self, other):
+        if isinstance(other, IndexAge):
+            other = other.to_dict()
+        return self.to_dict() == other
+
+    def __ne__(self, other):
+        return not self == other
+
+    def __repr__(self):
+        return repr(self.to_dict())
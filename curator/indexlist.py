@@ -1,25 +1,83 @@
 from datetime import timedelta, datetime, date
 import time
 import re
+import fnmatch
 import logging
 import elasticsearch
 from .defaults import settings
 from .validators import SchemaCheck, filters
 from .exceptions import *
 from .utils import *
+from .indexinfo import IndexInfo
+from . import columnar
+from . import patterns
+
+# Only the fields IndexList uses are requested from the cluster, as the full
+# responses include every mapping, or every shard, in the cluster.
+_METADATA_PATH = ','.join(
+    ['metadata.indices.*.state', 'metadata.indices.*.aliases'] + [
+        'metadata.indices.*.settings.index.{0}'.format(f) for f in (
+            'creation_date', 'number_of_replicas', 'number_of_shards',
+            'routing'
+        )
+    ]
+)
+_SETTINGS_PATH = ','.join(
+    '*.settings.index.{0}'.format(f) for f in (
+        'creation_date', 'number_of_replicas', 'number_of_shards', 'routing')
+)
+_STATS_PATH = (
+    'indices.*.total.store.size_in_bytes,indices.*.total.docs.count')
+_SEGMENTS_PATH = 'indices.*.total.segments.count'
 
 class IndexList(object):
-    def __init__(self, client):
+    def __init__(self, client, loader='chunked', cache=None,
+            max_concurrent_fetches=None):
         verify_client_object(client)
         self.loggit = logging.getLogger('curator.indexlist')
+        if loader not in settings.index_loaders():
+            raise ValueError(
+                'Invalid value for "loader": {0}.  Must be one of '
+                '{1}'.format(loader, settings.index_loaders())
+            )
         #: An Elasticsearch Client object
         #: Also accessible as an instance variable.
         self.client = client
         #: Instance variable.
+        #: How index metadata is fetched at instance creation time.
+        #: ``chunked`` makes one request per 3KB chunk of index names, while
+        #: ``bulk`` reads the metadata of every index in the cluster with a
+        #: single ``cluster.state`` call and one ``_stats`` call.  ``lazy``
+        #: only reads index names, and fetches each group of fields the first
+        #: time a filter needs it, for the indices still in `indices`.
+        self.loader = loader
+        #: Instance variable.
+        #: An optional :class:`curator.metadatacache.MetadataCache`, shared
+        #: with other IndexList objects in the same run.  It is not used by
+        #: the ``lazy`` loader, as its `index_info` is only partly populated.
+        self.cache = cache if loader != 'lazy' else None
+        #: Instance variable.
+        #: The maximum number of chunked requests for index metadata which
+        #: are sent at the same time.  Defaults to
+        #: :py:func:`curator.defaults.settings.max_concurrent_fetches`
+        self.max_concurrent_fetches = (
+            max_concurrent_fetches if max_concurrent_fetches is not None
+            else settings.max_concurrent_fetches()
+        )
+        #: Instance variable.
+        #: The indices for which each group of fields has been fetched, when
+        #: using the ``lazy`` loader, and those whose segment counts have been
+        #: fetched, with any loader. **Type:** ``dict()`` of ``set()``
+        self.loaded = {'metadata': set(), 'stats': set(), 'segments': set()}
+        #: Instance variable.
         #: Information extracted from indices, such as segment count, age, etc.
         #: Populated at instance creation time, and by other private helper
-        #: methods, as needed. **Type:** ``dict()``
+        #: methods, as needed. **Type:** ``dict()`` of
+        #: :class:`curator.indexinfo.IndexInfo`
         self.index_info = {}
+        self._working = WorkingSet()
+        # Alias name -> set of index names, built from `index_info` on demand
+        self._alias_map = None
         #: Instance variable.
         #: The running list of indices which will be used by an Action class.
         #: Populated at instance creation time. **Type:** ``list()``
@@ -30,14 +88,26 @@ class IndexList(object):
         self.all_indices = []
         self.__get_indices()
 
+    @property
+    def indices(self):
+        return self._working.members()
+
+    @indices.setter
+    def indices(self, value):
+        self._working.reset(value)
+
     def __actionable(self, idx):
-        self.loggit.debug(
-            'Index {0} is actionable and remains in the list.'.format(idx))
+        if self.loggit.isEnabledFor(logging.DEBUG):
+            self.loggit.debug(
+                'Index {0} is actionable and remains in the list.'.format(idx))
 
     def __not_actionable(self, idx):
-            self.loggit.debug(
-                'Index {0} is not actionable, removing from list.'.format(idx))
-            self.indices.remove(idx)
+            if self.loggit.isEnabledFor(logging.DEBUG):
+                self.loggit.debug(
+                    'Index {0} is not actionable, removing from '
+                    'list.'.format(idx)
+                )
+            self._working.discard(idx)
 
     def __excludify(self, condition, exclude, index, msg=None):
         if condition == True:
@@ -54,40 +124,144 @@ class IndexList(object):
             else:
                 text = "Removed from actionable list"
                 self.__not_actionable(index)
-        if msg:
+        if msg and self.loggit.isEnabledFor(logging.DEBUG):
             self.loggit.debug('{0}: {1}'.format(text, msg))
 
+    def __excludify_all(self, conditions, exclude, indices, msg=None):
+        """
+        The same as calling `__excludify` for each of `indices` with the
+        matching entry of `conditions`, but without the per-index overhead
+        unless debug logging is enabled.
+
+        :arg msg: A function which takes a position in `indices` and returns
+            the debug message for that index
+        """
+        if self.loggit.isEnabledFor(logging.DEBUG):
+            for i, index in enumerate(indices):
+                self.__excludify(
+                    conditions[i], exclude, index, msg(i) if msg else None)
+            return
+        # An index is removed when its condition is the same as `exclude`
+        remove = bool(exclude)
+        for i, index in enumerate(indices):
+            if bool(conditions[i]) == remove:
+                self._working.discard(index)
+
     def __get_indices(self):
         """
         Pull all indices into `all_indices`, then populate `indices` and
         `index_info`
         """
         self.loggit.debug('Getting all indices')
+        if self.cache is not None and self.__get_cached_indices():
+            return
+        if self.loader == 'bulk':
+            self._get_bulk_metadata()
+        elif self.loader == 'lazy':
+            self.all_indices = get_indices(self.client)
+            self.indices = self.all_indices[:]
+            for index in self.indices:
+                self.__build_index_info(index)
+        else:
+            self.all_indices = get_indices(self.client)
+            self.indices = self.all_indices[:]
+            if self.indices:
+                for index in self.indices:
+                    self.__build_index_info(index)
+                self._get_metadata_and_stats()
+        if self.cache is not None:
+            self.cache.put_indices(
+                self.client, self.all_indices, self.indices, self.index_info)
+
+    def __get_cached_indices(self):
+        """
+        Populate `all_indices`, `indices`, and `index_info` from `cache`.
+        Indices which have been invalidated, or which are new since the cache
+        entry was stored, are fetched from the cluster.  Return ``False`` if
+        there is no usable cache entry.
+        """
+        cached = self.cache.get_indices(self.client)
+        if cached is None:
+            return False
+        all_indices, indices, index_info, stale = cached
+        if not stale:
+            self.all_indices = all_indices
+            self.indices = indices
+            self.index_info = index_info
+            return True
+        if self.loader == 'bulk':
+            # A full reload is only two requests anyway
+            return False
         self.all_indices = get_indices(self.client)
-        self.indices = self.all_indices[:]
+        refetch = [
+            i for i in self.all_indices if i in stale or not i in index_info]
+        keep = set(indices) - stale
+        self.index_info = dict(
+            (i, index_info[i]) for i in self.all_indices if i in keep)
+        self.loggit.debug(
+            'Refreshing cached metadata for indices: {0}'.format(refetch))
+        self.indices = refetch
         if self.indices:
             for index in self.indices:
                 self.__build_index_info(index)
-            self._get_metadata()
-            self._get_index_stats()
+            self._get_metadata_and_stats()
+        keep.update(self.indices)
+        self.indices = [i for i in self.all_indices if i in keep]
+        self.cache.put_indices(
+            self.client, self.all_indices, self.indices, self.index_info)
+        return True
+
+    def _ensure_info(self, group):
+        """
+        Make sure the fields in `group` are populated in `index_info` for every
+        index in `indices`.  This only fetches anything when using the ``lazy``
+        loader, and then only for indices which have not been fetched yet.
+
+        :arg group: Either ``metadata`` (state, shard and replica counts,
+            creation date and routing) or ``stats`` (size and doc count)
+        """
+        if self.loader != 'lazy':
+            return
+        if group == 'stats':
+            # Closed indices are identified from the metadata
+            self._ensure_info('metadata')
+        missing = [i for i in self.indices if not i in self.loaded[group]]
+        if not missing:
+            return
+        self.loggit.debug(
+            'Fetching {0} for {1} indices'.format(group, len(missing)))
+        working_list = self.indices
+        self.indices = missing[:]
+        try:
+            if group == 'metadata':
+                self._get_metadata()
+            else:
+                self._get_index_stats()
+        finally:
+            self.loaded[group].update(missing)
+            # Drop any index which turned out to be not actionable
+            removed = set(missing) - set(self.indices)
+            working_list[:] = [i for i in working_list if not i in removed]
+            self.indices = working_list
+
+    def load_metadata(self):
+        """
+        Make sure the state, shard and replica counts, creation date and
+        routing of every index in `indices` are in `index_info`.  With the
+        ``lazy`` loader, only indices which have not been fetched yet are
+        requested.  Otherwise, they were all read at instance creation time.
+        """
+        self._ensure_info('metadata')
 
     def __build_index_info(self, index):
         """
-        Ensure that `index` is a key in `index_info`. If not, create a
-        sub-dictionary structure under that key.
+        Ensure that `index` is a key in `index_info`. If not, create an
+        :class:`curator.indexinfo.IndexInfo` record under that key.
         """
         self.loggit.debug(
             'Building preliminary index metadata for {0}'.format(index))
         if not index in self.index_info:
-            self.index_info[index] = {
-                "age" : {},
-                "number_of_replicas" : 0,
-                "number_of_shards" : 0,
-                "segments" : 0,
-                "size_in_bytes" : 0,
-                "docs" : 0,
-                "state" : "",
-            }
+            self.index_info[index] = IndexInfo()
 
     def __map_method(self, ft):
         methods = {
@@ -105,6 +279,97 @@ class IndexList(object):
         }
         return methods[ft]
 
+    def __filter_cost(self, f):
+        """
+        Return the relative cost of running filter `f`, or ``None`` if the
+        result of `f` depends on which other indices are in the list, as with
+        the ``count`` and ``space`` filtertypes.
+
+        * ``0``: only index names are needed
+        * ``1``: index metadata is needed
+        * ``2``: one extra API call per chunk of indices is made
+        * ``3``: an expensive API call (field_stats) is made
+        """
+        ft = f['filtertype'] if 'filtertype' in f else None
+        if ft == 'age':
+            source = f['source'] if 'source' in f else 'name'
+            # An invalid source is left where it is, and fails validation
+            return { 'name': 0, 'creation_date': 1, 'field_stats': 3 }.get(
+                source)
+        costs = {
+            'alias': 1,
+            'allocated': 1,
+            'closed': 1,
+            'forcemerged': 2,
+            'kibana': 0,
+            'none': 0,
+            'opened': 1,
+            'pattern': 0,
+        }
+        # Unknown filtertypes are left where they are, and fail validation
+        return costs[ft] if ft in costs else None
+
+    def __fuse_patterns(self, filters):
+        """
+        Split `filters` into lists of filters to run together.  Consecutive
+        ``pattern`` filters are grouped, to be run by `filter_by_regexes`.
+        Every other filter is in a list of its own.
+        """
+        runs = []
+        for f in filters:
+            if (f.get('filtertype') == 'pattern' and runs
+                    and runs[-1][0].get('filtertype') == 'pattern'):
+                runs[-1].append(f)
+            else:
+                runs.append([f])
+        return runs
+
+    def _plan_filters(self, filters):
+        """
+        Return `filters` reordered so that cheaper filters run before more
+        expensive ones.  Each filter only removes indices based on the index
+        itself, so the order does not change the result, except for ``count``
+        and ``space`` filters.  Filters are never moved across one of those.
+
+        :arg filters: A list of filter dictionaries
+        :rtype: list
+        """
+        plan = []
+        segment = []
+        for f in filters:
+            cost = self.__filter_cost(f)
+            if cost is None:
+                # sorted() is stable, so equal-cost filters keep their order
+                plan += sorted(segment, key=lambda x: self.__filter_cost(x))
+                plan.append(f)
+                segment = []
+            else:
+                segment.append(f)
+        plan += sorted(segment, key=lambda x: self.__filter_cost(x))
+        # Filters without a filtertype are reported by SchemaCheck later
+        self.loggit.info('Filter plan: {0}'.format(
+                ', '.join(['{0}'.format(f.get('filtertype')) for f in plan])
+            )
+        )
+        return plan
+
+    def _fetch_chunks(self, fetch, indices=None):
+        """
+        Call `fetch` with each chunk of `indices`, sending up to
+        `max_concurrent_fetches` requests at the same time.  Responses are
+        returned in chunk order, to be processed by the caller in this thread.
+
+        :arg fetch: A function which takes a list of indices and returns the
+            response for them
+        :arg indices: A list of index names.  Default: `indices`
+        :rtype: list of ``(chunk, response)`` tuples
+        """
+        index_lists = chunk_index_list(
+            self.indices if indices is None else indices)
+        responses = map_chunks(
+            fetch, index_lists, self.max_concurrent_fetches, raise_first=True)
+        return list(zip(index_lists, responses))
+
     def _get_index_stats(self):
         """
         Populate `index_info` with index `size_in_bytes` and doc count
@@ -112,30 +377,36 @@ class IndexList(object):
         """
         self.loggit.debug('Getting index stats')
         self.empty_list_check()
-        # Subroutine to do the dirty work
-        def iterate_over_stats(stats):
-            for index in stats['indices']:
-                size = stats['indices'][index]['total']['store']['size_in_bytes']
-                docs = stats['indices'][index]['total']['docs']['count']
-                self.loggit.debug(
-                    'Index: {0}  Size: {1}  Docs: {2}'.format(
-                        index, byte_size(size), docs
-                    )
-                )
-                self.index_info[index]['size_in_bytes'] = size
-                self.index_info[index]['docs'] = docs
-
         working_list = self.working_list()
         for index in self.working_list():
-            if self.index_info[index]['state'] == 'close':
+            if self.index_info[index].state == 'close':
                 working_list.remove(index)
         if working_list:
-            index_lists = chunk_index_list(working_list)
-            for l in index_lists:
-                iterate_over_stats(
-                    self.client.indices.stats(index=to_csv(l),
-                    metric='store,docs')
+            fetch = lambda l: self.client.indices.stats(
+                index=to_csv(l), metric='store,docs', filter_path=_STATS_PATH)
+            for l, stats in self._fetch_chunks(fetch, working_list):
+                self.__populate_stats(stats)
+
+    def __populate_stats(self, stats):
+        """
+        Copy `size_in_bytes` and doc count from an ``indices.stats`` response
+        into `index_info`.
+        """
+        # An empty projection is returned as {}
+        stats = stats.get('indices', {})
+        for index in stats:
+            if not index in self.index_info:
+                # Created after the index list was read.  Ignore it.
+                continue
+            size = stats[index]['total']['store']['size_in_bytes']
+            docs = stats[index]['total']['docs']['count']
+            self.loggit.debug(
+                'Index: {0}  Size: {1}  Docs: {2}'.format(
+                    index, byte_size(size), docs
                 )
+            )
+            self.index_info[index].size_in_bytes = size
+            self.index_info[index].docs = docs
 
     def _get_metadata(self):
         """
@@ -144,46 +415,111 @@ class IndexList(object):
         """
         self.loggit.debug('Getting index metadata')
         self.empty_list_check()
-        index_lists = chunk_index_list(self.indices)
-        for l in index_lists:
-            working_list = (
-                self.client.cluster.state(
-                    index=to_csv(l),metric='metadata'
-                )['metadata']['indices']
+        for l, state in self._fetch_chunks(self.__fetch_metadata):
+            self.__process_metadata(state)
+
+    def __fetch_metadata(self, l):
+        return self.client.cluster.state(
+            index=to_csv(l), metric='metadata', filter_path=_METADATA_PATH)
+
+    def __process_metadata(self, state):
+        """
+        Populate `index_info` from a chunked ``cluster.state`` response.
+        """
+        working_list = state.get('metadata', {}).get('indices')
+        if working_list:
+            for index in list(working_list.keys()):
+                wl = working_list[index]
+                if 'settings' not in wl:
+                    # We can try to get the same info from index/_settings.
+                    # To work around https://github.com/elastic/curator/issues/880
+                    alt_wl = self.client.indices.get(index, feature='_settings')[index]
+                    wl['settings'] = alt_wl['settings']
+                self.__populate_metadata(index, wl)
+
+    def _get_metadata_and_stats(self):
+        """
+        The same as calling `_get_metadata`, then `_get_index_stats`, but the
+        stats request for each chunk is sent along with its cluster state
+        request, rather than after all metadata has been read.  Closed indices
+        are skipped by the stats API, as they cannot be known beforehand.
+        """
+        self.loggit.debug('Getting index metadata and stats')
+        self.empty_list_check()
+        def fetch(l):
+            state = self.__fetch_metadata(l)
+            stats = self.client.indices.stats(
+                index=to_csv(l), metric='store,docs', filter_path=_STATS_PATH,
+                params={'ignore_unavailable': 'true'}
             )
-            if working_list:
-                for index in list(working_list.keys()):
-                    s = self.index_info[index]
-                    wl = working_list[index]
-
-                    if 'settings' not in wl:
-                        # We can try to get the same info from index/_settings.
-                        # To work around https://github.com/elastic/curator/issues/880
-                        alt_wl = self.client.indices.get(index, feature='_settings')[index]
-                        wl['settings'] = alt_wl['settings']
-
-
-                    if not 'creation_date' in wl['settings']['index']:
-                        self.loggit.warn(
-                            'Index: {0} has no "creation_date"! This implies '
-                            'that the index predates Elasticsearch v1.4. For '
-                            'safety, this index will be removed from the '
-                            'actionable list.'.format(index)
-                        )
-                        self.__not_actionable(index)
-                    else:
-                        s['age']['creation_date'] = (
-                            fix_epoch(wl['settings']['index']['creation_date'])
-                        )
-                    s['number_of_replicas'] = (
-                        wl['settings']['index']['number_of_replicas']
-                    )
-                    s['number_of_shards'] = (
-                        wl['settings']['index']['number_of_shards']
-                    )
-                    s['state'] = wl['state']
-                    if 'routing' in wl['settings']['index']:
-                        s['routing'] = wl['settings']['index']['routing']
+            return state, stats
+        responses = self._fetch_chunks(fetch)
+        for l, (state, stats) in responses:
+            self.__process_metadata(state)
+        for l, (state, stats) in responses:
+            self.__populate_stats(stats)
+
+    def __populate_metadata(self, index, wl):
+        """
+        Copy the state, shard and replica counts, creation date, aliases and
+        routing settings of `index` from its cluster state metadata, `wl`, into
+        `index_info`.
+        """
+        s = self.index_info[index]
+        # An index without aliases has none in a filtered response
+        s.aliases = list(wl.get('aliases', []))
+        self._alias_map = None
+        if not 'creation_date' in wl['settings']['index']:
+            self.loggit.warn(
+                'Index: {0} has no "creation_date"! This implies '
+                'that the index predates Elasticsearch v1.4. For '
+                'safety, this index will be removed from the '
+                'actionable list.'.format(index)
+            )
+            self.__not_actionable(index)
+        else:
+            s.age_creation_date = (
+                fix_epoch(wl['settings']['index']['creation_date'])
+            )
+        s.number_of_replicas = wl['settings']['index']['number_of_replicas']
+        s.number_of_shards = wl['settings']['index']['number_of_shards']
+        s.state = wl['state']
+        if 'routing' in wl['settings']['index']:
+            s.routing = wl['settings']['index']['routing']
+
+    def _get_bulk_metadata(self):
+        """
+        Populate `all_indices`, `indices`, and `index_info` for every index in
+        the cluster from a single ``cluster.state`` call, plus a single
+        ``indices.stats`` call for the size and doc count of open indices.
+        """
+        self.loggit.debug('Getting metadata for all indices in one request')
+        try:
+            working_list = self.client.cluster.state(
+                metric='metadata', filter_path=_METADATA_PATH
+            ).get('metadata', {}).get('indices', {})
+        except Exception as e:
+            raise FailedExecution('Failed to get indices. Error: {0}'.format(e))
+        self.all_indices = list(working_list.keys())
+        self.indices = self.all_indices[:]
+        if not self.indices:
+            return
+        if [i for i in self.all_indices if 'settings' not in working_list[i]]:
+            # Work around https://github.com/elastic/curator/issues/880 with one
+            # request for all indices, rather than one request per index.
+            alt_wl = self.client.indices.get_settings(
+                index='_all', filter_path=_SETTINGS_PATH,
+                params={'expand_wildcards': 'open,closed'}
+            )
+            for index in self.all_indices:
+                if 'settings' not in working_list[index]:
+                    working_list[index]['settings'] = alt_wl[index]['settings']
+        for index in self.all_indices:
+            self.__build_index_info(index)
+            self.__populate_metadata(index, working_list[index])
+        # Closed indices are not expanded by `_stats`, so this is only opened
+        self.__populate_stats(self.client.indices.stats(
+            metric='store,docs', filter_path=_STATS_PATH))
 
     def empty_list_check(self):
         """Raise exception if `indices` is empty"""
@@ -201,27 +537,66 @@ class IndexList(object):
         self.loggit.debug('Generating working list of indices')
         return self.indices[:]
 
+    def _get_alias_map(self):
+        """
+        Return a dictionary of each alias name to the set of indices it points
+        to, built from the aliases in `index_info`.  It is only rebuilt after
+        more index metadata has been read.
+
+        :rtype: dict
+        """
+        if self._alias_map is None:
+            alias_map = {}
+            for index, info in self.index_info.items():
+                for alias in info.aliases or []:
+                    alias_map.setdefault(alias, set()).add(index)
+            self._alias_map = alias_map
+        return self._alias_map
+
+    def indices_with_aliases(self, aliases):
+        """
+        Return the set of indices in `index_info` which are associated with any
+        of `aliases`, without asking Elasticsearch.  Alias names may use ``*``
+        wildcards, or be ``_all``, as with the get alias API.
+
+        :arg aliases: A list of alias names
+        :rtype: set
+        """
+        self._ensure_info('metadata')
+        alias_map = self._get_alias_map()
+        found = set()
+        for name in ensure_list(aliases):
+            if name == '_all':
+                names = list(alias_map.keys())
+            elif '*' in name:
+                names = [a for a in alias_map if fnmatch.fnmatchcase(a, name)]
+            else:
+                names = [name] if name in alias_map else []
+            for alias in names:
+                found.update(alias_map[alias])
+        return found
+
     def _get_segmentcounts(self):
         """
-        Populate `index_info` with segment information for each index.
+        Populate `index_info` with the total number of segments in all shard
+        copies of each index.  The counts come from the index stats API, which
+        is much cheaper than listing every segment with the segments API.
+        Counts which have already been fetched are not fetched again.
         """
         self.loggit.debug('Getting index segment counts')
         self.empty_list_check()
-        index_lists = chunk_index_list(self.indices)
-        for l in index_lists:
-            working_list = (
-                self.client.indices.segments(index=to_csv(l))['indices']
-            )
-            if working_list:
-                for index in list(working_list.keys()):
-                    shards = working_list[index]['shards']
-                    segmentcount = 0
-                    for shardnum in shards:
-                        for shard in range(0,len(shards[shardnum])):
-                            segmentcount += (
-                                shards[shardnum][shard]['num_search_segments']
-                            )
-                    self.index_info[index]['segments'] = segmentcount
+        missing = [i for i in self.indices if not i in self.loaded['segments']]
+        if not missing:
+            return
+        fetch = lambda l: self.client.indices.stats(
+            index=to_csv(l), metric='segments', filter_path=_SEGMENTS_PATH)
+        for l, stats in self._fetch_chunks(fetch, missing):
+            working_list = stats.get('indices', {})
+            for index in working_list:
+                if index in self.index_info:
+                    self.index_info[index].segments = (
+                        working_list[index]['total']['segments']['count'])
+        self.loaded['segments'].update(missing)
 
     def _get_name_based_ages(self, timestring):
         """
@@ -238,7 +613,7 @@ class IndexList(object):
         for index in self.working_list():
             epoch = ts.get_epoch(index)
             if epoch:
-                self.index_info[index]['age']['name'] = epoch
+                self.index_info[index].age_name = epoch
 
     def _get_field_stats_dates(self, field='@timestamp'):
         """
@@ -254,20 +629,19 @@ class IndexList(object):
             'Omitting any closed indices.'
         )
         self.filter_closed()
-        index_lists = chunk_index_list(self.indices)
-        for l in index_lists:
-            working_list = self.client.field_stats(
-                index=to_csv(l), fields=field, level='indices'
-                )['indices']
+        fetch = lambda l: self.client.field_stats(
+            index=to_csv(l), fields=field, level='indices')
+        for l, stats in self._fetch_chunks(fetch):
+            working_list = stats['indices']
             if working_list:
                 for index in list(working_list.keys()):
                     try:
-                        s = self.index_info[index]['age']
+                        s = self.index_info[index]
                         wl = working_list[index]['fields'][field]
                         # Use these new references to keep these lines more
                         # readable
-                        s['min_value'] = fix_epoch(wl['min_value'])
-                        s['max_value'] = fix_epoch(wl['max_value'])
+                        s.age_min_value = fix_epoch(wl['min_value'])
+                        s.age_max_value = fix_epoch(wl['max_value'])
                     except KeyError as e:
                         raise ActionError(
                             'Field "{0}" not found in index '
@@ -301,8 +675,8 @@ class IndexList(object):
                 )
             self._get_name_based_ages(timestring)
         elif source == 'creation_date':
-            # Nothing to do here as this comes from `get_metadata` in __init__
-            pass
+            # This comes from `_get_metadata`, either in __init__ or on demand
+            self._ensure_info('metadata')
         elif source == 'field_stats':
             if not field:
                 raise MissingArgument(
@@ -329,12 +703,14 @@ class IndexList(object):
         can be first by setting `reverse=False`
         """
         # Do the age-based sorting here.
-        # First, build an temporary dictionary with just index and age
-        # as the key and value, respectively
-        temp = {}
+        # First, build columns of the indices which have an age, and the age
+        indices = []
+        ages = []
         for index in index_list:
-            if self.age_keyfield in self.index_info[index]['age']:
-                temp[index] = self.index_info[index]['age'][self.age_keyfield]
+            age = self.index_info[index].get_age(self.age_keyfield)
+            if age is not None:
+                indices.append(index)
+                ages.append(age)
             else:
                 msg = (
                     '{0} does not have age key "{1}" in IndexList '
@@ -346,11 +722,7 @@ class IndexList(object):
         # However, if you want oldest first, set reverse to False.
         # Effectively, this should set us up to act on everything older than
         # meets the other set criteria.
-        # It starts as a tuple, but then becomes a list.
-        sorted_tuple = (
-            sorted(temp.items(), key=lambda k: k[1], reverse=reverse)
-        )
-        return [x[0] for x in sorted_tuple]
+        return [indices[i] for i in columnar.argsort(ages, reverse=reverse)]
 
     def filter_by_regex(self, kind=None, value=None, exclude=False):
         """
@@ -368,32 +740,53 @@ class IndexList(object):
             Default is `False`
         """
         self.loggit.debug('Filtering indices by regex')
-        if kind not in [ 'regex', 'prefix', 'suffix', 'timestring' ]:
-            raise ValueError('{0}: Invalid value for kind'.format(kind))
-
-        # Stop here if None or empty value, but zero is okay
-        if value == 0:
-            pass
-        elif not value:
-            raise ValueError(
-                '{0}: Invalid value for "value". '
-                'Cannot be "None" type, empty, or False'
-            )
+        pattern = patterns.get_pattern(kind, value)
+        self.empty_list_check()
+        working_list = self.working_list()
+        msg = lambda i: 'Filter by regex: Index: {0}'.format(working_list[i])
+        self.__excludify_all(
+            [bool(pattern.match(index)) for index in working_list], exclude,
+            working_list, msg
+        )
 
-        if kind == 'timestring':
-            regex = settings.regex_map()[kind].format(get_date_regex(value))
-        else:
-            regex = settings.regex_map()[kind].format(value)
+    def filter_by_regexes(self, pattern_filters):
+        """
+        Apply several ``pattern`` filters in one pass over `indices`.  The
+        result is the same as calling `filter_by_regex` with each of
+        `pattern_filters` in turn, including raising `NoIndices` if the list
+        is emptied before the last one, but each name is only matched once.
 
+        :arg pattern_filters: A list of dictionaries of `filter_by_regex`
+            arguments
+        """
+        self.loggit.debug(
+            'Filtering indices by {0} regexes'.format(len(pattern_filters)))
+        specs = [(f.get('kind'), f.get('value')) for f in pattern_filters]
+        for kind, value in specs:
+            # Raise the same errors as filter_by_regex, before any filtering
+            patterns.get_regex(kind, value)
         self.empty_list_check()
-        pattern = re.compile(regex)
-        for index in self.working_list():
-            self.loggit.debug('Filter by regex: Index: {0}'.format(index))
-            match = pattern.match(index)
-            if match:
-                self.__excludify(True, exclude, index)
-            else:
-                self.__excludify(False, exclude, index)
+        working_list = self.working_list()
+        matches = patterns.match_sets(working_list, specs)
+        excludes = [bool(f.get('exclude', False)) for f in pattern_filters]
+        debug = self.loggit.isEnabledFor(logging.DEBUG)
+        last_removal = -1
+        for index in working_list:
+            for n, exclude in enumerate(excludes):
+                # Removed by the first filter it fails, as if run in order
+                if (index in matches[n]) == exclude:
+                    if debug:
+                        self.loggit.debug(
+                            'Removed from actionable list by pattern filter '
+                            '{0} ({1}: {2}): {3}'.format(
+                                n + 1, specs[n][0], specs[n][1], index)
+                        )
+                    self._working.discard(index)
+                    last_removal = max(last_removal, n)
+                    break
+        if not self.indices and last_removal < len(pattern_filters) - 1:
+            # The filters after the one which emptied the list would raise
+            raise NoIndices('index_list object is empty.')
 
     def filter_by_age(self, source='name', direction=None, timestring=None,
         unit=None, unit_count=None, field=None, stats_result='min_value',
@@ -438,29 +831,30 @@ class IndexList(object):
             source=source, timestring=timestring, field=field,
             stats_result=stats_result
         )
+        indices = []
+        ages = []
         for index in self.working_list():
-            try:
-                msg = (
-                    'Index "{0}" age ({1}), direction: "{2}", point of '
-                    'reference, ({3})'.format(
-                        index,
-                        int(self.index_info[index]['age'][self.age_keyfield]),
-                        direction,
-                        PoR
-                    )
-                )
-                # Because time adds to epoch, smaller numbers are actually older
-                # timestamps.
-                if direction == 'older':
-                    agetest = self.index_info[index]['age'][self.age_keyfield] < PoR
-                else:
-                    agetest = self.index_info[index]['age'][self.age_keyfield] > PoR
-                self.__excludify(agetest, exclude, index, msg)
-            except KeyError:
-                self.loggit.debug(
-                    'Index "{0}" does not meet provided criteria. '
-                    'Removing from list.'.format(index, source))
-                self.indices.remove(index)
+            age = self.index_info[index].get_age(self.age_keyfield)
+            if age is None:
+                if self.loggit.isEnabledFor(logging.DEBUG):
+                    self.loggit.debug(
+                        'Index "{0}" does not meet provided criteria. '
+                        'Removing from list.'.format(index, source))
+                self._working.discard(index)
+            else:
+                indices.append(index)
+                ages.append(age)
+        # Because time adds to epoch, smaller numbers are actually older
+        # timestamps.
+        if direction == 'older':
+            agetests = columnar.less_than(ages, PoR)
+        else:
+            agetests = columnar.greater_than(ages, PoR)
+        msg = lambda i: (
+            'Index "{0}" age ({1}), direction: "{2}", point of '
+            'reference, ({3})'.format(indices[i], int(ages[i]), direction, PoR)
+        )
+        self.__excludify_all(agetests, exclude, indices, msg)
 
     def filter_by_space(
         self, disk_space=None, reverse=True, use_age=False,
@@ -509,8 +903,6 @@ class IndexList(object):
             raise MissingArgument('No value for "disk_space" provided')
 
         disk_space = float(disk_space)
-
-        disk_usage = 0.0
         disk_limit = disk_space * 2**30
 
         self.loggit.debug(
@@ -518,6 +910,7 @@ class IndexList(object):
             'Omitting any closed indices.'
         )
         self.filter_closed()
+        self._ensure_info('stats')
 
         # Create a copy-by-value working list
         working_list = self.working_list()
@@ -534,15 +927,19 @@ class IndexList(object):
             # Default to sorting by index name
             sorted_indices = sorted(working_list, reverse=reverse)
 
-        for index in sorted_indices:
-
-            disk_usage += self.index_info[index]['size_in_bytes']
-            msg = (
-                '{0}, summed disk usage is {1} and disk limit is {2}.'.format(
-                    index, byte_size(disk_usage), byte_size(disk_limit)
-                )
+        disk_usage = columnar.running_total(
+            [self.index_info[index].size_in_bytes for index in sorted_indices]
+        )
+        msg = lambda i: (
+            '{0}, summed disk usage is {1} and disk limit is {2}.'.format(
+                sorted_indices[i], byte_size(disk_usage[i]),
+                byte_size(disk_limit)
             )
-            self.__excludify((disk_usage > disk_limit), exclude, index, msg)
+        )
+        self.__excludify_all(
+            columnar.greater_than(disk_usage, disk_limit), exclude,
+            sorted_indices, msg
+        )
 
     def filter_kibana(self, exclude=True):
         """
@@ -582,19 +979,25 @@ class IndexList(object):
         )
         self.filter_closed()
         self._get_segmentcounts()
-        for index in self.working_list():
+        working_list = self.working_list()
+        conditions = []
+        for index in working_list:
             # Do this to reduce long lines and make it more readable...
-            shards = int(self.index_info[index]['number_of_shards'])
-            replicas = int(self.index_info[index]['number_of_replicas'])
-            segments = int(self.index_info[index]['segments'])
-            msg = (
+            shards = int(self.index_info[index].number_of_shards)
+            replicas = int(self.index_info[index].number_of_replicas)
+            segments = int(self.index_info[index].segments)
+            expected_count = ((shards + (shards * replicas)) * max_num_segments)
+            conditions.append(segments <= expected_count)
+        def msg(i):
+            info = self.index_info[working_list[i]]
+            return (
                 '{0} has {1} shard(s) + {2} replica(s) '
                 'with a sum total of {3} segments.'.format(
-                    index, shards, replicas, segments
+                    working_list[i], info.number_of_shards,
+                    info.number_of_replicas, info.segments
                 )
             )
-            expected_count = ((shards + (shards * replicas)) * max_num_segments)
-            self.__excludify((segments <= expected_count), exclude, index, msg)
+        self.__excludify_all(conditions, exclude, working_list, msg)
 
 
     def filter_closed(self, exclude=True):
@@ -608,13 +1011,14 @@ class IndexList(object):
         """
         self.loggit.debug('Filtering closed indices')
         self.empty_list_check()
-        for index in self.working_list():
-            condition = self.index_info[index]['state'] == 'close'
-            self.loggit.debug('Index {0} state: {1}'.format(
-                    index, self.index_info[index]['state']
-                )
-            )
-            self.__excludify(condition, exclude, index)
+        self._ensure_info('metadata')
+        working_list = self.working_list()
+        msg = lambda i: 'Index {0} state: {1}'.format(
+            working_list[i], self.index_info[working_list[i]].state)
+        self.__excludify_all(
+            [self.index_info[index].state == 'close' for index in working_list],
+            exclude, working_list, msg
+        )
 
     def filter_opened(self, exclude=True):
         """
@@ -627,13 +1031,14 @@ class IndexList(object):
         """
         self.loggit.debug('Filtering open indices')
         self.empty_list_check()
-        for index in self.working_list():
-            condition = self.index_info[index]['state'] == 'open'
-            self.loggit.debug('Index {0} state: {1}'.format(
-                    index, self.index_info[index]['state']
-                )
-            )
-            self.__excludify(condition, exclude, index)
+        self._ensure_info('metadata')
+        working_list = self.working_list()
+        msg = lambda i: 'Index {0} state: {1}'.format(
+            working_list[i], self.index_info[working_list[i]].state)
+        self.__excludify_all(
+            [self.index_info[index].state == 'open' for index in working_list],
+            exclude, working_list, msg
+        )
 
     def filter_allocated(self,
             key=None, value=None, allocation_type='require', exclude=True,
@@ -660,27 +1065,26 @@ class IndexList(object):
             raise ValueError(
                 'Invalid "allocation_type": {0}'.format(allocation_type)
             )
+        self._ensure_info('metadata')
         self.empty_list_check()
-        index_lists = chunk_index_list(self.indices)
-        for l in index_lists:
-            working_list = self.client.indices.get_settings(index=to_csv(l))
-            if working_list:
-                for index in list(working_list.keys()):
-                    try:
-                        has_routing = (
-                            working_list[index]['settings']['index']['routing']['allocation'][allocation_type][key] == value
-                        )
-                    except KeyError:
-                        has_routing = False
-                    # if has_routing:
-                    msg = (
-                        '{0}: Routing (mis)match: '
-                        'index.routing.allocation.{1}.{2}={3}.'.format(
-                            index, allocation_type, key, value
-                        )
-                    )
-                        # self.indices.remove(index)
-                    self.__excludify(has_routing, exclude, index, msg)
+        # The routing settings were read with the rest of the index metadata
+        working_list = self.working_list()
+        conditions = []
+        for index in working_list:
+            try:
+                has_routing = (
+                    self.index_info[index].routing['allocation'][allocation_type][key] == value
+                )
+            except (KeyError, TypeError):
+                has_routing = False
+            conditions.append(has_routing)
+        msg = lambda i: (
+            '{0}: Routing (mis)match: '
+            'index.routing.allocation.{1}.{2}={3}.'.format(
+                working_list[i], allocation_type, key, value
+            )
+        )
+        self.__excludify_all(conditions, exclude, working_list, msg)
 
     def filter_none(self):
         self.loggit.debug('"None" filter selected.  No filtering will be done.')
@@ -702,31 +1106,21 @@ class IndexList(object):
             raise MissingArgument('No value for "aliases" provided')
         aliases = ensure_list(aliases)
         self.empty_list_check()
-        index_lists = chunk_index_list(self.indices)
-        for l in index_lists:
-            try:
-                # get_alias will either return {} or a NotFoundError.
-                has_alias = list(self.client.indices.get_alias(
-                    index=to_csv(l),
-                    name=to_csv(aliases)
-                ).keys())
-                self.loggit.debug('has_alias: {0}'.format(has_alias))
-            except elasticsearch.exceptions.NotFoundError:
-                # if we see the NotFoundError, we need to set working_list to {}
-                has_alias = []
-            for index in l:
-                if index in has_alias:
-                    isOrNot = 'is'
-                    condition = True
-                else:
-                    isOrNot = 'is not'
-                    condition = False
-                msg = (
-                    '{0} {1} associated with aliases: {2}'.format(
-                        index, isOrNot, aliases
-                    )
-                )
-                self.__excludify(condition, exclude, index, msg)
+        # The aliases were read with the rest of the index metadata
+        has_alias = self.indices_with_aliases(aliases)
+        if self.loggit.isEnabledFor(logging.DEBUG):
+            self.loggit.debug('has_alias: {0}'.format(sorted(has_alias)))
+        working_list = self.working_list()
+        msg = lambda i: (
+            '{0} {1} associated with aliases: {2}'.format(
+                working_list[i],
+                'is' if working_list[i] in has_alias else 'is not', aliases
+            )
+        )
+        self.__excludify_all(
+            [index in has_alias for index in working_list], exclude,
+            working_list, msg
+        )
 
     def filter_by_count(
         self, count=None, reverse=True, use_age=False,
@@ -776,7 +1170,7 @@ class IndexList(object):
         working_list = self.working_list()
 
         if use_age:
-            if source is not 'name':
+            if source != 'name':
                 self.loggit.warn(
                     'Cannot get age information from closed indices unless '
                     'source="name".  Omitting any closed indices.'
@@ -793,22 +1187,26 @@ class IndexList(object):
             # Default to sorting by index name
             sorted_indices = sorted(working_list, reverse=reverse)
 
-        idx = 1
-        for index in sorted_indices:
-            msg = (
-                '{0} is {1} of specified count of {2}.'.format(
-                    index, idx, count
-                )
+        msg = lambda i: (
+            '{0} is {1} of specified count of {2}.'.format(
+                sorted_indices[i], i + 1, count
             )
-            condition = True if idx <= count else False
-            self.__excludify(condition, exclude, index, msg)
-            idx += 1
+        )
+        self.__excludify_all(
+            [i < count for i in range(len(sorted_indices))], exclude,
+            sorted_indices, msg
+        )
 
-    def iterate_filters(self, filter_dict):
+    def iterate_filters(self, filter_dict, reorder_filters=False,
+            filter_summary=False):
         """
         Iterate over the filters defined in `config` and execute them.
 
         :arg filter_dict: The configuration dictionary
+        :arg reorder_filters: If `True`, run cheaper filters before more
+            expensive ones, as planned by `_plan_filters`.  Default is `False`
+        :arg filter_summary: If `True`, log how many indices each filter kept
+            and removed at ``INFO``, rather than ``DEBUG``.  Default is `False`
 
         .. note:: `filter_dict` should be a dictionary with the following form:
         .. code-block:: python
@@ -831,28 +1229,55 @@ class IndexList(object):
             return
 
         self.loggit.debug('All filters: {0}'.format(filter_dict['filters']))
-        for f in filter_dict['filters']:
-            self.loggit.debug('Top of the loop: {0}'.format(self.indices))
-            self.loggit.debug('Un-parsed filter args: {0}'.format(f))
-            # Make sure we got at least this much in the configuration
-            self.loggit.debug('Parsed filter args: {0}'.format(
-                    SchemaCheck(
-                        f,
-                        filters.structure(),
-                        'filter',
-                        'IndexList.iterate_filters'
-                    ).result()
+        filter_list = filter_dict['filters']
+        if reorder_filters:
+            filter_list = self._plan_filters(filter_list)
+        debug = self.loggit.isEnabledFor(logging.DEBUG)
+        for run in self.__fuse_patterns(filter_list):
+            start = time.time()
+            before = len(self.indices)
+            for f in run:
+                if debug:
+                    self.loggit.debug(
+                        'Top of the loop: {0}'.format(self.indices))
+                    self.loggit.debug('Un-parsed filter args: {0}'.format(f))
+                # Make sure we got at least this much in the configuration
+                parsed = SchemaCheck(
+                    f,
+                    filters.structure(),
+                    'filter',
+                    'IndexList.iterate_filters'
+                ).result()
+                if debug:
+                    self.loggit.debug('Parsed filter args: {0}'.format(parsed))
+            if len(run) > 1:
+                self.filter_by_regexes(run)
+                log_filter_summary(
+                    self.loggit, 'pattern (x{0})'.format(len(run)), before,
+                    len(self.indices), start, info=filter_summary
                 )
-            )
-            method = self.__map_method(f['filtertype'])
+                continue
+            f = run[0]
+            filtertype = f['filtertype']
+            method = self.__map_method(filtertype)
             del f['filtertype']
             # If it's a filtertype with arguments, update the defaults with the
             # provided settings.
             if f:
-                logger.debug('Filter args: {0}'.format(f))
-                logger.debug('Pre-instance: {0}'.format(self.indices))
+                if logger.isEnabledFor(logging.DEBUG):
+                    logger.debug('Filter args: {0}'.format(f))
+                    logger.debug('Pre-instance: {0}'.format(self.indices))
                 method(**f)
-                logger.debug('Post-instance: {0}'.format(self.indices))
+                if logger.isEnabledFor(logging.DEBUG):
+                    logger.debug('Post-instance: {0}'.format(self.indices))
             else:
                 # Otherwise, it's a settingless filter.
                 method()
+            log_filter_summary(
+                self.loggit, filtertype, before, len(self.indices), start,
+                info=filter_summary
+            )
+        # Indices without a creation_date are never actionable, and actions
+        # may need the index state.  This is only fetched for the survivors.
+        if self.indices:
+            self._ensure_info('metadata')
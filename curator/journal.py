@@ -0,0 +1,167 @@
+import json
+import logging
+import os
+import time
+from datetime import datetime
+from .defaults import settings
+from .exceptions import *
+
+class Journal(object):
+    """
+    A local file which records the snapshots a run plans to delete from a
+    repository, and each one as it is deleted, one JSON document per line, so
+    that an interrupted run can resume where it stopped.
+
+    Snapshots are identified by name and uuid, so a snapshot which is deleted
+    and created again with the same name is not taken for the planned one.
+    The entries for a repository are dropped by :py:meth:`finish` once every
+    planned snapshot has been deleted, or when a plan is read which is older
+    than `max_age` seconds.  The file is removed if no other repository has
+    entries in it.
+    """
+    def __init__(self, path, repository, max_age=None):
+        """
+        :arg path: The path of the journal file.  It is created if it does not
+            exist.
+        :arg repository: The Elasticsearch snapshot repository.  Entries for
+            other repositories in the same file are kept, but not used.
+        :arg max_age: The number of seconds after which a plan is discarded,
+            rather than resumed.  Default:
+            :py:func:`curator.defaults.settings.journal_max_age`
+        """
+        self.loggit = logging.getLogger('curator.journal')
+        #: Instance variable.
+        #: The path of the journal file
+        self.path = path
+        #: Instance variable.
+        #: The snapshot repository which entries are read and written for
+        self.repository = repository
+        #: Instance variable.
+        #: How old, in seconds, a plan may be and still be resumed
+        self.max_age = max_age if max_age else settings.journal_max_age()
+        #: Instance variable.
+        #: The snapshots planned for deletion, as dictionaries with the keys
+        #: ``snapshot`` and ``uuid``
+        self.planned = []
+        #: Instance variable.
+        #: The epoch time at which the plan was made, or `None`
+        self.planned_at = None
+        #: Instance variable.
+        #: The planned snapshots which have been deleted, as ``(name, uuid)``
+        self.done = set()
+        # Lines for other repositories, kept when the file is rewritten
+        self._other_lines = []
+        self.__read()
+
+    def __read(self):
+        if not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, 'r') as f:
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                    except ValueError:
+                        # A line cut short when a previous run was stopped
+                        continue
+                    if entry.get('repository') != self.repository:
+                        self._other_lines.append(line)
+                    elif 'planned' in entry:
+                        self.planned = entry['planned']
+                        self.planned_at = entry.get('time', 0)
+                        self.done = set()
+                    elif 'snapshot' in entry:
+                        self.done.add((entry['snapshot'], entry.get('uuid')))
+        except IOError as e:
+            raise FailedExecution(
+                'Unable to read journal {0}: {1}'.format(self.path, e))
+        if not self.planned:
+            return
+        if time.time() - self.planned_at > self.max_age:
+            self.loggit.warn(
+                'Discarding the plan in journal {0}, made at {1}, as it is '
+                'older than {2} seconds'.format(
+                    self.path,
+                    datetime.utcfromtimestamp(self.planned_at).isoformat(),
+                    self.max_age
+                )
+            )
+            self.finish()
+            return
+        self.loggit.debug(
+            'Journal {0}: {1} of {2} planned snapshot(s) already '
+            'deleted'.format(
+                self.path, len(self.planned) - len(self.remaining()),
+                len(self.planned))
+        )
+
+    def __write(self, lines, mode):
+        # The whole file is replaced in one step, so a run stopped while
+        # writing leaves the previous contents
+        path = self.path + '.tmp' if mode == 'w' else self.path
+        try:
+            with open(path, mode) as f:
+                f.writelines(lines)
+                f.flush()
+                os.fsync(f.fileno())
+            if path != self.path:
+                getattr(os, 'replace', os.rename)(path, self.path)
+        except (IOError, OSError) as e:
+            raise FailedExecution(
+                'Unable to write journal {0}: {1}'.format(self.path, e))
+
+    def remaining(self):
+        """
+        Return the planned snapshots which have not been recorded as deleted.
+
+        :rtype: list
+        """
+        return [
+            p for p in self.planned
+            if not (p['snapshot'], p['uuid']) in self.done
+        ]
+
+    def start(self, snapshots):
+        """
+        Record the plan to delete `snapshots`, replacing any earlier entries
+        for `repository`.  The plan is flushed to disk before returning.
+
+        :arg snapshots: A list of dictionaries with the keys ``snapshot`` and
+            ``uuid``
+        """
+        self.planned = list(snapshots)
+        self.planned_at = time.time()
+        self.done = set()
+        line = json.dumps({
+            'repository': self.repository, 'time': self.planned_at,
+            'planned': self.planned,
+        }) + '\n'
+        self.__write(self._other_lines + [line], 'w')
+
+    def record(self, snapshot):
+        """
+        Record that a planned snapshot has been deleted, or no longer needs to
+        be.  The entry is flushed to disk before returning.
+
+        :arg snapshot: A dictionary with the keys ``snapshot`` and ``uuid``
+        """
+        self.__write([json.dumps({
+            'repository': self.repository, 'snapshot': snapshot['snapshot'],
+            'uuid': snapshot['uuid'],
+        }) + '\n'], 'a')
+        self.done.add((snapshot['snapshot'], snapshot['uuid']))
+
+    def finish(self):
+        """
+        Drop the entries for `repository`, as there is nothing left to resume,
+        and remove the journal file if it is then empty.
+        """
+        self.planned = []
+        self.planned_at = None
+        self.done = set()
+        if not os.path.exists(self.path):
+            return
+        if not self._other_lines:
+            os.remove(self.path)
+            return
+        self.__write(self._other_lines, 'w')
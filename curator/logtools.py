@@ -10,7 +10,8 @@ class LogstashFormatter(logging.Formatter):
                     'funcName': 'function',
                     'lineno': 'linenum',
                     'message': 'message',
-                    'name': 'name'}
+                    'name': 'name',
+                    'filter_summary': 'filter_summary'}
 
     # def converter(self, timevalue):
     #     return time.gmtime(timevalue)
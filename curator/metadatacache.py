@@ -0,0 +1,165 @@
+import copy
+import time
+import logging
+from .utils import client_info
+
+class MetadataCache(object):
+    """
+    Hold index and snapshot metadata between actions in a single run, so that
+    each :class:`curator.indexlist.IndexList` and
+    :class:`curator.snapshotlist.SnapshotList` does not have to re-read the
+    entire cluster.
+
+    Entries are keyed by cluster, and expire `ttl` seconds after they were
+    stored.  Actions which change indices should call :py:meth:`invalidate`
+    afterwards with the affected index names.
+
+    :arg ttl: Number of seconds an entry remains usable.
+    """
+    def __init__(self, ttl=300):
+        self.loggit = logging.getLogger('curator.metadatacache')
+        #: Instance variable.
+        #: Number of seconds an entry remains usable after it is stored.
+        self.ttl = ttl
+        #: Instance variable.
+        #: Cached index data, keyed by cluster.  **Type:** ``dict()``
+        self.indices = {}
+        #: Instance variable.
+        #: Cached snapshot data, keyed by cluster and repository.
+        #: **Type:** ``dict()``
+        self.snapshots = {}
+        self._last_client = None
+        self._last_key = None
+
+    def cluster_key(self, client):
+        """
+        Return a key which uniquely identifies the cluster `client` connects
+        to.  The key comes from :py:func:`curator.utils.client_info`, so no
+        request is made for a client from :py:func:`curator.utils.get_client`.
+
+        :arg client: An :class:`elasticsearch.Elasticsearch` client object
+        :rtype: str
+        """
+        if client is self._last_client:
+            return self._last_key
+        info = client_info(client)
+        key = info.get('cluster_uuid', info.get('cluster_name'))
+        self._last_client = client
+        self._last_key = key
+        return key
+
+    def _expired(self, stored):
+        return (time.time() - stored) > self.ttl
+
+    def get_indices(self, client):
+        """
+        Return a tuple of ``(all_indices, indices, index_info, stale)`` for
+        the cluster, or ``None`` if there is no usable entry.  `stale` is the
+        set of index names which have been invalidated since the entry was
+        stored, and must be fetched again by the caller.  Everything returned
+        is a copy, and may be changed freely.
+
+        :arg client: An :class:`elasticsearch.Elasticsearch` client object
+        """
+        key = self.cluster_key(client)
+        entry = self.indices.get(key)
+        if entry is None:
+            return None
+        if self._expired(entry['stored']):
+            self.loggit.debug(
+                'Cached index metadata for cluster {0} has expired'.format(key))
+            del self.indices[key]
+            return None
+        self.loggit.debug('Using cached index metadata for cluster {0}, with '
+            '{1} stale indices'.format(key, len(entry['stale']))
+        )
+        return (
+            entry['all_indices'][:], entry['indices'][:],
+            copy.deepcopy(entry['index_info']), set(entry['stale'])
+        )
+
+    def put_indices(self, client, all_indices, indices, index_info):
+        """
+        Store index data for the cluster, replacing any existing entry.
+
+        :arg client: An :class:`elasticsearch.Elasticsearch` client object
+        :arg all_indices: All index names in the cluster
+        :arg indices: The index names which are actionable
+        :arg index_info: Metadata for each index, as built by
+            :class:`curator.indexlist.IndexList`
+        """
+        key = self.cluster_key(client)
+        self.indices[key] = {
+            'stored': time.time(),
+            'all_indices': all_indices[:],
+            'indices': indices[:],
+            'index_info': copy.deepcopy(index_info),
+            'stale': set(),
+        }
+
+    def invalidate(self, client, indices=None):
+        """
+        Mark the cached data for `indices` as stale.  If `indices` is not
+        provided, the whole entry for the cluster is dropped.  Use this when
+        indices may have been created, such as by rollover.
+
+        :arg client: An :class:`elasticsearch.Elasticsearch` client object
+        :arg indices: A list of index names
+        """
+        key = self.cluster_key(client)
+        if not key in self.indices:
+            return
+        if indices is None:
+            self.loggit.debug(
+                'Dropping cached index metadata for cluster {0}'.format(key))
+            del self.indices[key]
+        else:
+            self.loggit.debug(
+                'Marking cached index metadata as stale for cluster {0}: '
+                '{1}'.format(key, indices)
+            )
+            self.indices[key]['stale'].update(indices)
+
+    def get_snapshots(self, client, repository):
+        """
+        Return a copy of the cached snapshot list for `repository`, or
+        ``None`` if there is no usable entry.
+
+        :arg client: An :class:`elasticsearch.Elasticsearch` client object
+        :arg repository: The Elasticsearch snapshot repository
+        :rtype: list
+        """
+        key = (self.cluster_key(client), repository)
+        entry = self.snapshots.get(key)
+        if entry is None:
+            return None
+        if self._expired(entry['stored']):
+            del self.snapshots[key]
+            return None
+        self.loggit.debug(
+            'Using cached snapshot data for repository {0}'.format(repository))
+        return copy.deepcopy(entry['snapshots'])
+
+    def put_snapshots(self, client, repository, snapshots):
+        """
+        Store the snapshot list for `repository`.
+
+        :arg client: An :class:`elasticsearch.Elasticsearch` client object
+        :arg repository: The Elasticsearch snapshot repository
+        :arg snapshots: A list of snapshot data, as returned by
+            :py:func:`curator.utils.get_snapshot_data`
+        """
+        key = (self.cluster_key(client), repository)
+        self.snapshots[key] = {
+            'stored': time.time(),
+            'snapshots': copy.deepcopy(snapshots),
+        }
+
+    def invalidate_snapshots(self, client, repository):
+        """
+        Drop the cached snapshot list for `repository`.
+
+        :arg client: An :class:`elasticsearch.Elasticsearch` client object
+        :arg repository: The Elasticsearch snapshot repository
+        """
+        self.snapshots.pop((self.cluster_key(client), repository), None)
@@ -0,0 +1,141 @@
+"""
+Matching of index and snapshot names against the ``pattern`` filtertype.
+Compiled patterns are kept for the whole run, and several patterns can be
+matched against a list of names in one pass with :py:func:`match_sets`.
+"""
+import bisect
+import logging
+import re
+from .defaults import settings
+from .utils import get_date_regex
+
+logger = logging.getLogger(__name__)
+
+# Compiled patterns, keyed by (kind, value)
+_PATTERNS = {}
+# Compiled combinations of patterns for match_sets, keyed by their regexes
+_COMBINED = {}
+# A value with none of these is matched literally by prefix and suffix kinds
+_LITERAL = re.compile(r'^[^.^$*+?{}\[\]\\|()]*$')
+# Patterns which can not safely be combined with others
+_UNCOMBINABLE = re.compile(r'\\[1-9]|\(\?P[<=]|\(\?[aiLmsux]')
+
+def get_regex(kind, value):
+    """
+    Return the regular expression string for a ``pattern`` filter.
+
+    :arg kind: Can be one of: ``suffix``, ``prefix``, ``regex``, or
+        ``timestring``.
+    :arg value: Depends on `kind`. It is the strftime string if `kind` is
+        ``timestring``. It's used to build the regular expression for other
+        kinds.
+    :rtype: str
+    """
+    if kind not in [ 'regex', 'prefix', 'suffix', 'timestring' ]:
+        raise ValueError('{0}: Invalid value for kind'.format(kind))
+    # Stop here if None or empty value, but zero is okay
+    if value == 0:
+        pass
+    elif not value:
+        raise ValueError(
+            '{0}: Invalid value for "value". '
+            'Cannot be "None" type, empty, or False'
+        )
+    if kind == 'timestring':
+        return settings.regex_map()[kind].format(get_date_regex(value))
+    return settings.regex_map()[kind].format(value)
+
+def get_pattern(kind, value):
+    """
+    Return the compiled regular expression for a ``pattern`` filter.  The
+    same object is returned for the same `kind` and `value` for the rest of
+    the run.
+
+    :arg kind: Can be one of: ``suffix``, ``prefix``, ``regex``, or
+        ``timestring``.
+    :arg value: The value of the filter, as for :py:func:`get_regex`
+    """
+    key = (kind, value)
+    if not key in _PATTERNS:
+        _PATTERNS[key] = re.compile(get_regex(kind, value))
+    return _PATTERNS[key]
+
+def _prefixed(sorted_names, prefix):
+    """Return the names in sorted list `sorted_names` starting with `prefix`"""
+    lo = bisect.bisect_left(sorted_names, prefix)
+    hi = lo
+    while hi < len(sorted_names) and sorted_names[hi].startswith(prefix):
+        hi += 1
+    return sorted_names[lo:hi]
+
+def _combined(regexes):
+    """
+    Return one compiled pattern with an optional lookahead per regex, so that
+    group ``p<n>`` is set exactly when ``regexes[n]`` matches, or ``None`` if
+    they can not be combined.
+    """
+    if not regexes in _COMBINED:
+        combined = None
+        if not [r for r in regexes if _UNCOMBINABLE.search(r)]:
+            try:
+                combined = re.compile(''.join(
+                    '(?:(?=(?P<p{0}>{1})))?'.format(n, r)
+                    for n, r in enumerate(regexes)
+                ))
+            except re.error:
+                pass
+        _COMBINED[regexes] = combined
+    return _COMBINED[regexes]
+
+def match_sets(names, specs):
+    """
+    Match every name in `names` against each ``(kind, value)`` pattern in
+    `specs`, and return a list with the set of matching names for each one.
+
+    Prefix and suffix patterns without regular expression characters are
+    found by bisecting the sorted names (or reversed names), rather than by
+    matching each name.  All other patterns are combined into a single regular
+    expression, so each name is matched once.
+
+    :arg names: A list of index or snapshot names
+    :arg specs: A list of ``(kind, value)`` tuples
+    :rtype: list
+    """
+    results = [None] * len(specs)
+    by_name = None
+    by_reversed = None
+    others = []
+    for n, (kind, value) in enumerate(specs):
+        regex = get_regex(kind, value)
+        literal = '{0}'.format(value)
+        if kind == 'prefix' and _LITERAL.match(literal):
+            if by_name is None:
+                by_name = sorted(names)
+            results[n] = set(_prefixed(by_name, literal))
+        elif kind == 'suffix' and _LITERAL.match(literal):
+            if by_reversed is None:
+                by_reversed = sorted(name[::-1] for name in names)
+            results[n] = set(
+                name[::-1] for name in _prefixed(by_reversed, literal[::-1]))
+        else:
+            others.append((n, regex))
+    if not others:
+        return results
+    for n, regex in others:
+        results[n] = set()
+    combined = None
+    if len(others) > 1:
+        combined = _combined(tuple(regex for n, regex in others))
+    if combined is None:
+        for n, regex in others:
+            pattern = get_pattern(*specs[n])
+            results[n].update(name for name in names if pattern.match(name))
+        return results
+    groups = ['p{0}'.format(i) for i in range(len(others))]
+    sets = [results[n] for n, regex in others]
+    for name in names:
+        # One call returns the value of every group, or None if it failed
+        for matched, found in zip(sets, combined.match(name).group(*groups)):
+            if found is not None:
+                matched.add(name)
+    return results
@@ -6,11 +6,18 @@ from .defaults import settings
 from .validators import SchemaCheck, filters
 from .exceptions import *
 from .utils import *
+from . import patterns
 
 
 class SnapshotList(object):
-    def __init__(self, client, repository=None):
+    def __init__(self, client, repository=None, cache=None, loader='bulk',
+            catalog=None, snapshots=None):
         verify_client_object(client)
+        if loader not in settings.snapshot_loaders():
+            raise ValueError(
+                'Invalid value for "loader": {0}.  Must be one of '
+                '{1}'.format(loader, settings.snapshot_loaders())
+            )
         if not repository:
             raise MissingArgument('No value for "repository" provided')
         if not repository_exists(client, repository):
@@ -26,10 +33,42 @@ class SnapshotList(object):
         #: Also accessible as an instance variable.
         self.repository = repository
         #: Instance variable.
+        #: How snapshot metadata is read at instance creation time.  ``bulk``
+        #: reads the full details of every snapshot with one request.
+        #: ``lazy`` only reads the name, state, and start and end times of
+        #: each snapshot, and reads the rest, such as the ``indices`` in each,
+        #: with :py:meth:`load_details` when it is needed.
+        self.loader = loader
+        #: Instance variable.
+        #: An optional :class:`curator.metadatacache.MetadataCache`, shared
+        #: with other SnapshotList objects in the same run.  It is not used by
+        #: the ``lazy`` loader, as its `snapshot_info` is only partly
+        #: populated.
+        self.cache = cache if loader != 'lazy' else None
+        #: Instance variable.
+        #: An optional :class:`curator.catalog.SnapshotCatalog`.  If set, the
+        #: details of finished snapshots are read from it, rather than from
+        #: Elasticsearch, and `loader` is ignored.
+        self.catalog = catalog
+        if catalog is not None:
+            self.loader = 'bulk'
+        #: Instance variable.
+        #: If set, only these snapshots are read, in batches of names, rather
+        #: than listing the whole repository.  Snapshots which no longer exist
+        #: are skipped.  `cache`, `catalog` and `loader` are not used.
+        self.only = snapshots
+        if snapshots is not None:
+            self.loader = 'bulk'
+            self.cache = None
+            self.catalog = None
+        # Snapshots whose full details are in snapshot_info
+        self._detailed = set()
+        #: Instance variable.
         #: Information extracted from snapshots, such as age, etc.
         #: Populated by internal method `__get_snapshots` at instance creation
         #: time. **Type:** ``dict()``
         self.snapshot_info = {}
+        self._working = WorkingSet()
         #: Instance variable.
         #: The running list of snapshots which will be used by an Action class.
         #: Populated by internal methods `__get_snapshots` at instance creation
@@ -41,16 +80,28 @@ class SnapshotList(object):
         self.__get_snapshots()
 
 
-    def __actionable(self, snap):
-        self.loggit.debug(
-            'Snapshot {0} is actionable and remains in the list.'.format(snap))
+    @property
+    def snapshots(self):
+        return self._working.members()
 
-    def __not_actionable(self, snap):
+    @snapshots.setter
+    def snapshots(self, value):
+        self._working.reset(value)
+
+    def __actionable(self, snap):
+        if self.loggit.isEnabledFor(logging.DEBUG):
             self.loggit.debug(
-                'Snapshot {0} is not actionable, removing from '
+                'Snapshot {0} is actionable and remains in the '
                 'list.'.format(snap)
             )
-            self.snapshots.remove(snap)
+
+    def __not_actionable(self, snap):
+            if self.loggit.isEnabledFor(logging.DEBUG):
+                self.loggit.debug(
+                    'Snapshot {0} is not actionable, removing from '
+                    'list.'.format(snap)
+                )
+            self._working.discard(snap)
 
     def __excludify(self, condition, exclude, snap, msg=None):
         if condition == True:
@@ -67,7 +118,9 @@ class SnapshotList(object):
             else:
                 text = "Removed from actionable list"
                 self.__not_actionable(snap)
-        if msg:
+        if msg and self.loggit.isEnabledFor(logging.DEBUG):
+            if callable(msg):
+                msg = msg()
             self.loggit.debug('{0}: {1}'.format(text, msg))
 
     def __get_snapshots(self):
@@ -75,12 +128,60 @@ class SnapshotList(object):
         Pull all snapshots into `snapshots` and populate
         `snapshot_info`
         """
-        self.all_snapshots = get_snapshot_data(self.client, self.repository)
+        self.all_snapshots = None
+        if self.only is not None:
+            self.all_snapshots = []
+            for chunk in chunk_index_list(self.only):
+                self.all_snapshots.extend(get_snapshot_data(
+                    self.client, self.repository, snapshots=chunk))
+        elif self.loader == 'lazy':
+            self.all_snapshots = get_snapshot_listing(
+                self.client, self.repository)
+        elif self.cache is not None:
+            self.all_snapshots = self.cache.get_snapshots(
+                self.client, self.repository)
+        if self.all_snapshots is None:
+            if self.catalog is not None:
+                self.all_snapshots = self.catalog.sync(
+                    self.client, self.repository)
+            else:
+                self.all_snapshots = get_snapshot_data(
+                    self.client, self.repository)
+            if self.cache is not None:
+                self.cache.put_snapshots(
+                    self.client, self.repository, self.all_snapshots)
         for list_item in self.all_snapshots:
             if 'snapshot' in list_item.keys():
                 self.snapshots.append(list_item['snapshot'])
                 self.snapshot_info[list_item['snapshot']] = list_item
-        self.empty_list_check()
+        if self.loader != 'lazy':
+            self._detailed.update(self.snapshots)
+        if self.only is None:
+            self.empty_list_check()
+
+    def load_details(self, snapshots=None):
+        """
+        Read the full details of `snapshots` into `snapshot_info`, if the
+        ``lazy`` loader did not read them at instance creation time.  Names
+        are requested in batches, to keep each request URL short.  Snapshots
+        which have been deleted since are skipped.
+
+        :arg snapshots: A list of snapshot names.  Default is `snapshots`
+        """
+        if snapshots is None:
+            snapshots = self.snapshots
+        missing = [s for s in snapshots if not s in self._detailed]
+        if not missing:
+            return
+        self.loggit.debug(
+            'Reading details of {0} snapshot(s)'.format(len(missing)))
+        for chunk in chunk_index_list(missing):
+            for data in get_snapshot_data(
+                    self.client, self.repository, snapshots=chunk):
+                name = data['snapshot']
+                # Keep values calculated since, like age_by_name
+                self.snapshot_info.setdefault(name, {}).update(data)
+                self._detailed.add(name)
 
     def __map_method(self, ft):
         methods = {
@@ -214,28 +315,14 @@ class SnapshotList(object):
             matching snapshots will be kept in `snapshots`.
             Default is `False`
         """
-        if kind not in [ 'regex', 'prefix', 'suffix', 'timestring' ]:
-            raise ValueError('{0}: Invalid value for kind'.format(kind))
-
-        # Stop here if None or empty value, but zero is okay
-        if value == 0:
-            pass
-        elif not value:
-            raise ValueError(
-                '{0}: Invalid value for "value". '
-                'Cannot be "None" type, empty, or False'
-            )
-
-        if kind == 'timestring':
-            regex = settings.regex_map()[kind].format(get_date_regex(value))
-        else:
-            regex = settings.regex_map()[kind].format(value)
-
+        pattern = patterns.get_pattern(kind, value)
         self.empty_list_check()
-        pattern = re.compile(regex)
+        debug = self.loggit.isEnabledFor(logging.DEBUG)
         for snapshot in self.working_list():
             match = pattern.match(snapshot)
-            self.loggit.debug('Filter by regex: Snapshot: {0}'.format(snapshot))
+            if debug:
+                self.loggit.debug(
+                    'Filter by regex: Snapshot: {0}'.format(snapshot))
             if match:
                 self.__excludify(True, exclude, snapshot)
             else:
@@ -276,22 +363,23 @@ class SnapshotList(object):
         self._calculate_ages(source=source, timestring=timestring)
         for snapshot in self.working_list():
             if not self.snapshot_info[snapshot][self.age_keyfield]:
-                self.loggit.debug('Removing snapshot {0} for having no age')
-                self.snapshots.remove(snapshot)
+                if self.loggit.isEnabledFor(logging.DEBUG):
+                    self.loggit.debug(
+                        'Removing snapshot {0} for having no age'.format(
+                            snapshot)
+                    )
+                self._working.discard(snapshot)
                 continue
-            msg = (
-                'Snapshot "{0}" age ({1}), direction: "{2}", point of '
-                'reference, ({3})'.format(
-                    snapshot,
-                    fix_epoch(self.snapshot_info[snapshot][self.age_keyfield]),
-                    direction,
-                    PoR
-                )
-            )
             # Because time adds to epoch, smaller numbers are actually older
             # timestamps.
             snapshot_age = fix_epoch(
                 self.snapshot_info[snapshot][self.age_keyfield])
+            # Only formatted if debug logging is enabled
+            msg = lambda snapshot=snapshot, snapshot_age=snapshot_age: (
+                'Snapshot "{0}" age ({1}), direction: "{2}", point of '
+                'reference, ({3})'.format(
+                    snapshot, snapshot_age, direction, PoR)
+            )
             if direction == 'older':
                 agetest = snapshot_age < PoR
             else: # 'younger'
@@ -314,8 +402,11 @@ class SnapshotList(object):
             raise ValueError('{0}: Invalid value for state'.format(state))
 
         self.empty_list_check()
+        debug = self.loggit.isEnabledFor(logging.DEBUG)
         for snapshot in self.working_list():
-            self.loggit.debug('Filter by state: Snapshot: {0}'.format(snapshot))
+            if debug:
+                self.loggit.debug(
+                    'Filter by state: Snapshot: {0}'.format(snapshot))
             if self.snapshot_info[snapshot]['state'] == state:
                 self.__excludify(True, exclude, snapshot)
             else:
@@ -376,7 +467,8 @@ class SnapshotList(object):
 
         idx = 1
         for snap in sorted_snapshots:
-            msg = (
+            # Only formatted if debug logging is enabled
+            msg = lambda snap=snap, idx=idx: (
                 '{0} is {1} of specified count of {2}.'.format(
                     snap, idx, count
                 )
@@ -385,7 +477,7 @@ class SnapshotList(object):
             self.__excludify(condition, exclude, snap, msg)
             idx += 1
 
-    def iterate_filters(self, config):
+    def iterate_filters(self, config, filter_summary=False):
         """
         Iterate over the filters defined in `config` and execute them.
 
@@ -393,6 +485,9 @@ class SnapshotList(object):
 
         :arg config: A dictionary of filters, as extracted from the YAML
             configuration file.
+        :arg filter_summary: If `True`, log how many snapshots each filter
+            kept and removed at ``INFO``, rather than ``DEBUG``.  Default is
+            `False`
 
         .. note:: `config` should be a dictionary with the following form:
         .. code-block:: python
@@ -414,24 +509,35 @@ class SnapshotList(object):
             return
 
         self.loggit.debug('All filters: {0}'.format(config['filters']))
+        debug = self.loggit.isEnabledFor(logging.DEBUG)
         for f in config['filters']:
-            self.loggit.debug('Top of the loop: {0}'.format(self.snapshots))
-            self.loggit.debug('Un-parsed filter args: {0}'.format(f))
-            self.loggit.debug('Parsed filter args: {0}'.format(
-                    SchemaCheck(
-                        f,
-                        filters.structure(),
-                        'filter',
-                        'SnapshotList.iterate_filters'
-                    ).result()
-                )
-            )
-            method = self.__map_method(f['filtertype'])
+            start = time.time()
+            before = len(self.snapshots)
+            if debug:
+                self.loggit.debug(
+                    'Top of the loop: {0}'.format(self.snapshots))
+                self.loggit.debug('Un-parsed filter args: {0}'.format(f))
+            parsed = SchemaCheck(
+                f,
+                filters.structure(),
+                'filter',
+                'SnapshotList.iterate_filters'
+            ).result()
+            if debug:
+                self.loggit.debug('Parsed filter args: {0}'.format(parsed))
+            filtertype = f['filtertype']
+            method = self.__map_method(filtertype)
             # Remove key 'filtertype' from dictionary 'f'
             del f['filtertype']
             # If it's a filtertype with arguments, update the defaults with the
             # provided settings.
-            logger.debug('Filter args: {0}'.format(f))
-            logger.debug('Pre-instance: {0}'.format(self.snapshots))
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug('Filter args: {0}'.format(f))
+                logger.debug('Pre-instance: {0}'.format(self.snapshots))
             method(**f)
-            logger.debug('Post-instance: {0}'.format(self.snapshots))
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug('Post-instance: {0}'.format(self.snapshots))
+            log_filter_summary(
+                self.loggit, filtertype, before, len(self.snapshots), start,
+                info=filter_summary
+            )
@@ -3,6 +3,10 @@ import elasticsearch
 import time
 import logging
 import yaml, os, re, sys
+import random
+import threading
+import weakref
+from multiprocessing.pool import ThreadPool
 from voluptuous import Schema
 from .exceptions import *
 from .defaults import settings
@@ -10,6 +14,28 @@ from .validators import SchemaCheck, actions, filters, options
 from ._version import __version__
 logger = logging.getLogger(__name__)
 
+# Index names are all that is needed from a settings request which lists
+# indices.  Every index has a uuid.
+_INDEX_NAMES_PATH = '*.settings.index.uuid'
+# Everything in a snapshot listing except the per-shard `failures`
+_SNAPSHOT_PATH = ','.join(
+    'snapshots.{0}'.format(f) for f in (
+        'snapshot', 'uuid', 'version_id', 'version', 'indices', 'state',
+        'start_time', 'start_time_in_millis', 'end_time', 'end_time_in_millis',
+        'duration_in_millis', 'shards',
+    )
+)
+# Only the names of running snapshots are needed, not their per-shard status
+_SNAPSHOT_STATUS_PATH = 'snapshots.snapshot,snapshots.repository'
+# The info response of each client made by get_client, so that it is only
+# requested once
+_CLIENT_INFO = weakref.WeakKeyDictionary()
+# The node and size of each shard copy, from the shard level indices stats
+_SHARD_STORE_PATH = ','.join(
+    'indices.*.shards.*.{0}'.format(f)
+    for f in ['routing.node', 'store.size_in_bytes']
+)
+
 def read_file(myfile):
     """
     Read a file and return the resulting data.
@@ -169,28 +195,57 @@ def report_failure(exception):
         'Exception: {0}'.format(exception)
     )
 
-def get_date_regex(timestring):
-    """
-    Return a regex string based on a provided strftime timestring.
+# Regex strings built by get_date_regex, keyed by timestring
+_DATE_REGEXES = {}
+# Compiled patterns used by TimestringSearch, keyed by timestring
+_TIMESTRING_PATTERNS = {}
+# Epochs computed by TimestringSearch, keyed by (timestring, matched date)
+_EPOCHS = {}
+_EPOCHS_MAX = 100000
+# Directives which TimestringSearch can convert to an epoch without strptime
+_FAST_DIRECTIVES = ['Y', 'y', 'm', 'd', 'H', 'M', 'S']
 
-    :arg timestring: An strftime pattern
-    :rtype: str
+def _build_date_regex(timestring, named=False):
     """
+    Return a regex string based on a provided strftime timestring.  If
+    `named` is `True`, each directive is captured in a group of the same name,
+    or ``None`` is returned if that is not possible.
+    """
+    date_regex = settings.date_regex()
     prev = ''; curr = ''; regex = ''
     for s in range(0, len(timestring)):
         curr = timestring[s]
         if curr == '%':
             pass
-        elif curr in settings.date_regex() and prev == '%':
-            regex += '\d{' + settings.date_regex()[curr] + '}'
+        elif curr in date_regex and prev == '%':
+            digits = '\d{' + date_regex[curr] + '}'
+            if named:
+                if not curr in _FAST_DIRECTIVES or '(?P<' + curr in regex:
+                    return None
+                digits = '(?P<' + curr + '>' + digits + ')'
+            regex += digits
+        elif prev == '%' and named:
+            # Not a date directive we can extract a value from
+            return None
         elif curr in ['.', '-']:
             regex += "\\" + curr
         else:
             regex += curr
         prev = curr
-    logger.debug("regex = {0}".format(regex))
     return regex
 
+def get_date_regex(timestring):
+    """
+    Return a regex string based on a provided strftime timestring.
+
+    :arg timestring: An strftime pattern
+    :rtype: str
+    """
+    if not timestring in _DATE_REGEXES:
+        _DATE_REGEXES[timestring] = _build_date_regex(timestring)
+        logger.debug("regex = {0}".format(_DATE_REGEXES[timestring]))
+    return _DATE_REGEXES[timestring]
+
 def get_datetime(index_timestamp, timestring):
     """
     Return the datetime extracted from the index name, which is the index
@@ -241,16 +296,51 @@ def fix_epoch(epoch):
         epoch = int(epoch/powers_of_ten)
     return epoch
 
+def _epoch_from_groups(groups):
+    """
+    Return the epoch timestamp of the date captured in the named `groups` of a
+    match, the same as ``datetime.strptime`` would produce.
+    """
+    if groups.get('Y'):
+        year = int(groups['Y'])
+    elif groups.get('y'):
+        # The same pivot as strptime: 69-99 are 1969-1999, 00-68 are 2000-2068
+        year = int(groups['y'])
+        year += 1900 if year >= 69 else 2000
+    else:
+        year = 1900
+    # datetime() raises ValueError for out of range values, as strptime does
+    tdelta = datetime(
+        year,
+        int(groups.get('m') or 1),
+        int(groups.get('d') or 1),
+        int(groups.get('H') or 0),
+        int(groups.get('M') or 0),
+        int(groups.get('S') or 0),
+    ) - datetime(1970,1,1)
+    return tdelta.seconds + tdelta.days * 24 * 3600
+
 class TimestringSearch(object):
     """
     An object to allow repetitive search against a string, `searchme`, without
     having to repeatedly recreate the regex.
 
+    Compiled patterns are shared by all instances with the same `timestring`,
+    and computed epochs are remembered.  For timestrings which only use the
+    ``%Y``, ``%y``, ``%m``, ``%d``, ``%H``, ``%M``, and ``%S`` directives, each
+    no more than once, the epoch is built directly from the matched digits,
+    rather than with ``datetime.strptime``.
+
     :arg timestring: An strftime pattern
     """
     def __init__(self, timestring):
-        regex = r'(?P<date>{0})'.format(get_date_regex(timestring))
-        self.pattern = re.compile(regex)
+        if not timestring in _TIMESTRING_PATTERNS:
+            named = _build_date_regex(timestring, named=True)
+            regex = r'(?P<date>{0})'.format(
+                named if named is not None else get_date_regex(timestring))
+            _TIMESTRING_PATTERNS[timestring] = (
+                re.compile(regex), named is not None)
+        self.pattern, self.fast = _TIMESTRING_PATTERNS[timestring]
         self.timestring = timestring
     def get_epoch(self, searchme):
         """
@@ -266,14 +356,125 @@ class TimestringSearch(object):
         if match:
             if match.group("date"):
                 timestamp = match.group("date")
-                # I would have used `total_seconds`, but apparently that's new
-                # to Python 2.7+, and due to so many people still using
-                # RHEL/CentOS 6, I need this to support Python 2.6.
-                tdelta = (
-                    get_datetime(timestamp, self.timestring) -
-                    datetime(1970,1,1)
-                )
-                return tdelta.seconds + tdelta.days * 24 * 3600
+                key = (self.timestring, timestamp)
+                if key in _EPOCHS:
+                    return _EPOCHS[key]
+                if self.fast:
+                    epoch = _epoch_from_groups(match.groupdict())
+                else:
+                    # I would have used `total_seconds`, but apparently that's
+                    # new to Python 2.7+, and due to so many people still using
+                    # RHEL/CentOS 6, I need this to support Python 2.6.
+                    tdelta = (
+                        get_datetime(timestamp, self.timestring) -
+                        datetime(1970,1,1)
+                    )
+                    epoch = tdelta.seconds + tdelta.days * 24 * 3600
+                if len(_EPOCHS) >= _EPOCHS_MAX:
+                    _EPOCHS.clear()
+                _EPOCHS[key] = epoch
+                return epoch
+
+class WorkingSet(object):
+    """
+    Track which members of `items` remain actionable.  Each member is given
+    an ordinal, and a flag per ordinal records whether it has been removed, so
+    that removing a member is O(1) rather than the O(n) of ``list.remove()``.
+    Removed members are dropped from `items` the next time :py:meth:`members`
+    is called.  `items` is compacted in place, so its order, and any other
+    references to it, are preserved.
+
+    :arg items: The list to track
+    """
+    def __init__(self, items=None):
+        self.reset([] if items is None else items)
+    def reset(self, items):
+        """
+        Start tracking `items`, with every member actionable.
+
+        :arg items: The list to track
+        """
+        self.items = items
+        self.ordinals = dict((item, i) for i, item in enumerate(items))
+        self.flags = bytearray(len(items))
+        self.dirty = False
+    def discard(self, item):
+        """
+        Mark `item` as no longer actionable.
+
+        :arg item: A member of `items`
+        """
+        if not item in self.ordinals:
+            # Appended to `items` since the last reset
+            self.ordinals[item] = len(self.flags)
+            self.flags.append(0)
+        self.flags[self.ordinals[item]] = 1
+        self.dirty = True
+    def members(self):
+        """
+        Return `items`, after dropping any members which have been discarded.
+
+        :rtype: list
+        """
+        if self.dirty:
+            flags = self.flags
+            ordinals = self.ordinals
+            self.items[:] = [
+                i for i in self.items
+                if not (i in ordinals and flags[ordinals[i]])
+            ]
+            self.reset(self.items)
+        return self.items
+
+def log_filter_summary(loggit, label, before, after, start, info=False):
+    """
+    Log how many items a filter kept and removed, and how long it took.  The
+    same values are attached to the log record as `filter_summary`, which is
+    included in ``json`` formatted logs.
+
+    :arg loggit: The logger of the list being filtered
+    :arg label: A description of the filter, usually its ``filtertype``
+    :arg before: The number of items before the filter ran
+    :arg after: The number of items after the filter ran
+    :arg start: The ``time.time()`` at which the filter started
+    :arg info: If `True`, log at ``INFO``.  Otherwise, log at ``DEBUG``.
+    """
+    level = logging.INFO if info else logging.DEBUG
+    if not loggit.isEnabledFor(level):
+        return
+    summary = {
+        'filter': label, 'kept': after, 'removed': before - after,
+        'elapsed': round(time.time() - start, 3),
+    }
+    loggit.log(
+        level,
+        'Filter {filter}: {kept} kept, {removed} removed in '
+        '{elapsed:.3f}s'.format(**summary),
+        extra={'filter_summary': summary}
+    )
+
+def log_progress(loggit, verb, done, total, start):
+    """
+    Log, at ``INFO``, how many of `total` items have been processed, the rate
+    per minute since `start`, and an estimate of the time remaining at that
+    rate.
+
+    :arg loggit: The logger of the calling action
+    :arg verb: What has been done to the items, e.g. ``Deleted``
+    :arg done: The number of items processed so far
+    :arg total: The total number of items to process
+    :arg start: The ``time.time()`` at which processing started
+    """
+    elapsed = time.time() - start
+    rate = done * 60.0 / elapsed if elapsed > 0 else 0.0
+    if rate:
+        remaining = str(timedelta(seconds=int((total - done) * 60.0 / rate)))
+    else:
+        remaining = 'unknown'
+    loggit.info(
+        '{0} {1} of {2} ({3:.1f}/min, {4} remaining)'.format(
+            verb, done, total, rate, remaining)
+    )
 
 def get_point_of_reference(unit, count, epoch=None):
     """
@@ -400,6 +601,88 @@ def chunk_index_list(indices):
     chunks.append(chunk.split(','))
     return chunks
 
+def pipeline_chunks(func, wait, index_lists):
+    """
+    Call `func` for each chunk in `index_lists`, then call `wait` for that
+    chunk in a background thread, while `func` is called for the next chunk.
+    Each `wait` finishes before `func` is called for the chunk after next, so
+    no more than two chunks are in progress at once.  The first exception
+    from either is raised.
+
+    :arg func: A function which takes a list of indices and changes them
+    :arg wait: A function which takes a list of indices and returns once
+        the change to them is complete
+    :arg index_lists: A list of lists of indices, as from
+        :py:func:`chunk_index_list`
+    """
+    pool = ThreadPool(1)
+    pending = None
+    try:
+        for l in index_lists:
+            func(l)
+            if pending is not None:
+                pending.get()
+            pending = pool.apply_async(wait, (l,))
+        if pending is not None:
+            pending.get()
+    except Exception:
+        # Do not wait for a wait which is still running
+        pool.close()
+        raise
+    pool.close()
+    pool.join()
+
+def map_chunks(func, index_lists, max_concurrent_requests=1,
+        raise_first=False):
+    """
+    Call `func` once for each chunk in `index_lists`, and return the results
+    in the same order.
+
+    If `max_concurrent_requests` is 1, the chunks are done one after another,
+    and the first exception is raised immediately.  Otherwise, up to
+    `max_concurrent_requests` chunks are done at the same time in a thread
+    pool.  Every chunk is attempted, each failure is logged, and a
+    `FailedExecution` exception is raised at the end if any chunk failed.
+
+    :arg func: A function which takes a list of indices
+    :arg index_lists: A list of lists of indices, as from
+        :py:func:`chunk_index_list`
+    :arg max_concurrent_requests: The maximum number of chunks in progress at
+        once
+    :arg raise_first: Raise the exception of the first failed chunk itself,
+        rather than a `FailedExecution` summary.  Use this when reading data,
+        so that callers see the same exception at any concurrency.
+    :rtype: list
+    """
+    if max_concurrent_requests <= 1 or len(index_lists) <= 1:
+        return [func(l) for l in index_lists]
+    def run(l):
+        try:
+            return True, func(l)
+        except Exception as e:
+            return False, e
+    pool = ThreadPool(min(max_concurrent_requests, len(index_lists)))
+    try:
+        results = pool.map(run, index_lists)
+    finally:
+        pool.close()
+        pool.join()
+    failures = []
+    for l, (success, result) in zip(index_lists, results):
+        if not success:
+            logger.error(
+                'Request failed for indices {0}: {1}'.format(to_csv(l), result))
+            failures.append(result)
+    if failures and raise_first:
+        raise failures[0]
+    if failures:
+        raise FailedExecution(
+            '{0} of {1} requests failed.  First error: {2}'.format(
+                len(failures), len(index_lists), failures[0]
+            )
+        )
+    return [result for success, result in results]
+
 def get_indices(client):
     """
     Get the current list of indices from the cluster.
@@ -410,7 +693,8 @@ def get_indices(client):
     try:
         indices = list(
             client.indices.get_settings(
-            index='_all', params={'expand_wildcards': 'open,closed'})
+            index='_all', filter_path=_INDEX_NAMES_PATH,
+            params={'expand_wildcards': 'open,closed'})
         )
         version_number = get_version(client)
         logger.debug(
@@ -422,6 +706,45 @@ def get_indices(client):
     except Exception as e:
         raise FailedExecution('Failed to get indices. Error: {0}'.format(e))
 
+def existing_indices(client, indices):
+    """
+    Return the members of `indices` which currently exist in the cluster, open
+    or closed.  Only the named indices are requested, so this is much cheaper
+    than :py:func:`get_indices` on a cluster with many indices.
+
+    :arg client: An :class:`elasticsearch.Elasticsearch` client object
+    :arg indices: A list of index names, short enough for one request URL
+    :rtype: list
+    """
+    if not indices:
+        return []
+    try:
+        found = client.indices.get_settings(
+            index=to_csv(indices), filter_path=_INDEX_NAMES_PATH,
+            params={
+                'expand_wildcards': 'open,closed',
+                'ignore_unavailable': 'true',
+            }
+        )
+    except elasticsearch.NotFoundError:
+        return []
+    except Exception as e:
+        raise FailedExecution('Failed to get indices. Error: {0}'.format(e))
+    return [i for i in indices if i in found]
+
+def client_info(client):
+    """
+    Return the response of ``client.info()``.  For a client made by
+    :py:func:`get_client`, this is the response already read to check the
+    Elasticsearch version, so no request is made.
+
+    :arg client: An :class:`elasticsearch.Elasticsearch` client object
+    :rtype: dict
+    """
+    if client in _CLIENT_INFO:
+        return _CLIENT_INFO[client]
+    return client.info()
+
 def get_version(client):
     """
     Return the ES version number as a tuple.
@@ -430,7 +753,7 @@ def get_version(client):
     :arg client: An :class:`elasticsearch.Elasticsearch` client object
     :rtype: tuple
     """
-    version = client.info()['version']['number']
+    version = client_info(client)['version']['number']
     version = version.split('-')[0]
     if len(version.split('.')) > 3:
         version = version.split('.')[:-1]
@@ -446,10 +769,45 @@ def is_master_node(client):
     :arg client: An :class:`elasticsearch.Elasticsearch` client object
     :rtype: bool
     """
-    my_node_id = list(client.nodes.info('_local')['nodes'])[0]
+    my_node_id = list(
+        client.nodes.info('_local', filter_path='nodes.*.name')['nodes'])[0]
     master_node_id = client.cluster.state(metric='master_node')['master_node']
     return my_node_id == master_node_id
 
+def shard_allocation(client, indices):
+    """
+    Return the number of bytes of each index which are stored on each node, as
+    a dictionary keyed by index name, of dictionaries keyed by node name.
+    Both primary and replica shards are counted.  Unassigned shards are not.
+
+    :arg client: An :class:`elasticsearch.Elasticsearch` client object
+    :arg indices: A list of indices
+    :rtype: dict
+    """
+    names = dict(
+        (node_id, node['name']) for node_id, node in
+        client.nodes.info(filter_path='nodes.*.name')['nodes'].items()
+    )
+    allocation = dict((index, {}) for index in indices)
+    for l in chunk_index_list(indices):
+        stats = client.indices.stats(
+            index=to_csv(l), metric='store', level='shards',
+            filter_path=_SHARD_STORE_PATH
+        )
+        for index, data in stats.get('indices', {}).items():
+            nodes = allocation.setdefault(index, {})
+            for copies in data.get('shards', {}).values():
+                for copy in copies:
+                    node_id = copy.get('routing', {}).get('node')
+                    if not node_id:
+                        continue
+                    node = names.get(node_id, node_id)
+                    nodes[node] = (
+                        nodes.get(node, 0) +
+                        copy.get('store', {}).get('size_in_bytes', 0)
+                    )
+    return allocation
+
 def check_version(client):
     """
     Verify version is within acceptable range.  Raise an exception if it is not.
@@ -490,6 +848,80 @@ def check_master(client, master_only=False):
         )
         sys.exit(0)
 
+class MeteredConnection(elasticsearch.Urllib3HttpConnection):
+    """
+    An :class:`elasticsearch.Urllib3HttpConnection` which counts the requests
+    it makes and the bytes of response data it receives.  Totals are kept for
+    all connections in the process, and can be read with :py:meth:`totals`.
+
+    If HTTP compression is enabled, the counts are of the uncompressed data.
+    """
+    _lock = threading.Lock()
+    _requests = 0
+    _bytes = 0
+
+    def perform_request(
+            self, method, url, params=None, body=None, timeout=None,
+            ignore=()
+        ):
+        status, headers, data = super(MeteredConnection, self).perform_request(
+            method, url, params=params, body=body, timeout=timeout,
+            ignore=ignore
+        )
+        MeteredConnection.count(method, url, data)
+        return status, headers, data
+
+    @classmethod
+    def count(cls, method, url, data):
+        """
+        Add one request, and the size of its response `data`, to the totals.
+
+        :arg method: The HTTP method of the request
+        :arg url: The URL of the request
+        :arg data: The response body
+        """
+        size = len(data) if data else 0
+        with cls._lock:
+            cls._requests += 1
+            cls._bytes += size
+        logger.debug('Received {0} from {1} {2}'.format(
+            byte_size(size), method, url))
+
+    @classmethod
+    def totals(cls):
+        """
+        Return a tuple of ``(requests, bytes)`` received so far.
+
+        :rtype: tuple
+        """
+        with cls._lock:
+            return cls._requests, cls._bytes
+
+    @classmethod
+    def reset(cls):
+        """Set the totals back to zero."""
+        with cls._lock:
+            cls._requests = 0
+            cls._bytes = 0
+
+class MeteredRequestsConnection(elasticsearch.RequestsHttpConnection):
+    """
+    An :class:`elasticsearch.RequestsHttpConnection`, as used to sign requests
+    with AWS IAM credentials, which adds its requests and response bytes to
+    the totals of :py:class:`MeteredConnection`.
+    """
+    def perform_request(
+            self, method, url, params=None, body=None, timeout=None,
+            ignore=()
+        ):
+        status, headers, data = super(
+            MeteredRequestsConnection, self).perform_request(
+                method, url, params=params, body=body, timeout=timeout,
+                ignore=ignore
+            )
+        MeteredConnection.count(method, url, data)
+        return status, headers, data
+
 def get_client(**kwargs):
     """
     NOTE: AWS IAM parameters `aws_key`, `aws_secret_key`, and `aws_region` are
@@ -530,6 +962,10 @@ def get_client(**kwargs):
     :type http_auth: str
     :arg timeout: Number of seconds before the client will timeout.
     :type timeout: int
+    :arg http_compress: If `True`, ask Elasticsearch to compress responses
+        with gzip.  This is slower for the cluster, but much less data is sent
+        for large responses.
+    :type http_compress: bool
     :arg master_only: If `True`, the client will `only` connect if the
         endpoint is the elected master node of the cluster.  **This option does
         not work if `hosts` has more than one value.**  It will raise an
@@ -564,6 +1000,13 @@ def get_client(**kwargs):
     kwargs['hosts'] = ensure_list(kwargs['hosts'])
     logger.debug("kwargs = {0}".format(kwargs))
     master_only = kwargs.pop('master_only')
+    # Curator settings from the client configuration, not client arguments
+    kwargs.pop('metadata_cache', None)
+    kwargs.pop('metadata_cache_ttl', None)
+    if kwargs.pop('http_compress', False):
+        # urllib3 decompresses the response transparently
+        kwargs['headers'] = {'accept-encoding': 'gzip,deflate'}
+    kwargs['connection_class'] = MeteredConnection
     if kwargs['use_ssl']:
         if kwargs['ssl_no_validate']:
             kwargs['verify_certs'] = False # Not needed, but explicitly defined
@@ -603,7 +1046,7 @@ def get_client(**kwargs):
             # Override these kwargs
             kwargs['use_ssl'] = True
             kwargs['verify_certs'] = True
-            kwargs['connection_class'] = elasticsearch.RequestsHttpConnection
+            kwargs['connection_class'] = MeteredRequestsConnection
             kwargs['http_auth'] = (
                 AWS4Auth(
                     kwargs['aws_key'], kwargs['aws_secret_key'],
@@ -622,6 +1065,7 @@ def get_client(**kwargs):
             )
     try:
         client = elasticsearch.Elasticsearch(**kwargs)
+        _CLIENT_INFO[client] = client.info()
         # Verify the version is acceptable.
         check_version(client)
         # Verify "master_only" status, if applicable
@@ -696,40 +1140,126 @@ def get_snapshot(client, repository=None, snapshot=''):
             '{1}.  Error: {2}'.format(snapname, repository, e)
         )
 
-def get_snapshot_data(client, repository=None):
+def get_snapshot_data(client, repository=None, snapshots=None):
     """
     Get ``_all`` snapshots from repository and return a list.
 
     :arg client: An :class:`elasticsearch.Elasticsearch` client object
     :arg repository: The Elasticsearch snapshot repository to use
+    :arg snapshots: Only get these snapshots, skipping any which no longer
+        exist.  Default is ``_all``
     :rtype: list
     """
     if not repository:
         raise MissingArgument('No value for "repository" provided')
+    kwargs = { 'snapshot': '_all' }
+    if snapshots:
+        kwargs = { 'snapshot': ','.join(snapshots), 'ignore_unavailable': True }
     try:
         return client.snapshot.get(
-            repository=repository, snapshot="_all")['snapshots']
+            repository=repository, filter_path=_SNAPSHOT_PATH, **kwargs
+        ).get('snapshots', [])
     except (elasticsearch.TransportError, elasticsearch.NotFoundError) as e:
         raise FailedExecution(
             'Unable to get snapshot information from repository: {0}.  '
             'Error: {1}'.format(repository, e)
         )
 
+def get_snapshot_listing(client, repository=None):
+    """
+    Get the name, state, and start and end times of every snapshot in
+    `repository` from the cat snapshots API, and return a list in the same
+    form as :py:func:`get_snapshot_data`.  Unlike the snapshots API, this does
+    not list the indices in each snapshot, so the response stays small for
+    repositories with many thousands of snapshots.
+
+    :arg client: An :class:`elasticsearch.Elasticsearch` client object
+    :arg repository: The Elasticsearch snapshot repository to use
+    :rtype: list
+    """
+    if not repository:
+        raise MissingArgument('No value for "repository" provided')
+    try:
+        rows = client.cat.snapshots(
+            repository=repository, format='json',
+            h='id,status,start_epoch,end_epoch'
+        )
+    except (elasticsearch.TransportError, elasticsearch.NotFoundError) as e:
+        raise FailedExecution(
+            'Unable to list snapshots in repository: {0}.  '
+            'Error: {1}'.format(repository, e)
+        )
+    snapshots = []
+    for row in rows:
+        # The cat API reports times in seconds, as strings
+        snapshots.append({
+            'snapshot': row['id'],
+            'state': row['status'],
+            'start_time_in_millis': int(row['start_epoch']) * 1000,
+            'end_time_in_millis': int(row['end_epoch']) * 1000,
+        })
+    return snapshots
+
+def current_snapshots(client, repository=None):
+    """
+    Return the names of the snapshots currently running in `repository`, or
+    in any repository if `repository` is not provided.  This uses the
+    snapshot status API, which only reports running snapshots, rather than
+    listing every snapshot in the repository.
+
+    :arg client: An :class:`elasticsearch.Elasticsearch` client object
+    :arg repository: The Elasticsearch snapshot repository to use
+    :rtype: list
+    """
+    try:
+        status = client.snapshot.status(
+            repository=repository, filter_path=_SNAPSHOT_STATUS_PATH)
+    except Exception as e:
+        report_failure(e)
+    return [snap['snapshot'] for snap in status.get('snapshots', [])]
+
+def snapshot_index_sizes(client, repository=None, snapshot=None):
+    """
+    Return the number of shards and the size in bytes of each index in
+    `snapshot`, from the snapshot status API, as two dictionaries keyed by
+    index name.
+
+    :arg client: An :class:`elasticsearch.Elasticsearch` client object
+    :arg repository: The Elasticsearch snapshot repository
+    :arg snapshot: The name of the snapshot
+    :rtype: tuple
+    """
+    try:
+        response = client.snapshot.status(
+            repository=repository, snapshot=snapshot,
+            filter_path=(
+                'snapshots.indices.*.shards_stats.total,'
+                'snapshots.indices.*.stats.total_size_in_bytes'
+            )
+        )
+    except Exception as e:
+        report_failure(e)
+    shards = {}
+    sizes = {}
+    for snap in response.get('snapshots', []):
+        for index, data in snap.get('indices', {}).items():
+            shards[index] = data.get('shards_stats', {}).get('total', 0)
+            sizes[index] = data.get('stats', {}).get('total_size_in_bytes', 0)
+    return shards, sizes
+
 def snapshot_in_progress(client, repository=None, snapshot=None):
     """
     Determine whether the provided snapshot in `repository` is ``IN_PROGRESS``.
-    If no value is provided for `snapshot`, then check all of them.
+    If no value is provided for `snapshot`, then check all of them.  If no
+    value is provided for `repository`, then check every repository in the
+    cluster.
     Return `snapshot` if it is found to be in progress, or `False`
 
     :arg client: An :class:`elasticsearch.Elasticsearch` client object
     :arg repository: The Elasticsearch snapshot repository to use
     :arg snapshot: The snapshot name
     """
-    allsnaps = get_snapshot_data(client, repository=repository)
-    inprogress = (
-        [snap['snapshot'] for snap in allsnaps if 'state' in snap.keys() \
-            and snap['state'] == 'IN_PROGRESS']
-    )
+    inprogress = current_snapshots(client, repository=repository)
     if snapshot:
         return snapshot if snapshot in inprogress else False
     else:
@@ -1001,10 +1531,14 @@ def snapshot_running(client, repository=None):
     Return `True` if a snapshot is in progress, and `False` if not
 
     :arg client: An :class:`elasticsearch.Elasticsearch` client object
+    :arg repository: The Elasticsearch snapshot repository to check.  If not
+        provided, check every repository in the cluster.
     :rtype: bool
     """
     try:
-        status = client.snapshot.status(repository=repository)['snapshots']
+        status = client.snapshot.status(
+            repository=repository, filter_path=_SNAPSHOT_STATUS_PATH
+        ).get('snapshots', [])
     except Exception as e:
         report_failure(e)
     # We will only accept a positively identified False.  Anything else is
@@ -1190,20 +1724,39 @@ def validate_actions(data):
     # if we've gotten this far without any Exceptions raised, it's valid!
     return { 'actions' : clean_config }
 
-def health_check(client, **kwargs):
+def health_check(client, index=None, timeout=None, **kwargs):
     """
     This function calls client.cluster.health and, based on the args provided,
     will return `True` or `False` depending on whether that particular keyword 
     appears in the output, and has the expected value.
     If multiple keys are provided, all must match for a `True` response. 
 
+    With a `timeout`, Elasticsearch holds the request open until ``status``
+    and ``relocating_shards: 0``, if provided, are reached or the timeout
+    expires, rather than answering at once.
+
     :arg client: An :class:`elasticsearch.Elasticsearch` client object
+    :arg index: Limit the health check to this list of indices
+    :arg timeout: Number of seconds Elasticsearch may wait before responding
     """
     logger.debug('KWARGS= "{0}"'.format(kwargs))
     klist = list(kwargs.keys())
     if len(klist) < 1:
         raise MissingArgument('Must provide at least one keyword argument')
-    hc_data = client.cluster.health()
+    params = {}
+    if index:
+        params['index'] = to_csv(index)
+    if timeout:
+        params['timeout'] = '{0}s'.format(int(timeout))
+        # Do not let the client give up before Elasticsearch answers
+        params['request_timeout'] = int(timeout) + 10
+        # Elasticsearch answers 408 if the wait timed out
+        params['ignore'] = 408
+        if 'status' in kwargs:
+            params['wait_for_status'] = kwargs['status']
+        if kwargs.get('relocating_shards') == 0:
+            params['wait_for_no_relocating_shards'] = True
+    hc_data = client.cluster.health(**params)
     response = True
     
     for k in klist:
@@ -1225,6 +1778,41 @@ def health_check(client, **kwargs):
         logger.info('Health Check for all provided keys passed.')   
     return response
 
+def health_wait(client, index=None, max_wait=-1, **kwargs):
+    """
+    Wait until :py:func:`health_check` with `index` and `kwargs` passes.
+    Elasticsearch holds each request open for up to
+    :py:func:`curator.defaults.settings.health_poll_timeout` seconds, so
+    there is no sleeping between checks.  Raise
+    :py:class:`curator.exceptions.ActionTimeout` if it has not passed after
+    `max_wait` seconds.
+
+    :arg client: An :class:`elasticsearch.Elasticsearch` client object
+    :arg index: Limit the health check to this list of indices
+    :arg max_wait: Number of seconds to wait before giving up.  The default is
+        -1, meaning wait forever.
+    """
+    start = time.time()
+    while True:
+        timeout = settings.health_poll_timeout()
+        if max_wait != -1:
+            timeout = min(timeout, max(1, start + max_wait - time.time()))
+        polled = time.time()
+        if health_check(client, index=index, timeout=timeout, **kwargs):
+            logger.info(
+                'Health check passed after {0:.1f} seconds'.format(
+                    time.time() - start)
+            )
+            return
+        if max_wait != -1 and time.time() - start >= max_wait:
+            raise ActionTimeout(
+                'Health check {0} failed to pass in the max_wait period of '
+                '{1} seconds'.format(kwargs, max_wait)
+            )
+        # Elasticsearch answered without waiting, e.g. for a missing index
+        if time.time() - polled < 1:
+            time.sleep(1)
+
 def snapshot_check(client, snapshot=None, repository=None):
     """
     This function calls `client.snapshot.get` and tests to see whether the 
@@ -1286,7 +1874,7 @@ def restore_check(client, index_list):
         )
     for index in index_list:
         for shard in range(0, len(response[index]['shards'])):
-            if response[index]['shards'][shard]['stage'] is not 'DONE':
+            if response[index]['shards'][shard]['stage'] != 'DONE':
                 logger.info(
                     'Index "{0}" is still in stage "{1}"'.format(
                         index, response[index]['shards'][shard]['stage']
@@ -1297,6 +1885,278 @@ def restore_check(client, index_list):
     return True
 
 
+class RecoveryTracker(object):
+    """
+    Track the recovery of the shards of a list of indices, as after a restore
+    or an open, with :py:meth:`check`.
+
+    Only active recoveries are requested, so shards which finished earlier
+    are not sent again on each check.  A shard which was active, and is no
+    longer listed, has finished.  The full recovery information is requested
+    only for indices none of whose shards have been seen yet.  Each check
+    logs the bytes recovered, the rate since tracking began, and an estimate
+    of the time remaining.
+
+    Names are resolved before their first recovery request.  A wildcard or
+    alias is replaced by the indices it matches, and a name matching no index
+    is dropped, as it would never be seen recovering.
+    """
+    def __init__(self, index_list):
+        """
+        :arg index_list: The list of indices to track
+        """
+        self.loggit = logging.getLogger('curator.utils.recovery')
+        #: Instance variable.
+        #: The indices being tracked
+        self.indices = list(index_list)
+        #: Instance variable.
+        #: The size in bytes of each shard seen, by (index, shard, primary)
+        self.shards = {}
+        #: Instance variable.
+        #: The shards which have finished recovering
+        self.done = set()
+        # Bytes recovered so far by each active shard
+        self._active = {}
+        # Names which have been resolved to indices
+        self._resolved = set()
+        self._start = time.time()
+
+    def __resolve(self, client, index_list):
+        found = []
+        try:
+            for l in chunk_index_list(index_list):
+                try:
+                    found.extend(i for i in client.indices.get_settings(
+                        index=to_csv(l), filter_path=_INDEX_NAMES_PATH,
+                        params={
+                            'expand_wildcards': 'open,closed',
+                            'ignore_unavailable': 'true',
+                        }
+                    ) if not i in found)
+                except elasticsearch.NotFoundError:
+                    pass
+        except Exception as e:
+            raise CuratorException(
+                'Unable to resolve the indices to track. Error: {0}'.format(e))
+        self._resolved.update(index_list)
+        self._resolved.update(found)
+        dropped = [i for i in index_list if not i in found]
+        if not dropped:
+            return
+        added = [i for i in found if not i in self.indices]
+        self.indices = [i for i in self.indices if not i in dropped] + added
+        if added:
+            self.loggit.info(
+                'Tracking indices {0} in place of {1}'.format(added, dropped))
+        else:
+            self.loggit.warn(
+                'Not waiting for {0}, which match no index'.format(dropped))
+
+    def __recovery(self, client, index_list, active_only):
+        response = {}
+        try:
+            for l in chunk_index_list(index_list):
+                response.update(client.indices.recovery(
+                    index=to_csv(l), active_only=active_only))
+        except Exception as e:
+            raise CuratorException(
+                'Unable to obtain recovery information for specified indices. '
+                'Error: {0}'.format(e)
+            )
+        return response
+
+    def __update(self, response, active_only):
+        listed = set()
+        for index, data in response.items():
+            for i, shard in enumerate(data.get('shards', [])):
+                key = (index, shard.get('id', i), shard.get('primary', True))
+                size = shard.get('index', {}).get('size', {})
+                self.shards[key] = size.get('total_in_bytes', 0)
+                if shard.get('stage') == 'DONE':
+                    self.done.add(key)
+                    self._active.pop(key, None)
+                else:
+                    listed.add(key)
+                    self._active[key] = size.get('recovered_in_bytes', 0)
+        if active_only:
+            for key in [k for k in self._active if not k in listed]:
+                self.done.add(key)
+                del self._active[key]
+
+    def add(self, index_list):
+        """
+        Start tracking the indices in `index_list` as well.
+
+        :arg index_list: A list of indices
+        """
+        self.indices.extend(i for i in index_list if not i in self.indices)
+
+    def pending(self):
+        """
+        Return the tracked indices which have not been seen, or which had a
+        shard recovering at the last :py:meth:`check`.
+
+        :rtype: set
+        """
+        seen = set(key[0] for key in self.shards)
+        retval = set(i for i in self.indices if not i in seen)
+        retval.update(key[0] for key in self._active)
+        return retval
+
+    def check(self, client):
+        """
+        Return `True` if every tracked index has been seen, and all of their
+        shards have finished recovering.  Otherwise, return `False`.
+
+        :arg client: An :class:`elasticsearch.Elasticsearch` client object
+        :rtype: bool
+        """
+        if self._active:
+            active = sorted(set(key[0] for key in self._active))
+            self.__update(self.__recovery(client, active, True), True)
+        seen = set(key[0] for key in self.shards)
+        unseen = [i for i in self.indices if not i in seen]
+        fresh = [i for i in unseen if not i in self._resolved]
+        if fresh:
+            self.__resolve(client, fresh)
+            unseen = [i for i in self.indices if not i in seen]
+        if unseen:
+            self.__update(self.__recovery(client, unseen, False), False)
+            seen = set(key[0] for key in self.shards)
+            unseen = [i for i in unseen if not i in seen]
+        self.__log()
+        if unseen:
+            self.loggit.info(
+                '{0} indices have not started recovering, e.g. '
+                '"{1}"'.format(len(unseen), unseen[0])
+            )
+            return False
+        return not self._active
+
+    def __log(self):
+        total = sum(self.shards.values())
+        recovered = sum(self.shards[key] for key in self.done)
+        recovered += sum(self._active.values())
+        elapsed = time.time() - self._start
+        rate = recovered / elapsed if elapsed > 0 else 0.0
+        if rate:
+            remaining = str(timedelta(seconds=int((total - recovered) / rate)))
+        else:
+            remaining = 'unknown'
+        self.loggit.info(
+            'Recovered {0} of {1} shards, {2} of {3} at {4}/s, about {5} '
+            'remaining'.format(
+                len(self.done), len(self.shards), byte_size(recovered),
+                byte_size(total), byte_size(rate), remaining
+            )
+        )
+
+class RecoveryWaves(object):
+    """
+    Start the recovery of a list of indices in waves, so that no more than
+    `max_shards` shards, or `max_bytes` bytes, are recovering at once.  Call
+    :py:meth:`step` until it returns `True`, e.g. with a :py:class:`Waiter`.
+
+    Each step checks recovery with a :py:class:`RecoveryTracker`, and starts
+    as many of the remaining indices, in order, as fit under the limits.  An
+    index larger than a limit is started on its own once nothing else is
+    recovering.
+    """
+    def __init__(self, indices, submit, shards, sizes=None, max_shards=None,
+            max_bytes=None, overlap=True, targets=None):
+        """
+        :arg indices: The list of indices to recover
+        :arg submit: A function which takes a list of indices and starts
+            their recovery
+        :arg shards: The number of shards which recover for each index, by
+            index name.  Missing indices count as 0.
+        :arg sizes: The size in bytes of each index, by index name
+        :arg max_shards: The largest number of shards to recover at once
+        :arg max_bytes: The largest number of bytes to recover at once
+        :arg overlap: If `False`, only start a wave once the previous one has
+            finished.  A snapshot restore can not start while another is in
+            progress.
+        :arg targets: The name each index recovers as, if it differs, e.g.
+            after a restore with ``rename_pattern``
+        """
+        self.loggit = logging.getLogger('curator.utils.recovery')
+        #: Instance variable.
+        #: The indices which have not been started yet, in order
+        self.queue = list(indices)
+        self.submit = submit
+        self.shards = shards
+        self.sizes = sizes or {}
+        self.max_shards = max_shards
+        self.max_bytes = max_bytes
+        self.overlap = overlap
+        self.targets = targets or {}
+        # The index each tracked name was started from
+        self._sources = {}
+        #: Instance variable.
+        #: The :py:class:`RecoveryTracker` of the indices started so far
+        self.tracker = RecoveryTracker([])
+        #: Instance variable.
+        #: The number of waves started so far
+        self.waves = 0
+
+    def __next_wave(self):
+        in_flight = [self._sources.get(i, i) for i in self.tracker.pending()]
+        shards = sum(self.shards.get(i, 0) for i in in_flight)
+        size = sum(self.sizes.get(i, 0) for i in in_flight)
+        wave = []
+        while self.queue:
+            index = self.queue[0]
+            more_shards = shards + self.shards.get(index, 0)
+            more_size = size + self.sizes.get(index, 0)
+            if (wave or in_flight) and (
+                    (self.max_shards and more_shards > self.max_shards) or
+                    (self.max_bytes and more_size > self.max_bytes)):
+                break
+            wave.append(self.queue.pop(0))
+            shards, size = more_shards, more_size
+        return wave
+
+    def step(self, client):
+        """
+        Start the next wave, if there is room for it, and check recovery.
+        Return `True` once every index has been started and has recovered.
+
+        :arg client: An :class:`elasticsearch.Elasticsearch` client object
+        :rtype: bool
+        """
+        if self.queue and (self.overlap or not self.tracker.pending()):
+            wave = self.__next_wave()
+            if wave:
+                try:
+                    self.submit(wave)
+                except elasticsearch.TransportError as e:
+                    if e.status_code != 503:
+                        raise
+                    # Another restore has not finished yet
+                    self.loggit.info(
+                        'Unable to start recovery yet, will retry: '
+                        '{0}'.format(e)
+                    )
+                    self.queue[0:0] = wave
+                    return False
+                self.waves += 1
+                self.loggit.info(
+                    'Started recovery wave {0}: {1} indices, {2} shards, '
+                    '{3}.  {4} indices remaining.'.format(
+                        self.waves, len(wave),
+                        sum(self.shards.get(i, 0) for i in wave),
+                        byte_size(sum(self.sizes.get(i, 0) for i in wave)),
+                        len(self.queue)
+                    )
+                )
+                started = []
+                for index in wave:
+                    target = self.targets.get(index, index)
+                    self._sources[target] = index
+                    started.append(target)
+                self.tracker.add(started)
+        return self.tracker.check(client) and not self.queue
+
 def task_check(client, task_id=None):
     """
     This function calls client.tasks.get with the provided `task_id`.  If the
@@ -1337,6 +2197,112 @@ def task_check(client, task_id=None):
         return False
 
 
+class Waiter(object):
+    """
+    Wait for any number of operations, such as tasks, snapshots, restores,
+    or cluster health conditions, to complete, in a single loop.
+
+    Each operation is checked as soon as it is added, and again after
+    :py:func:`curator.defaults.settings.wait_first_delay` seconds.  The delay
+    doubles after each check which finds it incomplete, up to `wait_interval`
+    seconds, and is randomized slightly so that checks do not fall into step.
+    Short operations are noticed quickly, and long ones are not checked more
+    often than every `wait_interval` seconds.
+
+    :arg client: An :class:`elasticsearch.Elasticsearch` client object
+    :arg wait_interval: The longest time in seconds between checks of one
+        operation
+    :arg max_wait: Number of seconds to wait for each operation before giving
+        up on it.  The default is -1, meaning wait forever.
+    """
+    def __init__(self, client, wait_interval=9, max_wait=-1):
+        #: Instance variable.
+        #: An :class:`elasticsearch.Elasticsearch` client object
+        self.client = client
+        #: Instance variable.
+        #: The longest time in seconds between checks of one operation
+        self.wait_interval = wait_interval
+        #: Instance variable.
+        #: How long to wait for each operation, or -1 to wait forever
+        self.max_wait = max_wait
+        #: Instance variable.
+        #: The number of seconds each completed operation took, by label
+        self.elapsed = {}
+        self.pending = []
+
+    def add(self, label, function, **kwargs):
+        """
+        Wait for ``function(client, **kwargs)`` to return `True`.
+
+        :arg label: A name for the operation, used in log messages and as the
+            key in `elapsed`
+        :arg function: A check, such as :py:func:`health_check`
+        """
+        now = time.time()
+        self.pending.append({
+            'label': label, 'function': function, 'kwargs': kwargs,
+            'start': now, 'next': now, 'checks': 0,
+            'delay': min(settings.wait_first_delay(), self.wait_interval),
+        })
+
+    def __schedule(self, op):
+        jitter = settings.wait_jitter()
+        op['next'] = (
+            time.time() + op['delay'] * random.uniform(1 - jitter, 1 + jitter))
+        if self.max_wait != -1:
+            # Check one last time when max_wait is reached
+            op['next'] = min(op['next'], op['start'] + self.max_wait)
+        op['delay'] = min(op['delay'] * 2, self.wait_interval)
+
+    def wait(self):
+        """
+        Check each pending operation when it is due, until all are complete
+        or have timed out.  Raise :py:class:`curator.exceptions.ActionTimeout`
+        if any timed out, after the rest have completed.
+
+        :returns: `elapsed`
+        :rtype: dict
+        """
+        timed_out = []
+        while self.pending:
+            now = time.time()
+            for op in [op for op in self.pending if op['next'] <= now]:
+                op['checks'] += 1
+                response = op['function'](self.client, **op['kwargs'])
+                logger.debug('Response: {0}'.format(response))
+                elapsed = time.time() - op['start']
+                if response:
+                    self.pending.remove(op)
+                    self.elapsed[op['label']] = elapsed
+                    logger.info(
+                        'Waited {0:.1f} seconds for "{1}" to finish '
+                        '({2} checks)'.format(elapsed, op['label'], op['checks'])
+                    )
+                elif self.max_wait != -1 and elapsed >= self.max_wait:
+                    self.pending.remove(op)
+                    timed_out.append(op['label'])
+                    logger.error(
+                        'Unable to complete action "{0}" within max_wait ({1}) '
+                        'seconds.'.format(op['label'], self.max_wait)
+                    )
+                else:
+                    self.__schedule(op)
+                    logger.debug(
+                        'Action "{0}" not yet complete, {1} total seconds '
+                        'elapsed.  Checking again in {2:.1f} '
+                        'seconds.'.format(
+                            op['label'], int(elapsed), op['next'] - time.time())
+                    )
+            if self.pending:
+                time.sleep(max(
+                    0, min(op['next'] for op in self.pending) - time.time()))
+        if timed_out:
+            raise ActionTimeout(
+                'Action "{0}" failed to complete in the max_wait period of '
+                '{1} seconds'.format(', '.join(timed_out), self.max_wait)
+            )
+        return self.elapsed
+
 def wait_for_it(
         client, action, task_id=None, snapshot=None, repository=None,
         index_list=None, wait_interval=9, max_wait=-1
@@ -1350,6 +2316,10 @@ def wait_for_it(
         declared.
     :arg snapshot: The name of the snapshot.
     :arg repository: The Elasticsearch snapshot repository to use
+    :arg index_list: The indices to wait for.  Required for ``restore`` and
+        ``open``, whose recovery is followed with :py:class:`RecoveryTracker`.
+        For ``allocation`` and ``replicas``, limits the health check to these
+        indices, rather than the whole cluster.
     :arg wait_interval: How frequently the specified "wait" behavior will be
         polled to check for completion.
     :arg max_wait: Number of seconds will the "wait" behavior persist 
@@ -1377,6 +2347,10 @@ def wait_for_it(
             'function':restore_check,
             'args':{'index_list':index_list},
         },
+        'open':{
+            'function':restore_check,
+            'args':{'index_list':index_list},
+        },
         'reindex':{
             'function':task_check,
             'args':{'task_id':task_id},
@@ -1397,7 +2371,7 @@ def wait_for_it(
             'A snapshot and repository must accompany "action" {0}. snapshot: '
             '{1}, repository: {2}'.format(action, snapshot, repository)
         )
-    if action == 'restore' and index_list == None:
+    if action in ['restore', 'open'] and index_list == None:
         raise MissingArgument(
             'An index_list must accompany "action" {0}'.format(action)
         )
@@ -1412,39 +2386,17 @@ def wait_for_it(
             )
 
     # Now with this mapped, we can perform the wait as indicated.
-    start_time = datetime.now()
-    result = False
-    while True:
-        elapsed = int((datetime.now() - start_time).total_seconds())
-        logger.debug('Elapsed time: {0} seconds'.format(elapsed))
-        response = action_map[action]['function'](
-            client, **action_map[action]['args'])
-        logger.debug('Response: {0}'.format(response))
-        # Success
-        if response:
-            logger.debug(
-                'Action "{0}" finished executing (may or may not have been '
-                'successful)'.format(action))
-            result = True
-            break
-        # Not success, and reached maximum wait (if defined)
-        elif (max_wait != -1) and (elapsed >= max_wait):
-            logger.error(
-                'Unable to complete action "{0}" within max_wait ({1}) '
-                'seconds.'.format(action, max_wait)
-            )
-            break
-        # Not success, so we wait.
-        else:
-            logger.debug(
-                'Action "{0}" not yet complete, {1} total seconds elapsed. '
-                'Waiting {1} seconds before checking '
-                'again.'.format(action, wait_interval))
-            time.sleep(wait_interval)
-
-    logger.debug('Result: {0}'.format(result))
-    if result == False:
-        raise ActionTimeout(
-            'Action "{0}" failed to complete in the max_wait period of '
-            '{1} seconds'.format(action, max_wait)
-        )
\ No newline at end of file
+    if action_map[action]['function'] is health_check:
+        return health_wait(
+            client, index=index_list, max_wait=max_wait,
+            **action_map[action]['args']
+        )
+    waiter = Waiter(client, wait_interval=wait_interval, max_wait=max_wait)
+    if action_map[action]['function'] is restore_check:
+        waiter.add(action, RecoveryTracker(index_list).check)
+    else:
+        waiter.add(
+            action, action_map[action]['function'],
+            **action_map[action]['args']
+        )
+    waiter.wait()
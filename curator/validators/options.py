@@ -8,6 +8,10 @@ def action_specific(action):
             option_defaults.name(action),
             option_defaults.warn_if_no_indices(),
             option_defaults.extra_settings(),
+            option_defaults.loader(),
+            option_defaults.max_concurrent_fetches(),
+            option_defaults.reorder_filters(),
+            option_defaults.filter_summary(),
         ],
         'allocation' : [
             option_defaults.key(),
@@ -16,8 +20,20 @@ def action_specific(action):
             option_defaults.wait_for_completion(action),
             option_defaults.wait_interval(action),
             option_defaults.max_wait(action),            
+            option_defaults.max_concurrent_requests(),
+            option_defaults.loader(),
+            option_defaults.max_concurrent_fetches(),
+            option_defaults.reorder_filters(),
+            option_defaults.filter_summary(),
+        ],
+        'close' : [
+            option_defaults.delete_aliases(),
+            option_defaults.max_concurrent_requests(),
+            option_defaults.loader(),
+            option_defaults.max_concurrent_fetches(),
+            option_defaults.reorder_filters(),
+            option_defaults.filter_summary(),
         ],
-        'close' : [ option_defaults.delete_aliases() ],
         'cluster_routing' : [
             option_defaults.routing_type(),
             option_defaults.cluster_routing_setting(),
@@ -30,17 +46,42 @@ def action_specific(action):
             option_defaults.name(action),
             option_defaults.extra_settings(),
         ],
-        'delete_indices' : [],
+        'delete_indices' : [
+            option_defaults.max_concurrent_requests(),
+            option_defaults.loader(),
+            option_defaults.max_concurrent_fetches(),
+            option_defaults.reorder_filters(),
+            option_defaults.filter_summary(),
+        ],
         'delete_snapshots' : [
             option_defaults.repository(),
             option_defaults.retry_interval(),
             option_defaults.retry_count(),
+            option_defaults.journal(),
+            option_defaults.snapshot_loader(),
+            option_defaults.snapshot_catalog(),
+            option_defaults.filter_summary(),
         ],
         'forcemerge' : [
             option_defaults.delay(),
             option_defaults.max_num_segments(),
+            option_defaults.max_merges_per_node(),
+            option_defaults.loader(),
+            option_defaults.max_concurrent_fetches(),
+            option_defaults.reorder_filters(),
+            option_defaults.filter_summary(),
+        ],
+        'open' : [
+            option_defaults.max_concurrent_requests(),
+            option_defaults.loader(),
+            option_defaults.max_concurrent_fetches(),
+            option_defaults.reorder_filters(),
+            option_defaults.filter_summary(),
+            option_defaults.wait_for_completion(action),
+            option_defaults.wait_interval(action),
+            option_defaults.max_wait(action),
+            option_defaults.max_recovering_shards(),
         ],
-        'open' : [],
         'reindex' : [
             option_defaults.request_body(),
             option_defaults.refresh(),
@@ -60,12 +101,21 @@ def action_specific(action):
             option_defaults.remote_filters(),
             option_defaults.remote_url_prefix(),
             option_defaults.remote_ssl_no_validate(),
+            option_defaults.loader(),
+            option_defaults.max_concurrent_fetches(),
+            option_defaults.reorder_filters(),
+            option_defaults.filter_summary(),
         ],
         'replicas' : [
             option_defaults.count(),
             option_defaults.wait_for_completion(action),
             option_defaults.wait_interval(action),
             option_defaults.max_wait(action),            
+            option_defaults.max_concurrent_requests(),
+            option_defaults.loader(),
+            option_defaults.max_concurrent_fetches(),
+            option_defaults.reorder_filters(),
+            option_defaults.filter_summary(),
         ],
         'rollover' : [
             option_defaults.name(action),
@@ -88,6 +138,11 @@ def action_specific(action):
             option_defaults.wait_interval(action),
             option_defaults.max_wait(action),            
             option_defaults.skip_repo_fs_check(),
+            option_defaults.snapshot_loader(),
+            option_defaults.snapshot_catalog(),
+            option_defaults.filter_summary(),
+            option_defaults.max_recovering_shards(),
+            option_defaults.max_recovering_bytes(),
         ],
         'snapshot' : [
             option_defaults.repository(),
@@ -99,6 +154,10 @@ def action_specific(action):
             option_defaults.wait_interval(action),
             option_defaults.max_wait(action),
             option_defaults.skip_repo_fs_check(),
+            option_defaults.loader(),
+            option_defaults.max_concurrent_fetches(),
+            option_defaults.reorder_filters(),
+            option_defaults.filter_summary(),
         ],
     }
     return options[action]
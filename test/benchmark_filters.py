@@ -0,0 +1,88 @@
+#!/usr/bin/env python
+"""
+Time the age, space, and count filters of IndexList against a large number of
+synthetic indices.  No Elasticsearch cluster is needed.
+
+    python test/benchmark_filters.py [number_of_indices]
+
+Set CURATOR_NO_NUMPY=1 to time the pure Python code path, even if NumPy is
+installed.
+"""
+from __future__ import print_function
+
+import os
+import sys
+import time
+from mock import Mock
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import curator
+from curator import columnar
+
+DAY = 86400
+START = 1262304000 # 2010-01-01
+
+def synthetic_client(count):
+    indices = {}
+    stats = {}
+    for i in range(count):
+        name = 'logstash-{0}'.format(
+            time.strftime('%Y.%m.%d', time.gmtime(START + (i % 3650) * DAY)))
+        name += '-{0:06d}'.format(i)
+        indices[name] = {
+            'state': 'open',
+            'settings': {
+                'index': {
+                    'creation_date': str((START + (i % 3650) * DAY) * 1000),
+                    'number_of_shards': '5',
+                    'number_of_replicas': '1',
+                }
+            }
+        }
+        stats[name] = {
+            'total': {
+                'store': {'size_in_bytes': 1024 * 1024 * (1 + i % 100)},
+                'docs': {'count': 1000 + i},
+            }
+        }
+    client = Mock()
+    client.info.return_value = {'version': {'number': '5.0.0'}}
+    client.cluster.state.return_value = {'metadata': {'indices': indices}}
+    client.indices.stats.return_value = {'indices': stats}
+    return client
+
+def timed(label, client, func):
+    ilo = curator.IndexList(client, loader='bulk')
+    start = time.time()
+    func(ilo)
+    elapsed = time.time() - start
+    print('{0:<40} {1:>8.3f}s  {2:>7} indices remain'.format(
+        label, elapsed, len(ilo.indices)))
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    if os.environ.get('CURATOR_NO_NUMPY'):
+        columnar.numpy = None
+    print('{0} indices, NumPy: {1}'.format(
+        count, 'yes' if columnar.numpy is not None else 'no'))
+    client = synthetic_client(count)
+    por = START + 1825 * DAY
+    timed('age (creation_date, older)', client,
+        lambda ilo: ilo.filter_by_age(
+            source='creation_date', direction='older', unit='days',
+            unit_count=1, epoch=por)
+    )
+    timed('age (name, older)', client,
+        lambda ilo: ilo.filter_by_age(
+            source='name', direction='older', timestring='%Y.%m.%d',
+            unit='days', unit_count=1, epoch=por)
+    )
+    timed('space (by name)', client,
+        lambda ilo: ilo.filter_by_space(disk_space=1024))
+    timed('space (use_age)', client,
+        lambda ilo: ilo.filter_by_space(disk_space=1024, use_age=True))
+    timed('count (use_age)', client,
+        lambda ilo: ilo.filter_by_count(count=1000, use_age=True))
+
+if __name__ == '__main__':
+    main()
@@ -60,6 +60,7 @@ class TestActionAlias(TestCase):
         ao = curator.Alias(name='my_alias')
         ao.remove(ilo)
         self.assertEqual(testvars.alias_one_rm, ao.actions)
+        self.assertFalse(client.indices.get_alias.called)
     def test_add_multiple(self):
         client = Mock()
         client.info.return_value = {'version': {'number': '5.0.0'} }
@@ -67,6 +67,50 @@ class TestActionDeleteIndices(TestCase):
         ilo = curator.IndexList(client)
         do = curator.DeleteIndices(ilo)
         self.assertRaises(curator.FailedExecution, do.do_action)
+    def test_do_action_request_count(self):
+        indices = ['index-{0:04d}'.format(i) for i in range(1000)]
+        metadata = {}
+        for i in indices:
+            metadata[i] = {
+                'state': 'open',
+                'settings': {
+                    'index': {
+                        'creation_date': '1456963200172',
+                        'number_of_shards': '5',
+                        'number_of_replicas': '1',
+                    }
+                }
+            }
+        client = Mock()
+        client.info.return_value = {'version': {'number': '5.0.0'} }
+        client.cluster.state.return_value = {'metadata': {'indices': metadata}}
+        client.indices.stats.return_value = {'indices': {}}
+        ilo = curator.IndexList(client, loader='bulk')
+        client.reset_mock()
+        client.indices.get_settings.return_value = {}
+        do = curator.DeleteIndices(ilo)
+        self.assertIsNone(do.do_action())
+        chunks = len(curator.chunk_index_list(indices))
+        self.assertEqual(chunks, client.indices.delete.call_count)
+        # One targeted existence check per chunk, and nothing cluster-wide
+        self.assertEqual(chunks, client.indices.get_settings.call_count)
+        for call in client.indices.get_settings.call_args_list:
+            self.assertNotEqual('_all', call[1]['index'])
+        self.assertEqual(0, client.info.call_count)
+    def test_do_action_retries_remaining(self):
+        client = Mock()
+        client.info.return_value = {'version': {'number': '5.0.0'} }
+        client.indices.get_settings.return_value = testvars.settings_two
+        client.cluster.state.return_value = testvars.clu_state_two
+        client.indices.stats.return_value = testvars.stats_two
+        ilo = curator.IndexList(client)
+        client.indices.get_settings.side_effect = [
+            {'index-2016.03.04': {}}, {}]
+        do = curator.DeleteIndices(ilo)
+        self.assertIsNone(do.do_action())
+        self.assertEqual(2, client.indices.delete.call_count)
+        self.assertEqual(
+            'index-2016.03.04', client.indices.delete.call_args[1]['index'])
     def test_verify_result_positive(self):
         client = Mock()
         client.info.return_value = {'version': {'number': '5.0.0'} }
@@ -1,5 +1,10 @@
 from unittest import TestCase
 from mock import Mock, patch
+import copy
+import os
+import shutil
+import tempfile
+import time
 import elasticsearch
 import curator
 # Get test variables and constants from a single source
@@ -28,6 +33,7 @@ class TestActionDeleteSnapshots(TestCase):
         client = Mock()
         client.snapshot.get.return_value = testvars.snapshots
         client.snapshot.get_repository.return_value = testvars.test_repo
+        client.snapshot.status.return_value = testvars.nosnap_running
         client.snapshot.delete.return_value = None
         slo = curator.SnapshotList(client, repository=testvars.repo_name)
         do = curator.DeleteSnapshots(slo)
@@ -36,6 +42,7 @@ class TestActionDeleteSnapshots(TestCase):
         client = Mock()
         client.snapshot.get.return_value = testvars.snapshots
         client.snapshot.get_repository.return_value = testvars.test_repo
+        client.snapshot.status.return_value = testvars.nosnap_running
         client.snapshot.delete.return_value = None
         client.snapshot.delete.side_effect = testvars.fake_fail
         slo = curator.SnapshotList(client, repository=testvars.repo_name)
@@ -45,6 +52,104 @@ class TestActionDeleteSnapshots(TestCase):
         client = Mock()
         client.snapshot.get.return_value = testvars.inprogress
         client.snapshot.get_repository.return_value = testvars.test_repo
+        client.snapshot.status.return_value = testvars.status_inprogress
         slo = curator.SnapshotList(client, repository=testvars.repo_name)
         do = curator.DeleteSnapshots(slo, retry_interval=0, retry_count=1)
         self.assertRaises(curator.FailedExecution, do.do_action)
+    def test_do_action_continues_after_failure(self):
+        client = Mock()
+        client.snapshot.get.return_value = testvars.snapshots
+        client.snapshot.get_repository.return_value = testvars.test_repo
+        client.snapshot.status.return_value = testvars.nosnap_running
+        client.snapshot.delete.side_effect = [testvars.fake_fail, None]
+        slo = curator.SnapshotList(client, repository=testvars.repo_name)
+        do = curator.DeleteSnapshots(slo)
+        self.assertRaises(curator.FailedExecution, do.do_action)
+        self.assertEqual(2, client.snapshot.delete.call_count)
+    def test_do_action_retries_busy(self):
+        client = Mock()
+        client.snapshot.get.return_value = testvars.snapshots
+        client.snapshot.get_repository.return_value = testvars.test_repo
+        client.snapshot.status.return_value = testvars.nosnap_running
+        client.snapshot.delete.side_effect = [
+            elasticsearch.TransportError(503, 'busy'), None,
+            elasticsearch.NotFoundError(404, 'missing'),
+        ]
+        slo = curator.SnapshotList(client, repository=testvars.repo_name)
+        do = curator.DeleteSnapshots(slo, retry_interval=0, retry_count=1)
+        self.assertIsNone(do.do_action())
+        self.assertEqual(3, client.snapshot.delete.call_count)
+
+class TestActionDeleteSnapshotsJournal(TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.path = os.path.join(self.tmpdir, 'journal')
+        self.snapshots = copy.deepcopy(testvars.snapshots)
+        for i, snap in enumerate(self.snapshots['snapshots']):
+            snap['uuid'] = 'uuid-{0}'.format(i)
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir)
+    def client(self):
+        client = Mock()
+        client.snapshot.get.return_value = self.snapshots
+        client.snapshot.get_repository.return_value = testvars.test_repo
+        client.snapshot.status.return_value = testvars.nosnap_running
+        return client
+    def test_plan_and_resume(self):
+        client = self.client()
+        client.snapshot.delete.side_effect = [None, testvars.fake_fail]
+        slo = curator.SnapshotList(client, repository=testvars.repo_name)
+        first, second = slo.snapshots
+        do = curator.DeleteSnapshots(slo, journal=self.path)
+        self.assertRaises(curator.FailedExecution, do.do_action)
+        journal = curator.Journal(self.path, testvars.repo_name)
+        self.assertEqual(
+            [first, second], [p['snapshot'] for p in journal.planned])
+        self.assertEqual(
+            [{'snapshot': second, 'uuid': 'uuid-1'}], journal.remaining())
+        # Only the remaining snapshots are read, and they are not filtered
+        client = self.client()
+        client.snapshot.get.return_value = {
+            'snapshots': self.snapshots['snapshots'][1:]}
+        slo = curator.SnapshotList(
+            client, repository=testvars.repo_name, snapshots=[second])
+        curator.DeleteSnapshots(slo, journal=self.path).do_action()
+        self.assertEqual(
+            second, client.snapshot.get.call_args[1]['snapshot'])
+        self.assertEqual(1, client.snapshot.delete.call_count)
+        self.assertEqual(
+            second, client.snapshot.delete.call_args[1]['snapshot'])
+        self.assertFalse(os.path.exists(self.path))
+    def test_recreated_snapshot_skipped(self):
+        name = self.snapshots['snapshots'][0]['snapshot']
+        curator.Journal(self.path, testvars.repo_name).start(
+            [{'snapshot': name, 'uuid': 'uuid-old'}])
+        client = self.client()
+        slo = curator.SnapshotList(
+            client, repository=testvars.repo_name, snapshots=[name])
+        curator.DeleteSnapshots(slo, journal=self.path).do_action()
+        self.assertFalse(client.snapshot.delete.called)
+        self.assertFalse(os.path.exists(self.path))
+    def test_stale_plan_discarded(self):
+        name = self.snapshots['snapshots'][0]['snapshot']
+        curator.Journal(self.path, testvars.repo_name).start(
+            [{'snapshot': name, 'uuid': 'uuid-0'}])
+        journal = curator.Journal(self.path, testvars.repo_name, max_age=1)
+        self.assertEqual(1, len(journal.remaining()))
+        with patch('curator.journal.time.time', return_value=time.time() + 2):
+            journal = curator.Journal(
+                self.path, testvars.repo_name, max_age=1)
+        self.assertEqual([], journal.remaining())
+        self.assertFalse(os.path.exists(self.path))
+    def test_other_repository_kept(self):
+        other = curator.Journal(self.path, 'other_repo')
+        other.start([{'snapshot': 'other_snap', 'uuid': 'x'}])
+        client = self.client()
+        slo = curator.SnapshotList(client, repository=testvars.repo_name)
+        curator.DeleteSnapshots(slo, journal=self.path).do_action()
+        self.assertEqual(
+            [{'snapshot': 'other_snap', 'uuid': 'x'}],
+            curator.Journal(self.path, 'other_repo').remaining()
+        )
+        self.assertEqual(
+            [], curator.Journal(self.path, testvars.repo_name).planned)
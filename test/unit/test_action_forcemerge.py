@@ -1,6 +1,7 @@
 from unittest import TestCase
 from mock import Mock, patch
 import elasticsearch
+import time
 import curator
 # Get test variables and constants from a single source
 from . import testvars as testvars
@@ -15,7 +16,6 @@ class TestActionForceMerge(TestCase):
         client.indices.get_settings.return_value = testvars.settings_one
         client.cluster.state.return_value = testvars.clu_state_one
         client.indices.stats.return_value = testvars.stats_one
-        client.indices.segments.return_value = testvars.shards
         ilo = curator.IndexList(client)
         self.assertRaises(
             curator.MissingArgument, curator.ForceMerge, ilo)
@@ -25,7 +25,6 @@ class TestActionForceMerge(TestCase):
         client.indices.get_settings.return_value = testvars.settings_one
         client.cluster.state.return_value = testvars.clu_state_one
         client.indices.stats.return_value = testvars.stats_one
-        client.indices.segments.return_value = testvars.shards
         ilo = curator.IndexList(client)
         fmo = curator.ForceMerge(ilo, max_num_segments=2)
         self.assertEqual(ilo, fmo.index_list)
@@ -36,7 +35,6 @@ class TestActionForceMerge(TestCase):
         client.indices.get_settings.return_value = testvars.settings_one
         client.cluster.state.return_value = testvars.clu_state_one
         client.indices.stats.return_value = testvars.stats_one
-        client.indices.segments.return_value = testvars.shards
         client.indices.forcemerge.return_value = None
         client.indices.optimize.return_value = None
         ilo = curator.IndexList(client)
@@ -48,7 +46,6 @@ class TestActionForceMerge(TestCase):
         client.indices.get_settings.return_value = testvars.settings_one
         client.cluster.state.return_value = testvars.clu_state_one
         client.indices.stats.return_value = testvars.stats_one
-        client.indices.segments.return_value = testvars.shards
         client.info.return_value = {'version': {'number': '2.3.2'} }
         client.indices.optimize.return_value = None
         ilo = curator.IndexList(client)
@@ -60,19 +57,31 @@ class TestActionForceMerge(TestCase):
         client.indices.get_settings.return_value = testvars.settings_one
         client.cluster.state.return_value = testvars.clu_state_one
         client.indices.stats.return_value = testvars.stats_one
-        client.indices.segments.return_value = testvars.shards
         client.info.return_value = {'version': {'number': '5.0.0'} }
         client.indices.forcemerge.return_value = None
         ilo = curator.IndexList(client)
         fmo = curator.ForceMerge(ilo, max_num_segments=2)
         self.assertIsNone(fmo.do_action())
+    def test_do_action_after_filter(self):
+        client = Mock()
+        client.info.return_value = {'version': {'number': '5.0.0'} }
+        client.indices.get_settings.return_value = testvars.settings_one
+        client.cluster.state.return_value = testvars.clu_state_one
+        client.indices.stats.return_value = testvars.stats_one
+        client.indices.forcemerge.return_value = None
+        ilo = curator.IndexList(client)
+        ilo.filter_forceMerged(max_num_segments=2)
+        calls = client.indices.stats.call_count
+        fmo = curator.ForceMerge(ilo, max_num_segments=2)
+        self.assertIsNone(fmo.do_action())
+        self.assertEqual(calls, client.indices.stats.call_count)
+        self.assertEqual(1, client.indices.forcemerge.call_count)
     def test_do_action_with_delay(self):
         client = Mock()
         client.info.return_value = {'version': {'number': '5.0.0'} }
         client.indices.get_settings.return_value = testvars.settings_one
         client.cluster.state.return_value = testvars.clu_state_one
         client.indices.stats.return_value = testvars.stats_one
-        client.indices.segments.return_value = testvars.shards
         client.info.return_value = {'version': {'number': '5.0.0'} }
         client.indices.forcemerge.return_value = None
         ilo = curator.IndexList(client)
@@ -84,7 +93,6 @@ class TestActionForceMerge(TestCase):
         client.indices.get_settings.return_value = testvars.settings_one
         client.cluster.state.return_value = testvars.clu_state_one
         client.indices.stats.return_value = testvars.stats_one
-        client.indices.segments.return_value = testvars.shards
         client.indices.forcemerge.return_value = None
         client.indices.optimize.return_value = None
         client.indices.forcemerge.side_effect = testvars.fake_fail
@@ -92,3 +100,84 @@ class TestActionForceMerge(TestCase):
         ilo = curator.IndexList(client)
         fmo = curator.ForceMerge(ilo, max_num_segments=2)
         self.assertRaises(curator.FailedExecution, fmo.do_action)
+    def test_do_action_by_node(self):
+        indices = [u'index-2016.03.03', u'index-2016.03.04']
+        def stats(**kwargs):
+            if kwargs.get('metric') == 'segments':
+                return {'indices': dict(
+                    (i, {'total': {'segments': {'count': 71}}})
+                    for i in indices
+                )}
+            if kwargs.get('level') == 'shards':
+                return {'indices': dict(
+                    (i, {'shards': {'0': [
+                        {'routing': {'node': 'n1'},
+                            'store': {'size_in_bytes': 100}},
+                        {'routing': {'node': 'n2'},
+                            'store': {'size_in_bytes': 100}},
+                    ]}}) for i in indices
+                )}
+            return testvars.stats_two
+        client = Mock()
+        client.info.return_value = {'version': {'number': '5.0.0'} }
+        client.indices.get_settings.return_value = testvars.settings_two
+        client.cluster.state.return_value = testvars.clu_state_two
+        client.indices.stats.side_effect = stats
+        client.nodes.info.return_value = {
+            'nodes': {'n1': {'name': 'node1'}, 'n2': {'name': 'node2'}}}
+        client.indices.forcemerge.return_value = None
+        ilo = curator.IndexList(client)
+        fmo = curator.ForceMerge(
+            ilo, max_num_segments=2, max_merges_per_node=1)
+        self.assertIsNone(fmo.do_action())
+        self.assertEqual(
+            sorted(indices),
+            sorted(c[1]['index'] for c in
+                client.indices.forcemerge.call_args_list)
+        )
+    def test_do_action_by_node_with_delay(self):
+        indices = [u'index-2016.03.03', u'index-2016.03.04']
+        def stats(**kwargs):
+            if kwargs.get('metric') == 'segments':
+                return {'indices': dict(
+                    (i, {'total': {'segments': {'count': 71}}})
+                    for i in indices
+                )}
+            if kwargs.get('level') == 'shards':
+                return {'indices': dict(
+                    (i, {'shards': {'0': [
+                        {'routing': {'node': 'n1'},
+                            'store': {'size_in_bytes': 100}},
+                    ]}}) for i in indices
+                )}
+            return testvars.stats_two
+        client = Mock()
+        client.info.return_value = {'version': {'number': '5.0.0'} }
+        client.indices.get_settings.return_value = testvars.settings_two
+        client.cluster.state.return_value = testvars.clu_state_two
+        client.indices.stats.side_effect = stats
+        client.nodes.info.return_value = {'nodes': {'n1': {'name': 'node1'}}}
+        client.indices.forcemerge.return_value = None
+        ilo = curator.IndexList(client)
+        fmo = curator.ForceMerge(
+            ilo, max_num_segments=2, delay=0.050, max_merges_per_node=1)
+        start = time.time()
+        self.assertIsNone(fmo.do_action())
+        self.assertGreaterEqual(time.time() - start, 0.050)
+        self.assertEqual(2, client.indices.forcemerge.call_count)
+    def test_do_action_by_node_attempts_all(self):
+        client = Mock()
+        client.info.return_value = {'version': {'number': '5.0.0'} }
+        client.indices.get_settings.return_value = testvars.settings_two
+        client.cluster.state.return_value = testvars.clu_state_two
+        client.indices.stats.return_value = testvars.stats_two
+        client.nodes.info.return_value = {'nodes': {}}
+        client.indices.forcemerge.side_effect = testvars.fake_fail
+        ilo = curator.IndexList(client)
+        ilo.index_info[u'index-2016.03.03'].segments = 71
+        ilo.index_info[u'index-2016.03.04'].segments = 71
+        ilo.loaded['segments'].update(ilo.indices)
+        fmo = curator.ForceMerge(
+            ilo, max_num_segments=2, max_merges_per_node=2)
+        self.assertRaises(curator.FailedExecution, fmo.do_action)
+        self.assertEqual(2, client.indices.forcemerge.call_count)
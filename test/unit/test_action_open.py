@@ -42,6 +42,35 @@ class TestActionOpen(TestCase):
         oo = curator.Open(ilo)
         self.assertEqual([u'c-2016.03.05'], oo.index_list.indices)
         self.assertIsNone(oo.do_action())
+    def test_do_action_wait(self):
+        client = Mock()
+        client.info.return_value = {'version': {'number': '5.0.0'} }
+        client.indices.get_settings.return_value = testvars.settings_four
+        client.cluster.state.return_value = testvars.clu_state_four
+        client.indices.stats.return_value = testvars.stats_four
+        client.indices.open.return_value = None
+        client.indices.recovery.return_value = {
+            u'c-2016.03.05': {'shards': [{'id': 0, 'stage': 'DONE'}]}}
+        ilo = curator.IndexList(client)
+        ilo.filter_opened()
+        oo = curator.Open(ilo, wait_for_completion=True, max_wait=1)
+        self.assertIsNone(oo.do_action())
+        client.indices.recovery.assert_called_once_with(
+            index=u'c-2016.03.05', active_only=False)
+    def test_do_action_waves(self):
+        client = Mock()
+        client.info.return_value = {'version': {'number': '5.0.0'} }
+        client.indices.get_settings.return_value = testvars.settings_four
+        client.cluster.state.return_value = testvars.clu_state_four
+        client.indices.stats.return_value = testvars.stats_four
+        client.indices.open.return_value = None
+        client.indices.recovery.return_value = {
+            u'c-2016.03.05': {'shards': [{'id': 0, 'stage': 'DONE'}]}}
+        ilo = curator.IndexList(client)
+        ilo.filter_opened()
+        oo = curator.Open(ilo, max_recovering_shards=1, max_wait=1)
+        self.assertIsNone(oo.do_action())
+        client.indices.open.assert_called_once_with(index=u'c-2016.03.05')
     def test_do_action_raises_exception(self):
         client = Mock()
         client.info.return_value = {'version': {'number': '5.0.0'} }
@@ -53,3 +82,14 @@ class TestActionOpen(TestCase):
         ilo = curator.IndexList(client)
         oo = curator.Open(ilo)
         self.assertRaises(curator.FailedExecution, oo.do_action)
+    def test_do_action_concurrent(self):
+        client = Mock()
+        client.info.return_value = {'version': {'number': '5.0.0'} }
+        client.indices.get_settings.return_value = testvars.settings_four
+        client.cluster.state.return_value = testvars.clu_state_four
+        client.indices.stats.return_value = testvars.stats_four
+        client.indices.open.return_value = None
+        ilo = curator.IndexList(client)
+        oo = curator.Open(ilo, max_concurrent_requests=4)
+        self.assertIsNone(oo.do_action())
+        self.assertEqual(1, client.indices.open.call_count)
@@ -60,15 +60,30 @@ class TestActionReplicas(TestCase):
         ilo = curator.IndexList(client)
         ro = curator.Replicas(ilo, count=1, wait_for_completion=True)
         self.assertIsNone(ro.do_action())
+        self.assertEqual(
+            testvars.named_index, client.cluster.health.call_args[1]['index'])
     def test_do_action_raises_exception(self):
         client = Mock()
         client.info.return_value = {'version': {'number': '5.0.0'} }
         client.indices.get_settings.return_value = testvars.settings_one
         client.cluster.state.return_value = testvars.clu_state_one
         client.indices.stats.return_value = testvars.stats_one
-        client.indices.segments.return_value = testvars.shards
         client.indices.put_settings.return_value = None
         client.indices.put_settings.side_effect = testvars.fake_fail
         ilo = curator.IndexList(client)
         ro = curator.Replicas(ilo, count=2)
         self.assertRaises(curator.FailedExecution, ro.do_action)
+    def test_do_action_concurrent_wait(self):
+        client = Mock()
+        client.info.return_value = {'version': {'number': '5.0.0'} }
+        client.indices.get_settings.return_value = testvars.settings_two
+        client.cluster.state.return_value = testvars.clu_state_two
+        client.indices.stats.return_value = testvars.stats_two
+        client.indices.put_settings.return_value = None
+        client.cluster.health.return_value = {'status':'green'}
+        ilo = curator.IndexList(client)
+        ro = curator.Replicas(
+            ilo, count=1, wait_for_completion=True, max_concurrent_requests=2)
+        self.assertIsNone(ro.do_action())
+        self.assertEqual(1, client.indices.put_settings.call_count)
+        self.assertEqual(1, client.cluster.health.call_count)
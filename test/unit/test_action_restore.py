@@ -28,6 +28,17 @@ class TestActionRestore(TestCase):
         slo = curator.SnapshotList(client, repository=testvars.repo_name)
         ro = curator.Restore(slo, name=testvars.snap_name)
         self.assertEqual(testvars.snap_name, ro.name)
+    def test_lazy_loader_indices(self):
+        client = Mock()
+        client.cat.snapshots.return_value = testvars.cat_snapshots
+        client.snapshot.get.return_value = testvars.snapshots
+        client.snapshot.get_repository.return_value = testvars.test_repo
+        slo = curator.SnapshotList(
+            client, repository=testvars.repo_name, loader='lazy')
+        ro = curator.Restore(slo)
+        self.assertEqual(testvars.named_indices, ro.indices)
+        self.assertEqual(
+            'snapshot-2015.03.01', client.snapshot.get.call_args[1]['snapshot'])
     def test_partial_snap(self):
         client = Mock()
         client.snapshot.get.return_value = testvars.partial
@@ -123,6 +134,79 @@ class TestActionRestore(TestCase):
         slo = curator.SnapshotList(client, repository=testvars.repo_name)
         ro = curator.Restore(slo, wait_interval=0.5, max_wait=1)
         self.assertIsNone(ro.do_action())
+    @patch('curator.utils.time.sleep')
+    def test_do_action_waves(self, sleep):
+        a, b = testvars.named_indices
+        client = Mock()
+        client.info.return_value = {'version': {'number': '5.0.0'} }
+        client.snapshot.get.return_value = testvars.snapshots
+        client.snapshot.get_repository.return_value = testvars.test_repo
+        client.snapshot.status.side_effect = [
+            testvars.nosnap_running,
+            {'snapshots': [{'indices': {
+                a: {'shards_stats': {'total': 1}},
+                b: {'shards_stats': {'total': 1}},
+            }}]},
+        ]
+        client.snapshot.verify_repository.return_value = testvars.verified_nodes
+        client.indices.get_settings.return_value = testvars.settings_named
+        client.indices.recovery.return_value = testvars.recovery_output
+        slo = curator.SnapshotList(client, repository=testvars.repo_name)
+        ro = curator.Restore(slo, max_recovering_shards=1, max_wait=10)
+        self.assertIsNone(ro.do_action())
+        bodies = [c[1]['body'] for c in client.snapshot.restore.call_args_list]
+        self.assertEqual([[a], [b]], [body['indices'] for body in bodies])
+        self.assertEqual(
+            [True, False], [body['include_global_state'] for body in bodies])
+    @patch('curator.utils.time.sleep')
+    def test_do_action_waves_expands_patterns(self, sleep):
+        a, b = testvars.named_indices
+        client = Mock()
+        client.info.return_value = {'version': {'number': '5.0.0'} }
+        client.snapshot.get.return_value = testvars.snapshots
+        client.snapshot.get_repository.return_value = testvars.test_repo
+        client.snapshot.status.side_effect = [
+            testvars.nosnap_running,
+            {'snapshots': [{'indices': {
+                a: {'shards_stats': {'total': 1}},
+                b: {'shards_stats': {'total': 1}},
+                'other': {'shards_stats': {'total': 1}},
+            }}]},
+        ]
+        client.snapshot.verify_repository.return_value = testvars.verified_nodes
+        client.indices.get_settings.return_value = testvars.settings_named
+        client.indices.recovery.return_value = testvars.recovery_output
+        slo = curator.SnapshotList(client, repository=testvars.repo_name)
+        ro = curator.Restore(
+            slo, indices=['index-*'], max_recovering_shards=1, max_wait=10)
+        self.assertIsNone(ro.do_action())
+        bodies = [c[1]['body'] for c in client.snapshot.restore.call_args_list]
+        self.assertEqual([[a], [b]], [body['indices'] for body in bodies])
+        self.assertEqual([a, b], ro.expected_output)
+    @patch('curator.utils.time.sleep')
+    def test_do_action_waves_exclusion(self, sleep):
+        a, b = testvars.named_indices
+        client = Mock()
+        client.info.return_value = {'version': {'number': '5.0.0'} }
+        client.snapshot.get.return_value = testvars.snapshots
+        client.snapshot.get_repository.return_value = testvars.test_repo
+        client.snapshot.status.side_effect = [
+            testvars.nosnap_running,
+            {'snapshots': [{'indices': {
+                a: {'shards_stats': {'total': 1}},
+                b: {'shards_stats': {'total': 1}},
+            }}]},
+        ]
+        client.snapshot.verify_repository.return_value = testvars.verified_nodes
+        client.indices.get_settings.return_value = testvars.settings_named
+        client.indices.recovery.return_value = testvars.recovery_output
+        slo = curator.SnapshotList(client, repository=testvars.repo_name)
+        ro = curator.Restore(
+            slo, indices=['_all,-{0}'.format(b)], max_recovering_shards=1,
+            max_wait=10)
+        self.assertIsNone(ro.do_action())
+        bodies = [c[1]['body'] for c in client.snapshot.restore.call_args_list]
+        self.assertEqual([[a]], [body['indices'] for body in bodies])
     def test_do_action_snap_in_progress(self):
         client = Mock()
         client.snapshot.get.return_value = testvars.snapshots
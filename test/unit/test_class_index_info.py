@@ -0,0 +1,53 @@
+from unittest import TestCase
+import curator
+
+class TestIndexInfo(TestCase):
+    def test_defaults(self):
+        info = curator.IndexInfo()
+        self.assertEqual(
+            {
+                'age': {}, 'number_of_replicas': 0, 'number_of_shards': 0,
+                'segments': 0, 'size_in_bytes': 0, 'docs': 0, 'state': '',
+            },
+            info.to_dict()
+        )
+        self.assertNotIn('routing', info)
+        self.assertRaises(KeyError, info.__getitem__, 'routing')
+    def test_dict_access(self):
+        info = curator.IndexInfo()
+        info['state'] = 'open'
+        info['size_in_bytes'] = 1024
+        self.assertEqual('open', info.state)
+        self.assertEqual(1024, info['size_in_bytes'])
+        self.assertEqual('open', info.get('state'))
+        self.assertEqual('default', info.get('nonexistent', 'default'))
+    def test_extra_keys(self):
+        info = curator.IndexInfo()
+        info['custom'] = 'value'
+        self.assertIn('custom', info)
+        self.assertEqual('value', info['custom'])
+    def test_age(self):
+        info = curator.IndexInfo()
+        self.assertNotIn('creation_date', info['age'])
+        info['age']['creation_date'] = 1456963200
+        self.assertIn('creation_date', info['age'])
+        self.assertEqual(1456963200, info.age_creation_date)
+        self.assertEqual(1456963200, info['age'].pop('creation_date'))
+        self.assertNotIn('creation_date', info['age'])
+        self.assertRaises(KeyError, info['age'].__getitem__, 'creation_date')
+        self.assertRaises(KeyError, info['age'].__getitem__, 'invalid')
+    def test_age_extra_keys(self):
+        info = curator.IndexInfo()
+        info['age']['custom'] = 1
+        self.assertEqual({'custom': 1}, info['age'])
+        self.assertNotIn('age', info.keys()[1:])
+    def test_copy(self):
+        info = curator.IndexInfo()
+        info['routing'] = {'allocation': {'require': {'tag': 'foo'}}}
+        info['age']['name'] = 1
+        other = info.copy()
+        self.assertEqual(info, other)
+        other['routing']['allocation']['require']['tag'] = 'bar'
+        other['age']['name'] = 2
+        self.assertEqual('foo', info['routing']['allocation']['require']['tag'])
+        self.assertEqual(1, info['age']['name'])
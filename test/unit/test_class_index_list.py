@@ -1,6 +1,7 @@
 from unittest import TestCase
 from mock import Mock, patch
 import elasticsearch
+import logging
 import yaml
 import curator
 # Get test variables and constants from a single source
@@ -48,6 +49,176 @@ class TestIndexListClientAndInit(TestCase):
         client.indices.stats.return_value = testvars.stats_two
         il = curator.IndexList(client)
         self.assertEqual(['index-2016.03.03'], sorted(il.indices))
+    def test_init_bad_loader(self):
+        client = Mock()
+        client.info.return_value = {'version': {'number': '5.0.0'} }
+        self.assertRaises(
+            ValueError, curator.IndexList, client, loader='invalid')
+    def test_init_bulk(self):
+        client = Mock()
+        client.info.return_value = {'version': {'number': '5.0.0'} }
+        client.cluster.state.return_value = testvars.clu_state_two
+        client.indices.stats.return_value = testvars.stats_two
+        il = curator.IndexList(client, loader='bulk')
+        self.assertEqual(
+            testvars.stats_two['indices']['index-2016.03.03']['total']['store']['size_in_bytes'],
+            il.index_info['index-2016.03.03']['size_in_bytes']
+        )
+        self.assertEqual(
+            testvars.clu_state_two['metadata']['indices']['index-2016.03.04']['state'],
+            il.index_info['index-2016.03.04']['state']
+        )
+        self.assertEqual(['index-2016.03.03','index-2016.03.04'], sorted(il.indices))
+        self.assertEqual(1, client.cluster.state.call_count)
+        self.assertEqual(1, client.indices.stats.call_count)
+        self.assertFalse(client.indices.get_settings.called)
+    def test_init_requests_projection(self):
+        client = Mock()
+        client.info.return_value = {'version': {'number': '5.0.0'} }
+        client.indices.get_settings.return_value = testvars.settings_two
+        client.cluster.state.return_value = testvars.clu_state_two
+        client.indices.stats.return_value = testvars.stats_two
+        curator.IndexList(client)
+        self.assertIn('filter_path', client.indices.get_settings.call_args[1])
+        self.assertNotIn(
+            'mappings', client.cluster.state.call_args[1]['filter_path'])
+        self.assertIn(
+            'creation_date', client.cluster.state.call_args[1]['filter_path'])
+        self.assertIn('filter_path', client.indices.stats.call_args[1])
+    def test_init_empty_projection(self):
+        client = Mock()
+        client.info.return_value = {'version': {'number': '5.0.0'} }
+        client.cluster.state.return_value = testvars.clu_state_two
+        client.indices.stats.return_value = {}
+        il = curator.IndexList(client, loader='bulk')
+        self.assertEqual(0, il.index_info['index-2016.03.03']['size_in_bytes'])
+    def test_init_bulk_without_settings(self):
+        client = Mock()
+        client.info.return_value = {'version': {'number': '5.0.0'} }
+        client.cluster.state.return_value = {
+            'metadata': {
+                'indices': {
+                    'index-2016.03.03': {'state': 'open'},
+                    'index-2016.03.04': {'state': 'open'},
+                }
+            }
+        }
+        client.indices.get_settings.return_value = testvars.settings_two
+        client.indices.stats.return_value = testvars.stats_two
+        il = curator.IndexList(client, loader='bulk')
+        self.assertEqual(['index-2016.03.03','index-2016.03.04'], sorted(il.indices))
+        self.assertEqual(1, client.indices.get_settings.call_count)
+        self.assertFalse(client.indices.get.called)
+    def test_init_lazy(self):
+        client = Mock()
+        client.info.return_value = {'version': {'number': '5.0.0'} }
+        client.indices.get_settings.return_value = testvars.settings_two
+        il = curator.IndexList(client, loader='lazy')
+        self.assertEqual(['index-2016.03.03','index-2016.03.04'], sorted(il.indices))
+        self.assertFalse(client.cluster.state.called)
+        self.assertFalse(client.indices.stats.called)
+    def test_lazy_load_metadata(self):
+        client = Mock()
+        client.info.return_value = {'version': {'number': '5.0.0'} }
+        client.indices.get_settings.return_value = testvars.settings_two
+        client.cluster.state.return_value = testvars.clu_state_two
+        il = curator.IndexList(client, loader='lazy')
+        il.load_metadata()
+        il.load_metadata()
+        self.assertEqual(1, client.cluster.state.call_count)
+        self.assertEqual(
+            'open', il.index_info['index-2016.03.03']['state'])
+        self.assertFalse(client.indices.stats.called)
+    def test_lazy_fetches_only_survivors(self):
+        client = Mock()
+        client.info.return_value = {'version': {'number': '5.0.0'} }
+        client.indices.get_settings.return_value = testvars.settings_two
+        client.cluster.state.return_value = testvars.clu_state_two
+        client.indices.stats.return_value = testvars.stats_two
+        il = curator.IndexList(client, loader='lazy')
+        il.filter_by_regex(kind='suffix', value='03.04')
+        self.assertFalse(client.cluster.state.called)
+        il.filter_closed()
+        self.assertEqual(['index-2016.03.04'], il.indices)
+        self.assertEqual(
+            'index-2016.03.04', client.cluster.state.call_args[1]['index'])
+        self.assertEqual('open', il.index_info['index-2016.03.04']['state'])
+        self.assertFalse(client.indices.stats.called)
+    def test_lazy_space_fetches_stats(self):
+        client = Mock()
+        client.info.return_value = {'version': {'number': '5.0.0'} }
+        client.indices.get_settings.return_value = testvars.settings_two
+        client.cluster.state.return_value = testvars.clu_state_two
+        client.indices.stats.return_value = testvars.stats_two
+        il = curator.IndexList(client, loader='lazy')
+        il.filter_by_space(disk_space=2.1)
+        self.assertEqual(1, client.indices.stats.call_count)
+        self.assertEqual(
+            testvars.stats_two['indices']['index-2016.03.03']['total']['store']['size_in_bytes'],
+            il.index_info['index-2016.03.03']['size_in_bytes']
+        )
+        il._ensure_info('stats')
+        self.assertEqual(1, client.indices.stats.call_count)
+    def test_lazy_skips_index_without_creation_date(self):
+        client = Mock()
+        client.info.return_value = {'version': {'number': '5.0.0'} }
+        client.indices.get_settings.return_value = testvars.settings_two_no_cd
+        client.cluster.state.return_value = testvars.clu_state_two_no_cd
+        il = curator.IndexList(client, loader='lazy')
+        il.filter_opened(exclude=False)
+        self.assertEqual(['index-2016.03.03'], sorted(il.indices))
+    def test_init_concurrent_chunks(self):
+        names = ['a-very-long-index-name-to-fill-the-chunks-quickly-{0:04d}'.format(i)
+            for i in range(200)]
+        metadata = {}
+        stats = {}
+        for i in names:
+            metadata[i] = {
+                'state': 'open',
+                'settings': {
+                    'index': {
+                        'creation_date': '1456963200172',
+                        'number_of_shards': '5',
+                        'number_of_replicas': '1',
+                    }
+                }
+            }
+            stats[i] = {
+                'total': {'store': {'size_in_bytes': 100}, 'docs': {'count': 5}}
+            }
+        client = Mock()
+        client.info.return_value = {'version': {'number': '5.0.0'} }
+        client.indices.get_settings.return_value = dict(
+            (i, {}) for i in names)
+        def state(index=None, **kwargs):
+            return {'metadata': {'indices': dict(
+                (i, metadata[i]) for i in index.split(','))}}
+        client.cluster.state.side_effect = state
+        client.indices.stats.return_value = {'indices': stats}
+        il = curator.IndexList(client, max_concurrent_fetches=4)
+        chunks = len(curator.chunk_index_list(names))
+        self.assertTrue(chunks > 1)
+        self.assertEqual(chunks, client.cluster.state.call_count)
+        self.assertEqual(chunks, client.indices.stats.call_count)
+        self.assertEqual(sorted(names), sorted(il.indices))
+        for i in names:
+            self.assertEqual('open', il.index_info[i]['state'])
+            self.assertEqual(100, il.index_info[i]['size_in_bytes'])
+    def test_concurrent_fetch_raises_original(self):
+        client = Mock()
+        client.info.return_value = {'version': {'number': '5.0.0'} }
+        client.indices.get_settings.return_value = testvars.settings_two
+        client.cluster.state.return_value = testvars.clu_state_two
+        client.indices.stats.return_value = testvars.stats_two
+        il = curator.IndexList(client, max_concurrent_fetches=4)
+        client.indices.stats.reset_mock()
+        client.indices.stats.side_effect = testvars.fake_fail
+        with patch('curator.indexlist.chunk_index_list') as chunker:
+            chunker.return_value = [[i] for i in il.indices]
+            with self.assertRaises(Exception) as cm:
+                il._get_segmentcounts()
+        self.assertIs(testvars.fake_fail, cm.exception)
+        self.assertEqual(2, client.indices.stats.call_count)
 class TestIndexListOtherMethods(TestCase):
     def test_empty_list(self):
         client = Mock()
@@ -65,7 +236,6 @@ class TestIndexListOtherMethods(TestCase):
         client.indices.get_settings.return_value = testvars.settings_one
         client.cluster.state.return_value = testvars.clu_state_one
         client.indices.stats.return_value = testvars.stats_one
-        client.indices.segments.return_value = testvars.shards
         il = curator.IndexList(client)
         il._get_segmentcounts()
         self.assertEqual(71, il.index_info[testvars.named_index]['segments'])
@@ -217,6 +387,59 @@ class TestIndexListRegexFilters(TestCase):
         )
         self.assertRaises(ValueError, il.filter_by_regex, kind='invalid', value=None)
 
+def four_index_client():
+    client = Mock()
+    client.info.return_value = {'version': {'number': '5.0.0'} }
+    client.indices.get_settings.return_value = testvars.settings_four
+    client.cluster.state.return_value = testvars.clu_state_four
+    client.indices.stats.return_value = testvars.stats_four
+    return client
+
+class TestIndexListFilterByRegexes(TestCase):
+    FILTERS = [
+        {'filtertype': 'pattern', 'kind': 'suffix', 'value': '.03.03',
+            'exclude': True},
+        {'filtertype': 'pattern', 'kind': 'regex', 'value': '[a-c]-'},
+        {'filtertype': 'pattern', 'kind': 'timestring', 'value': '%Y.%m.%d'},
+        {'filtertype': 'pattern', 'kind': 'prefix', 'value': 'c',
+            'exclude': True},
+    ]
+    def test_same_as_sequential(self):
+        client = four_index_client()
+        fused = curator.IndexList(client)
+        fused.filter_by_regexes(self.FILTERS)
+        sequential = curator.IndexList(client)
+        for f in self.FILTERS:
+            args = dict(f)
+            del args['filtertype']
+            sequential.filter_by_regex(**args)
+        self.assertEqual(['b-2016.03.04'], fused.indices)
+        self.assertEqual(sequential.indices, fused.indices)
+    def test_emptied_before_last(self):
+        il = curator.IndexList(four_index_client())
+        self.assertRaises(
+            curator.NoIndices, il.filter_by_regexes, [
+                {'kind': 'prefix', 'value': 'x'},
+                {'kind': 'prefix', 'value': 'a', 'exclude': True},
+            ]
+        )
+    def test_emptied_by_last(self):
+        il = curator.IndexList(four_index_client())
+        il.filter_by_regexes([
+            {'kind': 'prefix', 'value': 'a', 'exclude': True},
+            {'kind': 'prefix', 'value': 'x'},
+        ])
+        self.assertEqual([], il.indices)
+    def test_invalid_kind(self):
+        il = curator.IndexList(four_index_client())
+        self.assertRaises(
+            ValueError, il.filter_by_regexes, [
+                {'kind': 'prefix', 'value': 'a'},
+                {'kind': 'invalid', 'value': 'a'},
+            ]
+        )
+        self.assertEqual(4, len(il.indices))
+
 class TestIndexListFilterByAge(TestCase):
     def test_missing_direction(self):
         client = Mock()
@@ -728,7 +951,6 @@ class TestIndexListFilterForceMerged(TestCase):
         client.indices.get_settings.return_value = testvars.settings_one
         client.cluster.state.return_value = testvars.clu_state_one
         client.indices.stats.return_value = testvars.stats_one
-        client.indices.segments.return_value = testvars.shards
         il = curator.IndexList(client)
         self.assertRaises(curator.MissingArgument, il.filter_forceMerged)
     def test_filter_forcemerge_positive(self):
@@ -737,17 +959,28 @@ class TestIndexListFilterForceMerged(TestCase):
         client.indices.get_settings.return_value = testvars.settings_one
         client.cluster.state.return_value = testvars.clu_state_one
         client.indices.stats.return_value = testvars.stats_one
-        client.indices.segments.return_value = testvars.shards
         il = curator.IndexList(client)
         il.filter_forceMerged(max_num_segments=2)
         self.assertEqual([testvars.named_index], il.indices)
-    def test_filter_forcemerge_negative(self):
+    def test_filter_forcemerge_reuses_counts(self):
         client = Mock()
         client.info.return_value = {'version': {'number': '5.0.0'} }
         client.indices.get_settings.return_value = testvars.settings_one
         client.cluster.state.return_value = testvars.clu_state_one
         client.indices.stats.return_value = testvars.stats_one
-        client.indices.segments.return_value = testvars.fm_shards
+        il = curator.IndexList(client)
+        il.filter_forceMerged(max_num_segments=2)
+        il.filter_forceMerged(max_num_segments=2)
+        segment_calls = [c for c in client.indices.stats.call_args_list
+            if c[1].get('metric') == 'segments']
+        self.assertEqual(1, len(segment_calls))
+        self.assertFalse(client.indices.segments.called)
+    def test_filter_forcemerge_negative(self):
+        client = Mock()
+        client.info.return_value = {'version': {'number': '5.0.0'} }
+        client.indices.get_settings.return_value = testvars.settings_one
+        client.cluster.state.return_value = testvars.clu_state_one
+        client.indices.stats.return_value = testvars.fm_stats_one
         il = curator.IndexList(client)
         il.filter_forceMerged(max_num_segments=2)
         self.assertEqual([], il.indices)
@@ -764,6 +997,39 @@ class TestIndexListFilterOpened(TestCase):
         il.filter_opened()
         self.assertEqual(['c-2016.03.05'], il.indices)
 
+class TestIndexListFilterLogging(TestCase):
+    def four_index_list(self, debug):
+        client = Mock()
+        client.info.return_value = {'version': {'number': '5.0.0'} }
+        client.indices.get_settings.return_value = testvars.settings_four
+        client.cluster.state.return_value = testvars.clu_state_four
+        client.indices.stats.return_value = testvars.stats_four
+        il = curator.IndexList(client)
+        il.loggit = Mock()
+        il.loggit.isEnabledFor.return_value = debug
+        return il
+    def per_index_lines(self, il):
+        return [
+            c for c in il.loggit.debug.call_args_list
+            if [i for i in testvars.settings_four if i in c[0][0]]
+        ]
+    def run_filters(self, il):
+        il.filter_by_regex(kind='prefix', value='a-', exclude=True)
+        il.filter_closed()
+        il.filter_by_alias(aliases=['my_alias'])
+    def test_no_per_index_lines_above_debug(self):
+        il = self.four_index_list(False)
+        self.run_filters(il)
+        self.assertEqual([], self.per_index_lines(il))
+    def test_same_result_at_debug(self):
+        quiet = self.four_index_list(False)
+        self.run_filters(quiet)
+        il = self.four_index_list(True)
+        self.run_filters(il)
+        self.assertTrue(self.per_index_lines(il))
+        self.assertEqual(sorted(quiet.indices), sorted(il.indices))
+        self.assertEqual(['b-2016.03.04', 'd-2016.03.06'], sorted(il.indices))
+
 class TestIndexListFilterAllocated(TestCase):
     def test_missing_key(self):
         client = Mock()
@@ -805,8 +1071,10 @@ class TestIndexListFilterAllocated(TestCase):
         client.cluster.state.return_value = testvars.clu_state_two
         client.indices.stats.return_value = testvars.stats_two
         il = curator.IndexList(client)
+        calls = client.indices.get_settings.call_count
         il.filter_allocated(key='tag', value='foo', allocation_type='include')
         self.assertEqual(['index-2016.03.04'], il.indices)
+        self.assertEqual(calls, client.indices.get_settings.call_count)
     def test_invalid_tag(self):
         client = Mock()
         client.info.return_value = {'version': {'number': '5.0.0'} }
@@ -889,7 +1157,6 @@ class TestIterateFiltersIndex(TestCase):
         client.indices.get_settings.return_value = testvars.settings_one
         client.cluster.state.return_value = testvars.clu_state_one
         client.indices.stats.return_value = testvars.stats_one
-        client.indices.segments.return_value = testvars.shards
         ilo = curator.IndexList(client)
         config = yaml.load(testvars.forcemerge_ft)['actions'][1]
         ilo.iterate_filters(config)
@@ -997,18 +1264,27 @@ class TestIndexListFilterAlias(TestCase):
         il.filter_by_alias(aliases=['not_my_alias'])
         self.assertEqual(
             sorted([]), sorted(il.indices))
-    def test_get_alias_raises(self):
+    def test_no_requests(self):
         client = Mock()
         client.info.return_value = {'version': {'number': '5.0.0'} }
         client.indices.get_settings.return_value = testvars.settings_two
         client.cluster.state.return_value = testvars.clu_state_two
         client.indices.stats.return_value = testvars.stats_two
-        client.indices.get_alias.side_effect = testvars.get_alias_fail
-        client.indices.get_alias.return_value = testvars.settings_2_get_aliases
         il = curator.IndexList(client)
+        il.index_info['index-2016.03.04']['aliases'] = ['other_alias']
+        il._alias_map = None
         il.filter_by_alias(aliases=['my_alias'])
-        self.assertEqual(
-            sorted([]), sorted(il.indices))
+        self.assertEqual(['index-2016.03.03'], il.indices)
+        self.assertFalse(client.indices.get_alias.called)
+    def test_wildcard(self):
+        client = Mock()
+        client.info.return_value = {'version': {'number': '5.0.0'} }
+        client.indices.get_settings.return_value = testvars.settings_two
+        client.cluster.state.return_value = testvars.clu_state_two
+        client.indices.stats.return_value = testvars.stats_two
+        il = curator.IndexList(client)
+        il.filter_by_alias(aliases=['my_*'], exclude=True)
+        self.assertEqual([], il.indices)
 
 class TestIndexListFilterCount(TestCase):
     def test_raise(self):
@@ -1074,3 +1350,94 @@ class TestIndexListFilterCount(TestCase):
             reverse=False
         )
         self.assertEqual([u'index-2016.03.04'], il.indices)
+
+class TestIndexListPlanFilters(TestCase):
+    def builder(self):
+        client = Mock()
+        client.info.return_value = {'version': {'number': '5.0.0'} }
+        client.indices.get_settings.return_value = testvars.settings_two
+        client.cluster.state.return_value = testvars.clu_state_two
+        client.indices.stats.return_value = testvars.stats_two
+        return curator.IndexList(client)
+    def test_cheap_filters_first(self):
+        il = self.builder()
+        plan = il._plan_filters([
+            {'filtertype': 'forcemerged', 'max_num_segments': 1},
+            {'filtertype': 'age', 'source': 'field_stats'},
+            {'filtertype': 'opened'},
+            {'filtertype': 'pattern', 'kind': 'prefix', 'value': 'index'},
+            {'filtertype': 'age', 'source': 'name'},
+        ])
+        self.assertEqual(
+            ['pattern', 'age', 'opened', 'forcemerged', 'age'],
+            [f['filtertype'] for f in plan]
+        )
+        self.assertEqual('name', plan[1]['source'])
+        self.assertEqual('field_stats', plan[4]['source'])
+    def test_count_is_a_barrier(self):
+        il = self.builder()
+        plan = il._plan_filters([
+            {'filtertype': 'forcemerged', 'max_num_segments': 1},
+            {'filtertype': 'count', 'count': 2},
+            {'filtertype': 'alias', 'aliases': 'foo'},
+            {'filtertype': 'pattern', 'kind': 'prefix', 'value': 'index'},
+            {'filtertype': 'space', 'disk_space': 1},
+            {'filtertype': 'kibana'},
+        ])
+        self.assertEqual(
+            ['forcemerged', 'count', 'pattern', 'alias', 'space', 'kibana'],
+            [f['filtertype'] for f in plan]
+        )
+    def test_invalid_age_source_not_moved(self):
+        il = self.builder()
+        plan = il._plan_filters([
+            {'filtertype': 'opened'},
+            {'filtertype': 'age', 'source': 'bogus'},
+            {'filtertype': 'pattern', 'kind': 'prefix', 'value': 'index'},
+        ])
+        self.assertEqual(
+            ['opened', 'age', 'pattern'], [f['filtertype'] for f in plan])
+    def test_missing_filtertype_not_moved(self):
+        il = self.builder()
+        plan = il._plan_filters([
+            {'filtertype': 'opened'},
+            {'no_filtertype': 'fail'},
+            {'filtertype': 'pattern', 'kind': 'prefix', 'value': 'index'},
+        ])
+        self.assertEqual({'no_filtertype': 'fail'}, plan[1])
+    def test_missing_filtertype_raises_configuration_error(self):
+        il = self.builder()
+        config = {'filters': [
+            {'filtertype': 'opened'}, {'no_filtertype': 'fail'}]}
+        self.assertRaises(
+            curator.ConfigurationError, il.iterate_filters, config,
+            reorder_filters=True
+        )
+
+class TestIndexListFilterSummary(TestCase):
+    def builder(self):
+        client = Mock()
+        client.info.return_value = {'version': {'number': '5.0.0'} }
+        client.indices.get_settings.return_value = testvars.settings_two
+        client.cluster.state.return_value = testvars.clu_state_two
+        client.indices.stats.return_value = testvars.stats_two
+        il = curator.IndexList(client)
+        il.loggit = Mock()
+        il.loggit.isEnabledFor.side_effect = lambda l: l >= logging.INFO
+        return il
+    def test_summary_at_info(self):
+        il = self.builder()
+        il.iterate_filters(
+            {'filters': [{'filtertype': 'opened'}]}, filter_summary=True)
+        level, message = il.loggit.log.call_args[0]
+        self.assertEqual(logging.INFO, level)
+        self.assertEqual(
+            'opened',
+            il.loggit.log.call_args[1]['extra']['filter_summary']['filter']
+        )
+        self.assertFalse(il.loggit.info.called)
+    def test_summary_off(self):
+        il = self.builder()
+        il.iterate_filters({'filters': [{'filtertype': 'opened'}]})
+        self.assertFalse(il.loggit.log.called)
+        self.assertFalse(il.loggit.info.called)
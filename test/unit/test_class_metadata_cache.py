@@ -0,0 +1,108 @@
+from unittest import TestCase
+from mock import Mock, patch
+import elasticsearch
+import curator
+# Get test variables and constants from a single source
+from . import testvars as testvars
+
+def two_index_client():
+    client = Mock()
+    client.info.return_value = {
+        'version': {'number': '5.0.0'}, 'cluster_uuid': 'abc123' }
+    client.indices.get_settings.return_value = testvars.settings_two
+    client.cluster.state.return_value = testvars.clu_state_two
+    client.indices.stats.return_value = testvars.stats_two
+    return client
+
+class TestMetadataCacheIndices(TestCase):
+    def test_reuse(self):
+        client = two_index_client()
+        cache = curator.MetadataCache()
+        il1 = curator.IndexList(client, cache=cache)
+        il2 = curator.IndexList(client, cache=cache)
+        self.assertEqual(1, client.cluster.state.call_count)
+        self.assertEqual(1, client.indices.stats.call_count)
+        self.assertEqual(sorted(il1.indices), sorted(il2.indices))
+        self.assertEqual(il1.index_info, il2.index_info)
+    def test_copies_are_independent(self):
+        client = two_index_client()
+        cache = curator.MetadataCache()
+        il1 = curator.IndexList(client, cache=cache)
+        il1.index_info['index-2016.03.03']['age']['name'] = 1
+        il1.indices.remove('index-2016.03.03')
+        il2 = curator.IndexList(client, cache=cache)
+        self.assertNotIn('name', il2.index_info['index-2016.03.03']['age'])
+        self.assertEqual(
+            ['index-2016.03.03','index-2016.03.04'], sorted(il2.indices))
+    def test_invalidate_some(self):
+        client = two_index_client()
+        cache = curator.MetadataCache()
+        curator.IndexList(client, cache=cache)
+        cache.invalidate(client, ['index-2016.03.03'])
+        il = curator.IndexList(client, cache=cache)
+        self.assertEqual(2, client.cluster.state.call_count)
+        self.assertEqual(
+            'index-2016.03.03',
+            client.cluster.state.call_args[1]['index']
+        )
+        self.assertEqual(
+            ['index-2016.03.03','index-2016.03.04'], sorted(il.indices))
+    def test_invalidate_deleted(self):
+        client = two_index_client()
+        cache = curator.MetadataCache()
+        curator.IndexList(client, cache=cache)
+        cache.invalidate(client, ['index-2016.03.03'])
+        client.indices.get_settings.return_value = {
+            'index-2016.03.04':
+                testvars.settings_two['index-2016.03.04']
+        }
+        il = curator.IndexList(client, cache=cache)
+        self.assertEqual(1, client.cluster.state.call_count)
+        self.assertEqual(['index-2016.03.04'], il.indices)
+    def test_invalidate_all(self):
+        client = two_index_client()
+        cache = curator.MetadataCache()
+        curator.IndexList(client, cache=cache)
+        cache.invalidate(client)
+        curator.IndexList(client, cache=cache)
+        self.assertEqual(2, client.indices.stats.call_count)
+    def test_expired(self):
+        client = two_index_client()
+        cache = curator.MetadataCache(ttl=-1)
+        curator.IndexList(client, cache=cache)
+        curator.IndexList(client, cache=cache)
+        self.assertEqual(2, client.indices.stats.call_count)
+    def test_keyed_by_cluster(self):
+        client1 = two_index_client()
+        client2 = two_index_client()
+        client2.info.return_value = {
+            'version': {'number': '5.0.0'}, 'cluster_uuid': 'def456' }
+        cache = curator.MetadataCache()
+        curator.IndexList(client1, cache=cache)
+        curator.IndexList(client2, cache=cache)
+        self.assertEqual(1, client2.indices.stats.call_count)
+    def test_key_reuses_client_info(self):
+        client = two_index_client()
+        curator.utils._CLIENT_INFO[client] = client.info.return_value
+        client.info.reset_mock()
+        self.assertEqual('abc123', curator.MetadataCache().cluster_key(client))
+        self.assertEqual('5.0.0', '.'.join(
+            str(x) for x in curator.get_version(client)))
+        self.assertFalse(client.info.called)
+
+class TestMetadataCacheSnapshots(TestCase):
+    def test_reuse_and_invalidate(self):
+        client = Mock()
+        client.info.return_value = {'cluster_uuid': 'abc123'}
+        client.snapshot.get.return_value = testvars.snapshots
+        client.snapshot.get_repository.return_value = testvars.test_repo
+        cache = curator.MetadataCache()
+        curator.SnapshotList(client, repository=testvars.repo_name, cache=cache)
+        sl = curator.SnapshotList(
+            client, repository=testvars.repo_name, cache=cache)
+        self.assertEqual(1, client.snapshot.get.call_count)
+        self.assertEqual(
+            ['snap_name','snapshot-2015.03.01'], sorted(sl.snapshots))
+        cache.invalidate_snapshots(client, testvars.repo_name)
+        curator.SnapshotList(client, repository=testvars.repo_name, cache=cache)
+        self.assertEqual(2, client.snapshot.get.call_count)
@@ -0,0 +1,76 @@
+from unittest import TestCase
+from mock import Mock
+import os
+import shutil
+import tempfile
+import curator
+# Get test variables and constants from a single source
+from . import testvars as testvars
+
+def cat_listing(snapshots):
+    return [
+        {
+            'id': s['snapshot'], 'status': s['state'],
+            'start_epoch': str(s['start_time_in_millis'] // 1000),
+            'end_epoch': str(s['end_time_in_millis'] // 1000),
+        } for s in snapshots['snapshots']
+    ]
+
+def catalog_client(snapshots):
+    client = Mock()
+    client.cat.snapshots.return_value = cat_listing(snapshots)
+    client.snapshot.get.return_value = snapshots
+    client.snapshot.get_repository.return_value = testvars.test_repo
+    return client
+
+class TestSnapshotCatalog(TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.path = os.path.join(self.tmpdir, 'catalog', 'snapshots.db')
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir)
+    def sync(self, client):
+        catalog = curator.SnapshotCatalog(self.path)
+        try:
+            return catalog.sync(client, testvars.repo_name)
+        finally:
+            catalog.close()
+    def test_first_sync_stores(self):
+        client = catalog_client(testvars.snapshots)
+        self.assertEqual(testvars.snapshots['snapshots'], self.sync(client))
+        self.assertEqual(1, client.snapshot.get.call_count)
+        self.assertTrue(os.path.exists(self.path))
+    def test_second_sync_reads_catalog(self):
+        self.sync(catalog_client(testvars.snapshots))
+        client = catalog_client(testvars.snapshots)
+        self.assertEqual(testvars.snapshots['snapshots'], self.sync(client))
+        self.assertFalse(client.snapshot.get.called)
+    def test_in_progress_not_stored(self):
+        self.sync(catalog_client(testvars.inprogress))
+        client = catalog_client(testvars.inprogress)
+        self.sync(client)
+        self.assertEqual(
+            'snapshot-2015.03.01', client.snapshot.get.call_args[1]['snapshot'])
+    def test_deleted_removed(self):
+        self.sync(catalog_client(testvars.snapshots))
+        client = catalog_client(testvars.snapshot)
+        data = self.sync(client)
+        self.assertEqual([testvars.snap_name], [s['snapshot'] for s in data])
+        self.assertFalse(client.snapshot.get.called)
+        catalog = curator.SnapshotCatalog(self.path)
+        self.assertEqual(
+            [testvars.snap_name], list(catalog.get(testvars.repo_name)))
+        catalog.close()
+    def test_snapshot_list(self):
+        self.sync(catalog_client(testvars.snapshots))
+        client = catalog_client(testvars.snapshots)
+        catalog = curator.SnapshotCatalog(self.path)
+        sl = curator.SnapshotList(
+            client, repository=testvars.repo_name, catalog=catalog)
+        catalog.close()
+        self.assertFalse(client.snapshot.get.called)
+        self.assertEqual(
+            ['snap_name','snapshot-2015.03.01'], sorted(sl.snapshots))
+        sl.filter_by_count(count=1)
+        self.assertEqual(
+            testvars.named_indices, sl.snapshot_info[sl.snapshots[0]]['indices'])
@@ -32,6 +32,72 @@ class TestSnapshotListClientAndInit(TestCase):
             ['snap_name','snapshot-2015.03.01'], sorted(sl.snapshots)
         )
 
+class TestSnapshotListLazyLoader(TestCase):
+    def lazy_client(self):
+        client = Mock()
+        client.cat.snapshots.return_value = testvars.cat_snapshots
+        client.snapshot.get.return_value = testvars.snapshots
+        client.snapshot.get_repository.return_value = testvars.test_repo
+        return client
+    def test_invalid_loader(self):
+        client = self.lazy_client()
+        self.assertRaises(
+            ValueError, curator.SnapshotList, client,
+            repository=testvars.repo_name, loader='chunked'
+        )
+    def test_init(self):
+        client = self.lazy_client()
+        sl = curator.SnapshotList(
+            client, repository=testvars.repo_name, loader='lazy')
+        self.assertFalse(client.snapshot.get.called)
+        self.assertEqual(
+            ['snap_name','snapshot-2015.03.01'], sorted(sl.snapshots))
+        self.assertEqual(
+            1425168002000,
+            sl.snapshot_info['snapshot-2015.03.01']['start_time_in_millis']
+        )
+        self.assertNotIn('indices', sl.snapshot_info['snap_name'])
+    def test_filters(self):
+        client = self.lazy_client()
+        sl = curator.SnapshotList(
+            client, repository=testvars.repo_name, loader='lazy')
+        sl.filter_by_state(state='SUCCESS')
+        sl.filter_by_regex(kind='prefix', value='snapshot-')
+        self.assertEqual(['snapshot-2015.03.01'], sl.snapshots)
+        self.assertEqual('snapshot-2015.03.01', sl.most_recent())
+    def test_load_details(self):
+        client = self.lazy_client()
+        sl = curator.SnapshotList(
+            client, repository=testvars.repo_name, loader='lazy')
+        sl.load_details(['snapshot-2015.03.01'])
+        sl.load_details(['snapshot-2015.03.01'])
+        self.assertEqual(1, client.snapshot.get.call_count)
+        kwargs = client.snapshot.get.call_args[1]
+        self.assertEqual('snapshot-2015.03.01', kwargs['snapshot'])
+        self.assertTrue(kwargs['ignore_unavailable'])
+        self.assertEqual(
+            testvars.named_indices,
+            sl.snapshot_info['snapshot-2015.03.01']['indices']
+        )
+    def test_load_details_bulk(self):
+        client = self.lazy_client()
+        sl = curator.SnapshotList(client, repository=testvars.repo_name)
+        sl.load_details()
+        self.assertEqual(1, client.snapshot.get.call_count)
+        self.assertFalse(client.cat.snapshots.called)
+
+    def test_only_named_snapshots(self):
+        client = self.lazy_client()
+        client.snapshot.get.return_value = {'snapshots': []}
+        sl = curator.SnapshotList(
+            client, repository=testvars.repo_name,
+            snapshots=['snapshot-2015.03.01'])
+        self.assertEqual([], sl.snapshots)
+        self.assertFalse(client.cat.snapshots.called)
+        kwargs = client.snapshot.get.call_args[1]
+        self.assertEqual('snapshot-2015.03.01', kwargs['snapshot'])
+        self.assertTrue(kwargs['ignore_unavailable'])
+
 class TestSnapshotListOtherMethods(TestCase):
     def test_empty_list(self):
         client = Mock()
@@ -385,4 +451,5 @@ class TestSnapshotListFilterCount(TestCase):
         slo.age_keyfield = 'invalid'
         snaps = slo.snapshots
         slo._sort_by_age(snaps)
-        self.assertEqual(['snapshot-2015.03.01'], slo.snapshots)
+        # Neither snapshot has the age key, so both are removed
+        self.assertEqual([], slo.snapshots)
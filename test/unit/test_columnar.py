@@ -0,0 +1,38 @@
+from unittest import TestCase
+from mock import patch
+from curator import columnar
+
+class ColumnarMixin(object):
+    def test_less_than(self):
+        self.assertEqual(
+            [True, False, None, False], columnar.less_than([1, 3, None, 2], 2))
+    def test_greater_than(self):
+        self.assertEqual(
+            [False, True, None, False],
+            columnar.greater_than([1, 3, None, 2], 2)
+        )
+    def test_empty(self):
+        self.assertEqual([], columnar.less_than([], 2))
+        self.assertEqual([], columnar.running_total([]))
+        self.assertEqual([], columnar.argsort([]))
+    def test_running_total(self):
+        self.assertEqual([1.0, 3.0, 6.0], columnar.running_total([1, 2, 3]))
+    def test_argsort(self):
+        self.assertEqual([1, 3, 0, 2], columnar.argsort([3, 1, 4, 2]))
+    def test_argsort_reverse_is_stable(self):
+        values = [2, 1, 2, 3, 1]
+        expected = sorted(
+            range(len(values)), key=values.__getitem__, reverse=True)
+        self.assertEqual(expected, columnar.argsort(values, reverse=True))
+
+class TestColumnarPurePython(ColumnarMixin, TestCase):
+    def setUp(self):
+        self.patcher = patch.object(columnar, 'numpy', None)
+        self.patcher.start()
+    def tearDown(self):
+        self.patcher.stop()
+
+class TestColumnarNumPy(ColumnarMixin, TestCase):
+    def setUp(self):
+        if columnar.numpy is None:
+            self.skipTest('NumPy is not installed')
@@ -0,0 +1,46 @@
+from unittest import TestCase
+from curator import patterns
+
+NAMES = [
+    'logstash-2016.03.03', 'logstash-2016.03.04', 'metrics-2016.03.03',
+    'log-archive', '.kibana', 'logstash-old-data',
+]
+
+class TestGetPattern(TestCase):
+    def test_cached(self):
+        self.assertIs(
+            patterns.get_pattern('prefix', 'log'),
+            patterns.get_pattern('prefix', 'log')
+        )
+    def test_invalid_kind(self):
+        self.assertRaises(ValueError, patterns.get_pattern, 'invalid', 'log')
+    def test_invalid_value(self):
+        self.assertRaises(ValueError, patterns.get_pattern, 'prefix', None)
+
+class TestMatchSets(TestCase):
+    def expected(self, specs):
+        return [
+            set(n for n in NAMES if patterns.get_pattern(*spec).match(n))
+            for spec in specs
+        ]
+    def test_literal_prefix_and_suffix(self):
+        specs = [('prefix', 'logstash-'), ('suffix', '03.03'), ('prefix', 'x')]
+        self.assertEqual(
+            self.expected(specs), patterns.match_sets(NAMES, specs))
+    def test_regex_prefix_and_suffix(self):
+        specs = [('prefix', 'log.*-'), ('suffix', r'\d{2}')]
+        self.assertEqual(
+            self.expected(specs), patterns.match_sets(NAMES, specs))
+    def test_regex_and_timestring(self):
+        specs = [
+            ('regex', r'^\.kibana$'), ('timestring', '%Y.%m.%d'),
+            ('regex', 'log|metrics'), ('regex', '.*'),
+        ]
+        self.assertEqual(
+            self.expected(specs), patterns.match_sets(NAMES, specs))
+    def test_uncombinable(self):
+        specs = [('regex', r'(l)o\1'), ('regex', '(?P<x>log)'), ('regex', 'm')]
+        self.assertEqual(
+            self.expected(specs), patterns.match_sets(NAMES, specs))
+    def test_empty(self):
+        self.assertEqual([set()], patterns.match_sets([], [('prefix', 'a')]))
@@ -1,6 +1,8 @@
 from datetime import datetime, timedelta
+import logging
+import time
 from unittest import TestCase
-from mock import Mock
+from mock import Mock, patch
 import elasticsearch
 import yaml
 from . import testvars as testvars
@@ -133,6 +135,69 @@ class TestFixEpoch(TestCase):
     def test_fix_epoch_raise(self):
         self.assertRaises(ValueError, curator.fix_epoch, 12345678901)
 
+class TestWorkingSet(TestCase):
+    def test_discard_preserves_order(self):
+        ws = curator.WorkingSet(['a', 'b', 'c', 'd'])
+        ws.discard('c')
+        ws.discard('a')
+        self.assertEqual(['b', 'd'], ws.members())
+    def test_compacts_in_place(self):
+        l = ['a', 'b', 'c']
+        ws = curator.WorkingSet(l)
+        ws.discard('b')
+        self.assertTrue(ws.members() is l)
+        self.assertEqual(['a', 'c'], l)
+    def test_discard_appended(self):
+        ws = curator.WorkingSet(['a', 'b'])
+        ws.members().append('c')
+        ws.discard('c')
+        self.assertEqual(['a', 'b'], ws.members())
+    def test_readd_after_compaction(self):
+        ws = curator.WorkingSet(['a', 'b'])
+        ws.discard('b')
+        ws.members().append('b')
+        self.assertEqual(['a', 'b'], ws.members())
+
+class TestTimestringSearch(TestCase):
+    def check(self, timestring, name):
+        fast = curator.TimestringSearch(timestring)
+        slow = curator.TimestringSearch(timestring)
+        slow.fast = False
+        curator.utils._EPOCHS.clear()
+        expected = slow.get_epoch(name)
+        curator.utils._EPOCHS.clear()
+        self.assertEqual(expected, fast.get_epoch(name))
+    def test_fast_path_matches_strptime(self):
+        for timestring, name in [
+                ('%Y.%m.%d', 'logstash-2016.03.04'),
+                ('%Y.%m', 'index-2016.03'),
+                ('%Y', 'index-2016'),
+                ('%y.%m.%d', 'index-99.01.02'),
+                ('%y.%m.%d', 'index-05.01.02'),
+                ('%Y-%m-%dt%H', 'index-2016-03-04t05'),
+                ('%Y.%m.%d.%H.%M.%S', 'index-2016.12.31.23.59.59'),
+            ]:
+            self.assertTrue(curator.TimestringSearch(timestring).fast)
+            self.check(timestring, name)
+    def test_week_of_year_uses_strptime(self):
+        self.assertFalse(curator.TimestringSearch('%Y.%W').fast)
+        self.assertFalse(curator.TimestringSearch('%Y.%j').fast)
+        self.assertFalse(curator.TimestringSearch('%Y.%m.%Y').fast)
+        self.check('%Y.%W', 'index-2016.05')
+    def test_invalid_date(self):
+        self.assertRaises(
+            ValueError,
+            curator.TimestringSearch('%Y.%m.%d').get_epoch, 'index-2016.02.30'
+        )
+    def test_no_match(self):
+        self.assertIsNone(
+            curator.TimestringSearch('%Y.%m.%d').get_epoch('index-2016.03'))
+    def test_pattern_is_shared(self):
+        self.assertTrue(
+            curator.TimestringSearch('%Y.%m.%d').pattern is
+            curator.TimestringSearch('%Y.%m.%d').pattern
+        )
+
 class TestGetPointOfReference(TestCase):
     def test_get_point_of_reference(self):
         epoch = 1459288037
@@ -171,6 +236,98 @@ class TestChunkIndexList(TestCase):
     def test_small_list(self):
         self.assertEqual(1, len(curator.chunk_index_list(['short','list','of','indices'])))
 
+class TestMapChunks(TestCase):
+    def test_serial(self):
+        self.assertEqual(
+            [2, 1], curator.map_chunks(len, [['a','b'], ['c']]))
+    def test_serial_fails_fast(self):
+        func = Mock(side_effect=testvars.fake_fail)
+        self.assertRaises(
+            Exception, curator.map_chunks, func, [['a'], ['b']])
+        self.assertEqual(1, func.call_count)
+    def test_concurrent_keeps_order(self):
+        chunks = [['a'] * i for i in range(10)]
+        self.assertEqual(
+            list(range(10)), curator.map_chunks(len, chunks, 4))
+    def test_concurrent_attempts_all(self):
+        func = Mock(side_effect=[None, testvars.fake_fail, None])
+        self.assertRaises(
+            curator.FailedExecution,
+            curator.map_chunks, func, [['a'], ['b'], ['c']], 2
+        )
+        self.assertEqual(3, func.call_count)
+
+class TestPipelineChunks(TestCase):
+    def test_order(self):
+        calls = []
+        curator.pipeline_chunks(
+            lambda l: calls.append(('change', l[0])),
+            lambda l: calls.append(('wait', l[0])),
+            [['a'], ['b'], ['c']]
+        )
+        changes = [c for c in calls if c[0] == 'change']
+        waits = [c for c in calls if c[0] == 'wait']
+        self.assertEqual(['a', 'b', 'c'], [c[1] for c in changes])
+        self.assertEqual(['a', 'b', 'c'], [c[1] for c in waits])
+        # Each wait is finished before the chunk after next is changed
+        self.assertTrue(calls.index(('wait', 'a')) < calls.index(('change', 'c')))
+    def test_wait_failure_raised(self):
+        func = Mock()
+        wait = Mock(side_effect=testvars.fake_fail)
+        self.assertRaises(
+            Exception, curator.pipeline_chunks, func, wait, [['a'], ['b'], ['c']])
+        self.assertEqual(2, func.call_count)
+
+class TestLogFilterSummary(TestCase):
+    def test_summary(self):
+        loggit = Mock()
+        loggit.isEnabledFor.return_value = True
+        curator.log_filter_summary(loggit, 'pattern', 10, 4, time.time())
+        self.assertEqual(logging.DEBUG, loggit.log.call_args[0][0])
+        summary = loggit.log.call_args[1]['extra']['filter_summary']
+        self.assertEqual('pattern', summary['filter'])
+        self.assertEqual(4, summary['kept'])
+        self.assertEqual(6, summary['removed'])
+        self.assertIn('4 kept, 6 removed', loggit.log.call_args[0][1])
+    def test_not_debug(self):
+        loggit = Mock()
+        loggit.isEnabledFor.return_value = False
+        curator.log_filter_summary(loggit, 'pattern', 10, 4, time.time())
+        self.assertFalse(loggit.log.called)
+    def test_info(self):
+        loggit = Mock()
+        loggit.isEnabledFor.side_effect = lambda level: level >= logging.INFO
+        curator.log_filter_summary(
+            loggit, 'pattern', 10, 4, time.time(), info=True)
+        self.assertEqual(logging.INFO, loggit.log.call_args[0][0])
+        summary = loggit.log.call_args[1]['extra']['filter_summary']
+        self.assertEqual(6, summary['removed'])
+
+class TestMeteredConnection(TestCase):
+    def test_totals(self):
+        curator.MeteredConnection.reset()
+        conn = curator.MeteredConnection()
+        with patch('elasticsearch.Urllib3HttpConnection.perform_request') as p:
+            p.return_value = (200, {}, '{"a":1}')
+            self.assertEqual(
+                (200, {}, '{"a":1}'), conn.perform_request('GET', '/'))
+            conn.perform_request('GET', '/_cluster/state')
+        self.assertEqual((2, 14), curator.MeteredConnection.totals())
+        curator.MeteredConnection.reset()
+        self.assertEqual((0, 0), curator.MeteredConnection.totals())
+    def test_requests_connection_totals(self):
+        curator.MeteredConnection.reset()
+        # Skip __init__, which needs the optional requests module
+        conn = curator.MeteredRequestsConnection.__new__(
+            curator.MeteredRequestsConnection)
+        with patch(
+                'elasticsearch.RequestsHttpConnection.perform_request') as p:
+            p.return_value = (200, {}, '{"a":1}')
+            self.assertEqual(
+                (200, {}, '{"a":1}'), conn.perform_request('GET', '/'))
+        self.assertEqual((1, 7), curator.MeteredConnection.totals())
+        curator.MeteredConnection.reset()
+
 class TestGetIndices(TestCase):
     def test_client_exception(self):
         client = Mock()
@@ -389,16 +546,19 @@ class TestGetSnapshotData(TestCase):
 class TestSnapshotInProgress(TestCase):
     def test_all_snapshots_for_in_progress(self):
         client = Mock()
-        client.snapshot.get.return_value = testvars.inprogress
-        client.snapshot.get_repository.return_value = testvars.test_repo
+        client.snapshot.status.return_value = testvars.status_inprogress
         self.assertEqual(
             'snapshot-2015.03.01',
             curator.snapshot_in_progress(client, repository=testvars.repo_name)
         )
+        self.assertFalse(client.snapshot.get.called)
+        self.assertEqual(
+            testvars.repo_name,
+            client.snapshot.status.call_args[1]['repository']
+        )
     def test_specified_snapshot_in_progress(self):
         client = Mock()
-        client.snapshot.get.return_value = testvars.inprogress
-        client.snapshot.get_repository.return_value = testvars.test_repo
+        client.snapshot.status.return_value = testvars.status_inprogress
         self.assertEqual(
             'snapshot-2015.03.01',
             curator.snapshot_in_progress(
@@ -408,8 +568,7 @@ class TestSnapshotInProgress(TestCase):
         )
     def test_specified_snapshot_in_progress_negative(self):
         client = Mock()
-        client.snapshot.get.return_value = testvars.inprogress
-        client.snapshot.get_repository.return_value = testvars.test_repo
+        client.snapshot.status.return_value = testvars.status_inprogress
         self.assertFalse(
             curator.snapshot_in_progress(
                 client, repository=testvars.repo_name,
@@ -418,19 +577,30 @@ class TestSnapshotInProgress(TestCase):
         )
     def test_all_snapshots_for_in_progress_negative(self):
         client = Mock()
-        client.snapshot.get.return_value = testvars.snapshots
-        client.snapshot.get_repository.return_value = testvars.test_repo
+        client.snapshot.status.return_value = testvars.nosnap_running
         self.assertFalse(
             curator.snapshot_in_progress(client, repository=testvars.repo_name)
         )
+    def test_cluster_wide(self):
+        client = Mock()
+        client.snapshot.status.return_value = testvars.status_inprogress
+        self.assertEqual(
+            'snapshot-2015.03.01', curator.snapshot_in_progress(client))
+        self.assertIsNone(client.snapshot.status.call_args[1]['repository'])
     def test_for_multiple_in_progress(self):
         client = Mock()
-        client.snapshot.get.return_value = testvars.highly_unlikely
-        client.snapshot.get_repository.return_value = testvars.test_repo
+        client.snapshot.status.return_value = testvars.status_two_inprogress
         self.assertRaises(
             curator.CuratorException,
             curator.snapshot_in_progress, client, repository=testvars.repo_name
         )
+    def test_raises_exception(self):
+        client = Mock()
+        client.snapshot.status.side_effect = testvars.fake_fail
+        self.assertRaises(
+            curator.FailedExecution,
+            curator.snapshot_in_progress, client, repository=testvars.repo_name
+        )
 
 class TestCreateSnapshotBody(TestCase):
     def test_create_snapshot_body_empty_arg(self):
@@ -530,8 +700,7 @@ class TestSafeToSnap(TestCase):
         )
     def test_in_progress_fail(self):
         client = Mock()
-        client.snapshot.get.return_value = testvars.inprogress
-        client.snapshot.get_repository.return_value = testvars.test_repo
+        client.snapshot.status.return_value = testvars.status_inprogress
         self.assertFalse(
             curator.safe_to_snap(
                 client, repository=testvars.repo_name,
@@ -540,8 +709,7 @@ class TestSafeToSnap(TestCase):
         )
     def test_in_progress_pass(self):
         client = Mock()
-        client.snapshot.get.return_value = testvars.snapshots
-        client.snapshot.get_repository.return_value = testvars.test_repo
+        client.snapshot.status.return_value = testvars.nosnap_running
         self.assertTrue(
             curator.safe_to_snap(
                 client, repository=testvars.repo_name,
@@ -653,6 +821,35 @@ class TestHealthCheck(TestCase):
             curator.ConfigurationError,
             curator.health_check, client, foo='bar'
         )
+    def test_long_poll_scoped(self):
+        client = Mock()
+        client.cluster.health.return_value = testvars.cluster_health
+        self.assertTrue(
+            curator.health_check(
+                client, index=['a', 'b'], timeout=30, status='green',
+                relocating_shards=0
+            )
+        )
+        client.cluster.health.assert_called_once_with(
+            index='a,b', timeout='30s', request_timeout=40, ignore=408,
+            wait_for_status='green', wait_for_no_relocating_shards=True
+        )
+
+class TestHealthWait(TestCase):
+    def test_passes(self):
+        client = Mock()
+        client.cluster.health.return_value = testvars.cluster_health
+        self.assertIsNone(
+            curator.health_wait(client, index=['a'], status='green'))
+        self.assertEqual('30s', client.cluster.health.call_args[1]['timeout'])
+    def test_timeout_capped_by_max_wait(self):
+        client = Mock()
+        client.cluster.health.return_value = {'status': 'red'}
+        self.assertRaises(
+            curator.ActionTimeout,
+            curator.health_wait, client, index=['a'], max_wait=1, status='green'
+        )
+        self.assertEqual('1s', client.cluster.health.call_args[1]['timeout'])
 
 class TestSnapshotCheck(TestCase):
     def test_fail_to_get_snapshot(self):
@@ -717,6 +914,196 @@ class TestRestoreCheck(TestCase):
             curator.restore_check(client, testvars.named_indices)
         )
 
+def recovery_shard(shard, stage, total, recovered):
+    return {
+        'id': shard, 'primary': True, 'stage': stage,
+        'index': {'size': {
+            'total_in_bytes': total, 'recovered_in_bytes': recovered}},
+    }
+
+def index_settings(index=None, **kwargs):
+    # Every named index exists
+    return dict((i, {}) for i in index.split(','))
+
+class TestRecoveryTracker(TestCase):
+    def test_fail_to_get_recovery(self):
+        client = Mock()
+        client.indices.get_settings.side_effect = index_settings
+        client.indices.recovery.side_effect = testvars.fake_fail
+        tracker = curator.RecoveryTracker(testvars.named_indices)
+        self.assertRaises(curator.CuratorException, tracker.check, client)
+    def test_completed_recovery(self):
+        client = Mock()
+        client.indices.get_settings.side_effect = index_settings
+        client.indices.recovery.return_value = testvars.recovery_output
+        tracker = curator.RecoveryTracker(testvars.named_indices)
+        self.assertTrue(tracker.check(client))
+    def test_active_only_after_first_check(self):
+        a, b = testvars.named_indices
+        client = Mock()
+        client.indices.get_settings.side_effect = index_settings
+        client.indices.recovery.side_effect = [
+            {
+                a: {'shards': [
+                    recovery_shard(0, 'DONE', 100, 100),
+                    recovery_shard(1, 'INDEX', 100, 50)]},
+                b: {'shards': [recovery_shard(0, 'INDEX', 200, 0)]},
+            },
+            {b: {'shards': [recovery_shard(0, 'INDEX', 200, 100)]}},
+            {},
+        ]
+        tracker = curator.RecoveryTracker(testvars.named_indices)
+        self.assertFalse(tracker.check(client))
+        self.assertEqual(
+            {'index': '{0},{1}'.format(a, b), 'active_only': False},
+            client.indices.recovery.call_args[1]
+        )
+        self.assertFalse(tracker.check(client))
+        self.assertEqual(
+            {'index': '{0},{1}'.format(a, b), 'active_only': True},
+            client.indices.recovery.call_args[1]
+        )
+        # Shard 1 of a is no longer active, so it has finished
+        self.assertEqual(2, len(tracker.done))
+        self.assertTrue(tracker.check(client))
+        self.assertEqual(
+            {'index': b, 'active_only': True},
+            client.indices.recovery.call_args[1]
+        )
+        self.assertEqual(3, len(tracker.done))
+    def test_unseen_index(self):
+        a, b = testvars.named_indices
+        client = Mock()
+        client.indices.get_settings.side_effect = index_settings
+        client.indices.recovery.side_effect = [
+            {a: {'shards': [recovery_shard(0, 'DONE', 100, 100)]}},
+            {b: {'shards': [recovery_shard(0, 'DONE', 100, 100)]}},
+        ]
+        tracker = curator.RecoveryTracker(testvars.named_indices)
+        self.assertFalse(tracker.check(client))
+        self.assertTrue(tracker.check(client))
+        self.assertEqual(
+            {'index': b, 'active_only': False},
+            client.indices.recovery.call_args[1]
+        )
+        # b was resolved on the first check only
+        self.assertEqual(1, client.indices.get_settings.call_count)
+    def test_missing_index_not_waited_for(self):
+        a, b = testvars.named_indices
+        client = Mock()
+        client.indices.get_settings.return_value = {a: {}}
+        client.indices.recovery.return_value = {
+            a: {'shards': [recovery_shard(0, 'DONE', 100, 100)]}}
+        tracker = curator.RecoveryTracker(testvars.named_indices)
+        self.assertTrue(tracker.check(client))
+        self.assertEqual([a], tracker.indices)
+        self.assertEqual(
+            {'index': a, 'active_only': False},
+            client.indices.recovery.call_args[1]
+        )
+    def test_wildcard_resolved(self):
+        a, b = testvars.named_indices
+        client = Mock()
+        client.indices.get_settings.return_value = {a: {}, b: {}}
+        client.indices.recovery.side_effect = [
+            {a: {'shards': [recovery_shard(0, 'DONE', 100, 100)]}},
+            {b: {'shards': [recovery_shard(0, 'DONE', 100, 100)]}},
+        ]
+        tracker = curator.RecoveryTracker(['index-*'])
+        self.assertFalse(tracker.check(client))
+        self.assertEqual([a, b], sorted(tracker.indices))
+        self.assertTrue(tracker.check(client))
+
+class TestShardAllocation(TestCase):
+    def test_allocation(self):
+        client = Mock()
+        client.nodes.info.return_value = {'nodes': {'n1': {'name': 'node1'}}}
+        client.indices.stats.return_value = {'indices': {'a': {'shards': {
+            '0': [
+                {'routing': {'node': 'n1'}, 'store': {'size_in_bytes': 10}},
+                {'routing': {'node': 'n2'}, 'store': {'size_in_bytes': 10}},
+            ],
+            '1': [
+                {'routing': {'node': 'n1'}, 'store': {'size_in_bytes': 5}},
+                {'routing': {'node': None}},
+            ],
+        }}}}
+        self.assertEqual(
+            {'a': {'node1': 15, 'n2': 10}, 'b': {}},
+            curator.shard_allocation(client, ['a', 'b'])
+        )
+
+class TestRecoveryWaves(TestCase):
+    def done(self, *indices):
+        return dict(
+            (i, {'shards': [recovery_shard(0, 'DONE', 10, 10)]})
+            for i in indices
+        )
+    def test_shard_limit(self):
+        client = Mock()
+        client.indices.get_settings.side_effect = index_settings
+        submitted = []
+        waves = curator.RecoveryWaves(
+            ['a', 'b', 'c'], submitted.append, {'a': 2, 'b': 2, 'c': 2},
+            max_shards=4
+        )
+        # a and b are started, and have not started recovering yet
+        client.indices.recovery.return_value = {}
+        self.assertFalse(waves.step(client))
+        self.assertEqual([['a', 'b']], submitted)
+        # c does not fit until b has finished
+        client.indices.recovery.return_value = self.done('b')
+        self.assertFalse(waves.step(client))
+        self.assertEqual([['a', 'b']], submitted)
+        client.indices.recovery.return_value = self.done('a', 'c')
+        self.assertTrue(waves.step(client))
+        self.assertEqual([['a', 'b'], ['c']], submitted)
+        self.assertEqual(2, waves.waves)
+    def test_large_index_alone(self):
+        submitted = []
+        waves = curator.RecoveryWaves(
+            ['a', 'b'], submitted.append, {'a': 1, 'b': 1},
+            sizes={'a': 100, 'b': 5}, max_bytes=10
+        )
+        client = Mock()
+        client.indices.get_settings.side_effect = index_settings
+        client.indices.recovery.return_value = {}
+        waves.step(client)
+        self.assertEqual([['a']], submitted)
+    def test_targets_and_retry(self):
+        client = Mock()
+        client.indices.get_settings.side_effect = index_settings
+        submit = Mock(side_effect=[
+            elasticsearch.TransportError(503, 'busy'), None, None])
+        waves = curator.RecoveryWaves(
+            ['a', 'b'], submit, {'a': 1, 'b': 1}, max_shards=1,
+            overlap=False, targets={'a': 'new_a', 'b': 'new_b'}
+        )
+        self.assertFalse(waves.step(client))
+        self.assertEqual(['a', 'b'], waves.queue)
+        client.indices.recovery.return_value = self.done('new_a')
+        self.assertFalse(waves.step(client))
+        client.indices.recovery.return_value = self.done('new_b')
+        self.assertTrue(waves.step(client))
+        self.assertEqual(
+            [(['a'],), (['a'],), (['b'],)],
+            [c[0] for c in submit.call_args_list]
+        )
+
+class TestSnapshotIndexSizes(TestCase):
+    def test_sizes(self):
+        client = Mock()
+        client.snapshot.status.return_value = {'snapshots': [{'indices': {
+            'a': {
+                'shards_stats': {'total': 5},
+                'stats': {'total_size_in_bytes': 1024}
+            },
+        }}]}
+        self.assertEqual(
+            ({'a': 5}, {'a': 1024}),
+            curator.snapshot_index_sizes(client, repository='r', snapshot='s')
+        )
+
 class TestTaskCheck(TestCase):
     def test_bad_task_id(self):
         client = Mock()
@@ -776,3 +1163,55 @@ class TestWaitForIt(TestCase):
             curator.wait_for_it, client, 'replicas', 
                 wait_interval=1, max_wait=1
         )
+
+class FakeClock(object):
+    def __init__(self):
+        self.now = 1000.0
+        self.sleeps = []
+    def time(self):
+        return self.now
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+def done_after(clock, seconds):
+    start = clock.now
+    return lambda client: clock.now - start >= seconds
+
+class TestWaiter(TestCase):
+    def setUp(self):
+        self.clock = FakeClock()
+        patcher = patch('curator.utils.time', self.clock)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+    def test_multiple_operations(self):
+        waiter = curator.Waiter(Mock(), wait_interval=9)
+        waiter.add('short', done_after(self.clock, 2))
+        waiter.add('long', done_after(self.clock, 60))
+        elapsed = waiter.wait()
+        self.assertEqual(['long', 'short'], sorted(elapsed.keys()))
+        self.assertTrue(2 <= elapsed['short'] < 5)
+        self.assertTrue(60 <= elapsed['long'] < 70)
+    def test_delay_grows_to_wait_interval(self):
+        waiter = curator.Waiter(Mock(), wait_interval=8)
+        waiter.add('op', done_after(self.clock, 100))
+        waiter.wait()
+        self.assertTrue(self.clock.sleeps[0] < 2)
+        self.assertTrue(self.clock.sleeps[1] > self.clock.sleeps[0])
+        self.assertTrue(max(self.clock.sleeps) <= 8 * 1.1)
+        self.assertTrue(max(self.clock.sleeps) > 8 * 0.9)
+    def test_check_passes_kwargs(self):
+        func = Mock(return_value=True)
+        client = Mock()
+        waiter = curator.Waiter(client)
+        waiter.add('op', func, task_id='foo')
+        self.assertEqual({'op': 0}, waiter.wait())
+        func.assert_called_once_with(client, task_id='foo')
+        self.assertEqual([], self.clock.sleeps)
+    def test_timeout_after_others_finish(self):
+        waiter = curator.Waiter(Mock(), wait_interval=9, max_wait=30)
+        waiter.add('never', Mock(return_value=False))
+        waiter.add('short', done_after(self.clock, 5))
+        self.assertRaises(curator.ActionTimeout, waiter.wait)
+        self.assertEqual(['short'], list(waiter.elapsed.keys()))
+        self.assertEqual(1030, self.clock.now)
@@ -67,6 +67,13 @@ test_repos     = {'TESTING': {'type': 'fs', 'settings': {'compress': 'true', 'lo
                   repo_name: {'type': 'fs', 'settings': {'compress': 'true', 'location': '/rmp/repos/repo_name'}}}
 snap_running   = { 'snapshots': ['running'] }
 nosnap_running = { 'snapshots': [] }
+status_inprogress = { 'snapshots': [
+                    { 'snapshot': 'snapshot-2015.03.01', 'repository': repo_name }
+                  ]}
+status_two_inprogress = { 'snapshots': [
+                    { 'snapshot': snap_name, 'repository': repo_name },
+                    { 'snapshot': 'snapshot-2015.03.01', 'repository': repo_name }
+                  ]}
 snapshot       = { 'snapshots': [
                     {
                         'duration_in_millis': 60000, 'start_time': '2015-02-01T00:00:00.000Z',
@@ -129,6 +136,15 @@ snapshots         = { 'snapshots': [
                         'indices': named_indices,
                         'failures': [], 'start_time_in_millis': 1425168002
                     }]}
+cat_snapshots     = [
+                    {
+                        'id': snap_name, 'status': 'SUCCESS',
+                        'start_epoch': '1422748800', 'end_epoch': '1422748801'
+                    },
+                    {
+                        'id': 'snapshot-2015.03.01', 'status': 'SUCCESS',
+                        'start_epoch': '1425168002', 'end_epoch': '1425168003'
+                    }]
 inprogress        = { 'snapshots': [
                     {
                         'duration_in_millis': 60000, 'start_time': '2015-02-01T00:00:00.000Z',
@@ -432,7 +448,8 @@ stats_one      = {
         named_index : {
             u'total': {
                 u'docs': {u'count': 6374962, u'deleted': 0},
-                u'store': {u'size_in_bytes': 1115219663, u'throttle_time_in_millis': 0}
+                u'store': {u'size_in_bytes': 1115219663, u'throttle_time_in_millis': 0},
+                u'segments': {u'count': 71}
             },
             u'primaries': {
                 u'docs': {u'count': 3187481, u'deleted': 0},
@@ -583,12 +600,9 @@ fieldstats_four = {
 }
 
 
-shards         = { 'indices': { named_index: { 'shards': {
-        '0': [ { 'num_search_segments' : 15 }, { 'num_search_segments' : 21 } ],
-        '1': [ { 'num_search_segments' : 19 }, { 'num_search_segments' : 16 } ] }}}}
-fm_shards      = { 'indices': { named_index: { 'shards': {
-        '0': [ { 'num_search_segments' : 1 }, { 'num_search_segments' : 1 } ],
-        '1': [ { 'num_search_segments' : 1 }, { 'num_search_segments' : 1 } ] }}}}
+fm_stats_one   = { 'indices': { named_index: { 'total': {
+        'docs': {'count': 6374962}, 'store': {'size_in_bytes': 1115219663},
+        'segments': {'count': 4} }}}}
 
 loginfo        =    {   "loglevel": "INFO",
                         "logfile": None,